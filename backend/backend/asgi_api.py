@@ -0,0 +1,27 @@
+"""
+ASGI config for API-only worker processes (see ``backend/settings_api.py``).
+
+Like ``backend/asgi.py``, the Server-Sent Events stream (``/api/events/``)
+is answered by ``portfolio_api.events.event_stream`` ahead of Django.
+
+Usage:
+    uvicorn backend.asgi_api:application
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings_api')
+
+django_application = get_asgi_application()
+
+# Imported after Django is set up by get_asgi_application()
+from portfolio_api.events import EVENTS_PATH, event_stream  # noqa: E402
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['path'] == EVENTS_PATH:
+        await event_stream(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
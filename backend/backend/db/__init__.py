@@ -0,0 +1,3 @@
+"""
+Database integration for the backend project (connection pooling and tuning).
+"""
@@ -0,0 +1,246 @@
+"""
+A small thread-safe connection pool with health checks and metrics.
+
+The pool is DB-API agnostic: it is given a ``connect`` callable that opens a
+new connection, so it can be exercised against a real PostgreSQL server or a
+stand-in connection object.
+"""
+
+import collections
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Keep between ``min_size`` and ``max_size`` open connections.
+
+    Idle connections are reused LIFO so the hottest connections stay warm.
+    With ``pre_ping`` enabled a connection is checked with ``SELECT 1`` before
+    it is handed out, and connections older than ``max_lifetime`` seconds are
+    replaced instead of being reused.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=10, timeout=30.0,
+                 pre_ping=True, max_lifetime=3600.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError('Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1')
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.max_lifetime = max_lifetime
+
+        self._idle = collections.deque()  # (connection, opened_at)
+        self._opened_at = {}  # id(connection) -> opened_at for checked-out connections
+        self._size = 0
+        self._in_use = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._stats = collections.Counter()
+        self._wait_time_max = 0.0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def warm_up(self):
+        """Open connections until ``min_size`` connections exist."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                connection = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.append((connection, time.monotonic()))
+                self._cond.notify()
+
+    def getconn(self):
+        """
+        Check out a connection, waiting up to ``timeout`` seconds for one.
+
+        Raises:
+            PoolTimeout: If the pool stays exhausted for the whole timeout
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        while True:
+            with self._cond:
+                connection, opened_at = self._acquire_slot(deadline)
+                if connection is None and opened_at is None:
+                    waited = True
+                    continue
+            if connection is not None and not self._is_reusable(connection, opened_at):
+                self._discard(connection)
+                with self._cond:
+                    self._size += 1
+                connection = None
+            if connection is None:
+                try:
+                    connection = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._in_use -= 1
+                        self._cond.notify()
+                    raise
+                opened_at = time.monotonic()
+            break
+
+        wait_time = time.monotonic() - start
+        with self._cond:
+            self._opened_at[id(connection)] = opened_at
+            self._stats['checkouts'] += 1
+            self._stats['wait_time_total'] += wait_time
+            if waited:
+                self._stats['waits'] += 1
+            self._wait_time_max = max(self._wait_time_max, wait_time)
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._in_use)
+        return connection
+
+    def putconn(self, connection, discard=False):
+        """
+        Return a connection to the pool.
+
+        Connections that are closed, broken, or left inside a transaction that
+        cannot be rolled back are discarded rather than reused.
+        """
+        with self._cond:
+            opened_at = self._opened_at.pop(id(connection), time.monotonic())
+            closed = self._closed
+        if not discard and not closed:
+            discard = not self._reset(connection)
+        if discard or closed:
+            self._discard(connection)
+        with self._cond:
+            self._in_use -= 1
+            if not (discard or closed):
+                self._idle.append((connection, opened_at))
+            self._cond.notify()
+
+    def close(self):
+        """Close all idle connections and refuse to hand out new ones."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def get_stats(self) -> dict:
+        """
+        Return pool metrics.
+
+        Wait times are in milliseconds; ``utilization`` is the fraction of
+        ``max_size`` currently checked out.
+        """
+        with self._cond:
+            stats = {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'utilization': round(self._in_use / self.max_size, 3),
+                'peak_in_use': self._stats['peak_in_use'],
+                'checkouts': self._stats['checkouts'],
+                'waits': self._stats['waits'],
+                'timeouts': self._stats['timeouts'],
+                'wait_time_total_ms': round(self._stats['wait_time_total'] * 1000, 3),
+                'wait_time_max_ms': round(self._wait_time_max * 1000, 3),
+                'connections_opened': self._stats['connections_opened'],
+                'connections_closed': self._stats['connections_closed'],
+                'pre_ping_failures': self._stats['pre_ping_failures'],
+            }
+        checkouts = stats['checkouts']
+        stats['wait_time_avg_ms'] = round(stats['wait_time_total_ms'] / checkouts, 3) if checkouts else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _acquire_slot(self, deadline):
+        """
+        Reserve a slot while holding the lock.
+
+        Returns ``(connection, opened_at)`` for an idle connection,
+        ``(None, 0)`` when a new connection may be opened, or ``(None, None)``
+        after waiting for a connection to be returned.
+        """
+        if self._closed:
+            raise PoolTimeout('Connection pool is closed')
+        if self._idle:
+            connection, opened_at = self._idle.pop()
+            self._in_use += 1
+            return connection, opened_at
+        if self._size < self.max_size:
+            self._size += 1
+            self._in_use += 1
+            return None, 0
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._stats['timeouts'] += 1
+            raise PoolTimeout(
+                f'No database connection available within {self.timeout}s '
+                f'(max_size={self.max_size})'
+            )
+        self._cond.wait(remaining)
+        return None, None
+
+    def _open(self):
+        connection = self._connect()
+        with self._cond:
+            self._stats['connections_opened'] += 1
+        return connection
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._stats['connections_closed'] += 1
+
+    def _is_reusable(self, connection, opened_at):
+        if getattr(connection, 'closed', False):
+            return False
+        if self.max_lifetime and time.monotonic() - opened_at > self.max_lifetime:
+            return False
+        if self.pre_ping:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            except Exception:
+                logger.warning('Discarding pooled connection that failed pre-ping')
+                with self._cond:
+                    self._stats['pre_ping_failures'] += 1
+                return False
+        return True
+
+    def _reset(self, connection):
+        """Roll back any open transaction; return False if the connection is unusable."""
+        if getattr(connection, 'closed', False):
+            return False
+        try:
+            connection.rollback()
+        except Exception:
+            return False
+        return True
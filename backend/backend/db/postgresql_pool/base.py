@@ -0,0 +1,96 @@
+"""
+PostgreSQL backend that checks connections out of a process-wide pool.
+
+Django's built-in pooling requires psycopg 3; this backend provides the same
+for psycopg2. Enable it with ``ENGINE = 'backend.db.postgresql_pool'`` and a
+``POOL`` dict in the database settings::
+
+    'POOL': {
+        'MIN_SIZE': 1,          # connections opened up front
+        'MAX_SIZE': 10,         # hard cap per worker process
+        'TIMEOUT': 30,          # seconds to wait for a free connection
+        'PRE_PING': True,       # run SELECT 1 before handing out a connection
+        'MAX_LIFETIME': 3600,   # seconds before a connection is recycled
+    }
+
+``CONN_MAX_AGE`` must be 0: Django "closes" the connection at the end of each
+request, which returns it to the pool.
+"""
+
+import os
+import threading
+
+import psycopg2.extras
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+
+from ..pool import ConnectionPool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool_stats() -> dict:
+    """Return metrics for every pool opened in this process, keyed by alias."""
+    pid = os.getpid()
+    with _pools_lock:
+        pools = {alias: pool for (alias, owner), pool in _pools.items() if owner == pid}
+    return {alias: pool.get_stats() for alias, pool in pools.items()}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def connection_pool(self):
+        """The pool for this alias, created on first use (once per process)."""
+        # Keyed by pid so forked workers never share sockets with their parent
+        key = (self.alias, os.getpid())
+        pool = _pools.get(key)
+        if pool is None:
+            with _pools_lock:
+                pool = _pools.get(key)
+                if pool is None:
+                    pool = self._create_pool()
+                    _pools[key] = pool
+        return pool
+
+    def _create_pool(self):
+        if self.settings_dict.get('CONN_MAX_AGE', 0) != 0:
+            raise ImproperlyConfigured("Connection pooling requires CONN_MAX_AGE = 0.")
+        options = self.settings_dict.get('POOL') or {}
+        conn_params = self.get_connection_params()
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+
+        def connect():
+            connection = self.Database.connect(**conn_params)
+            if isolation_level is not None:
+                connection.isolation_level = isolation_level
+            # Same as the stock backend: skip the decode/encode round trip for JSONField
+            psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+            return connection
+
+        pool = ConnectionPool(
+            connect,
+            min_size=int(options.get('MIN_SIZE', 1)),
+            max_size=int(options.get('MAX_SIZE', 10)),
+            timeout=float(options.get('TIMEOUT', 30)),
+            pre_ping=bool(options.get('PRE_PING', True)),
+            max_lifetime=float(options.get('MAX_LIFETIME', 3600)),
+        )
+        pool.warm_up()
+        return pool
+
+    def get_new_connection(self, conn_params):
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        self.isolation_level = (
+            base.IsolationLevel(isolation_level) if isolation_level is not None
+            else base.IsolationLevel.READ_COMMITTED
+        )
+        return self.connection_pool.getconn()
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.connection_pool.putconn(self.connection)
+                # Connection can no longer be used.
+                self.connection = None
@@ -0,0 +1,180 @@
+"""
+Read-replica routing.
+
+Replicas are configured with ``REPLICA_DATABASE_URLS`` and registered as
+``replica_0``, ``replica_1``, ... in ``settings.DATABASES``.
+``ReplicaPinningMiddleware`` picks one healthy replica per safe (GET/HEAD/
+OPTIONS) request under ``REPLICA_PATH_PREFIXES`` (the public API) and
+``ReplicaRouter`` sends that request's reads to it. Everything else stays on
+the primary:
+
+* the admin and every other path outside those prefixes;
+* the auth, sessions, admin and contenttypes tables, even during an API
+  request, so logins, sessions and permissions never read stale rows;
+* writes, and any read that happens after a write in the same request;
+* requests that are not safe, plus all safe requests from the same client
+  for ``REPLICA_PIN_SECONDS`` afterwards (read-after-write across requests,
+  tracked with a short-lived cookie);
+* code running outside a request (management commands, signals at startup).
+
+A replica that fails to connect is skipped for ``REPLICA_RETRY_SECONDS``.
+When every replica is down, reads fall back to the primary.
+"""
+
+import contextvars
+import itertools
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = 'db_primary_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Apps whose tables are always read from the primary
+PRIMARY_APPS = frozenset({'admin', 'auth', 'contenttypes', 'sessions'})
+
+# Replica alias chosen for the current request, or None for the primary
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+
+class ReplicaSelector:
+    """Pick a replica by round robin or fewest in-flight requests, skipping ones marked down."""
+
+    def __init__(self, aliases, strategy='round_robin', retry_seconds=30.0):
+        self.aliases = list(aliases)
+        self.strategy = strategy
+        self.retry_seconds = retry_seconds
+        self._cycle = itertools.cycle(self.aliases) if self.aliases else None
+        self._in_flight = {alias: 0 for alias in self.aliases}
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def _available(self):
+        now = time.monotonic()
+        return [alias for alias in self.aliases if self._down_until.get(alias, 0) <= now]
+
+    def choose(self, exclude=()):
+        """Return a replica alias and count it as in flight, or None if none is available."""
+        with self._lock:
+            available = [alias for alias in self._available() if alias not in exclude]
+            if not available:
+                return None
+            if self.strategy == 'least_loaded':
+                alias = min(available, key=lambda a: self._in_flight[a])
+            else:
+                alias = next(a for a in self._cycle if a in available)
+            self._in_flight[alias] += 1
+            return alias
+
+    def release(self, alias):
+        with self._lock:
+            if alias in self._in_flight and self._in_flight[alias] > 0:
+                self._in_flight[alias] -= 1
+
+    def mark_down(self, alias):
+        with self._lock:
+            self._down_until[alias] = time.monotonic() + self.retry_seconds
+        logger.warning('Replica %s marked down for %ss', alias, self.retry_seconds)
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                alias: {
+                    'in_flight': self._in_flight[alias],
+                    'down': self._down_until.get(alias, 0) > now,
+                }
+                for alias in self.aliases
+            }
+
+
+_selector = None
+_selector_lock = threading.Lock()
+
+
+def get_selector():
+    global _selector
+    if _selector is None:
+        with _selector_lock:
+            if _selector is None:
+                aliases = [alias for alias in settings.DATABASES if alias.startswith('replica_')]
+                _selector = ReplicaSelector(
+                    aliases,
+                    strategy=getattr(settings, 'REPLICA_SELECTION', 'round_robin'),
+                    retry_seconds=getattr(settings, 'REPLICA_RETRY_SECONDS', 30),
+                )
+    return _selector
+
+
+def _is_healthy(alias):
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        return False
+    return True
+
+
+class ReplicaRouter:
+    """Route reads for the current request to its replica; everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_APPS:
+            return DEFAULT_DB_ALIAS
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Read-after-write: once this request writes, later reads use the primary too
+        _read_alias.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects from any of them may be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Choose the replica for safe API requests and pin clients to the primary after writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+        self.path_prefixes = tuple(getattr(settings, 'REPLICA_PATH_PREFIXES', ('/api/',)))
+
+    def __call__(self, request):
+        selector = get_selector()
+        alias = None
+        if (request.method in SAFE_METHODS and PIN_COOKIE not in request.COOKIES
+                and request.path_info.startswith(self.path_prefixes)):
+            alias = self._choose_healthy(selector)
+
+        token = _read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+            if alias:
+                selector.release(alias)
+
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(PIN_COOKIE, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def _choose_healthy(self, selector):
+        tried = set()
+        while True:
+            alias = selector.choose(exclude=tried)
+            if alias is None or _is_healthy(alias):
+                return alias
+            selector.release(alias)
+            selector.mark_down(alias)
+            tried.add(alias)
@@ -0,0 +1,127 @@
+"""
+SQLite performance profile.
+
+When ``PRAGMAS`` is set on a SQLite database in ``settings.DATABASES``, the
+pragmas are applied to every new connection through ``connection_created``.
+The default profile switches to WAL so readers no longer block on writers,
+relaxes ``synchronous`` to NORMAL (safe with WAL), and enlarges the page cache
+and memory map.
+
+Read-then-write transactions open with ``immediate_atomic``, which takes
+the write lock at ``BEGIN`` (waiting up to ``busy_timeout`` for it) instead
+of upgrading a read lock half way, which fails at once with "locked" when
+another writer got there first. Every other ``atomic()`` block stays
+DEFERRED, so read-only transactions never queue behind writers.
+
+``retry_on_locked`` complements ``busy_timeout`` for the cases SQLite cannot
+wait out by itself, retrying a write with exponential backoff when the
+database is locked.
+"""
+
+import contextlib
+import functools
+import logging
+import random
+import time
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Applied in order; journal_mode must come first so later pragmas see WAL
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,          # milliseconds
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,          # negative = KiB, i.e. ~20MB
+    'temp_store': 'MEMORY',
+}
+
+
+def apply_pragmas(connection, pragmas):
+    """
+    Execute ``PRAGMA name = value`` for each entry on a DB-API connection.
+
+    Args:
+        connection: A sqlite3 connection (or a Django cursor-capable wrapper)
+        pragmas (dict): Pragma names and values
+    """
+    cursor = connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
+
+
+def configure_connection(sender, connection, **kwargs):
+    """``connection_created`` receiver applying the configured pragmas."""
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('PRAGMAS')
+    if pragmas:
+        apply_pragmas(connection.connection, pragmas)
+
+
+@contextlib.contextmanager
+def immediate_atomic(using=None):
+    """
+    ``transaction.atomic()`` for a write transaction: ``BEGIN IMMEDIATE`` on SQLite.
+
+    Only the outermost block starts a transaction, so nested blocks (and
+    other databases) get a plain ``atomic()``.
+
+    Args:
+        using (str | None): Database alias
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+
+    # Connecting resets transaction_mode from OPTIONS, so connect first
+    connection.ensure_connection()
+    previous = connection.transaction_mode
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic(using=using):
+            yield
+    finally:
+        connection.transaction_mode = previous
+
+
+def is_locked_error(exc) -> bool:
+    message = str(exc).lower()
+    return 'database is locked' in message or 'database table is locked' in message
+
+
+def retry_on_locked(attempts=5, base_delay=0.05, max_delay=1.0):
+    """
+    Retry the decorated function when SQLite reports the database as locked.
+
+    Delays grow exponentially with jitter. The function must be safe to
+    re-run, i.e. wrap a whole transaction rather than part of one.
+
+    Args:
+        attempts (int): Total number of tries
+        base_delay (float): Delay before the first retry, in seconds
+        max_delay (float): Upper bound for a single delay, in seconds
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except OperationalError as exc:
+                    if attempt == attempts or not is_locked_error(exc):
+                        raise
+                    delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+                    delay *= random.uniform(0.5, 1.0)
+                    logger.warning('Database locked, retrying %s in %.3fs (attempt %d/%d)',
+                                   func.__name__, delay, attempt, attempts)
+                    time.sleep(delay)
+        return wrapper
+    return decorator
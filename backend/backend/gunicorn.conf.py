@@ -0,0 +1,29 @@
+"""
+Gunicorn configuration.
+
+Usage:
+    PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus gunicorn -c backend/gunicorn.conf.py backend.wsgi
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set, every worker records its metrics in
+that directory and ``/metrics`` sums them. The directory is emptied when the
+master starts, and a worker's live gauges are dropped when it exits.
+"""
+
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+
+
+def on_starting(server):
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
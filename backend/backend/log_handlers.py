@@ -0,0 +1,255 @@
+"""
+Non-blocking logging pipeline.
+
+``AsyncQueueHandler`` is the only handler attached to the application
+loggers. It puts records on a bounded in-memory queue and returns
+immediately; a background listener thread drains the queue in batches and
+passes the records to a "sink" logger whose handlers (file, console) are
+configured as usual in ``settings.LOGGING``. Request threads therefore never
+wait on disk or console I/O. When the queue is full, records are dropped and
+counted rather than blocking the caller.
+
+``SizeAndTimeRotatingFileHandler`` lets every gunicorn worker write and
+rotate the same file: appends and rotation happen under a file lock.
+"""
+
+import atexit
+import copy
+import fcntl
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+
+_stats_lock = threading.Lock()
+_stats = {
+    'enqueued': 0,
+    'dropped': 0,
+    'written': 0,
+    'batches': 0,
+}
+
+
+def get_stats() -> dict:
+    """Return counters for the logging pipeline of this process."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+
+    # Attributes of every LogRecord; anything else was passed via ``extra``
+    _RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+    def format(self, record):
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+            'message': record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        for key, value in record.__dict__.items():
+            if key not in self._RESERVED and not key.startswith('_'):
+                payload[key] = value
+        return json.dumps(payload, default=str)
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotate when the file exceeds ``max_bytes`` or is older than ``interval`` seconds.
+
+    Every worker process writes the same file, so records are kept in
+    memory until ``flush()`` (called once per batch by the queue listener)
+    and then appended, and the file rotated, under an exclusive lock on
+    ``<filename>.lock``. The lock file is touched at each rotation: its
+    modification time is the age of the file for all processes. A process
+    that finds the file was rotated by another one reopens it first.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5,
+                 interval=24 * 60 * 60, encoding='utf-8', delay=True):
+        self.interval = interval
+        self.lock_filename = os.fspath(filename) + '.lock'
+        self._pending = []
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=delay)
+
+    def _open(self):
+        # The file is opened on the first write (delay=True); create its directory then
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+    def emit(self, record):
+        try:
+            self._pending.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            if not self._pending:
+                return
+            data, self._pending = ''.join(self._pending), []
+            try:
+                self._append(data)
+            except Exception:
+                # Like Handler.handleError(), without a record to report
+                if logging.raiseExceptions:
+                    traceback.print_exc(file=sys.stderr)
+
+    def close(self):
+        self.flush()
+        super().close()
+
+    def _append(self, data):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        with open(self.lock_filename, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                size = self._current_size()
+                if size is None:
+                    os.utime(self.lock_filename)  # a new file starts its age now
+                elif size and self._due(size + len(data)):
+                    self.doRollover()
+                    os.utime(self.lock_filename)
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write(data)
+                self.stream.flush()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _current_size(self):
+        """Size of the file on disk (None if missing); drops our stream if it is no longer that file."""
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        if self.stream is not None and (current is None or not os.path.samestat(current, os.fstat(self.stream.fileno()))):
+            self.stream.close()
+            self.stream = None
+        return current.st_size if current is not None else None
+
+    def _due(self, size):
+        if self.maxBytes and size > self.maxBytes:
+            return True
+        return bool(self.interval) and time.time() - os.stat(self.lock_filename).st_mtime >= self.interval
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records for a background listener that writes them in batches.
+
+    Args:
+        sink (str): Name of the logger whose handlers write the records
+        queue_size (int): Maximum number of pending records before dropping
+        batch_size (int): Maximum records handled between flushes
+        flush_interval (float): Seconds the listener waits for more records
+    """
+
+    def __init__(self, sink='log_sink', queue_size=10000, batch_size=200, flush_interval=0.5):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.sink = logging.getLogger(sink)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._listener = None
+        self._listener_pid = None
+        self._start_lock = threading.Lock()
+        self._reported_drops = 0
+
+    def prepare(self, record):
+        # Merge args into the message now (they may not be picklable or may
+        # change later) but leave formatting to the target handlers.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _count('dropped')
+        else:
+            _count('enqueued')
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def _ensure_listener(self):
+        # Threads do not survive fork(), so each worker starts its own listener
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._start_lock:
+            if self._listener_pid == pid:
+                return
+            self._listener = threading.Thread(target=self._run, name='log-queue-listener', daemon=True)
+            self._listener_pid = pid
+            self._listener.start()
+            atexit.register(self.drain)
+
+    def _run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        dropped = get_stats()['dropped']
+        if dropped > self._reported_drops:
+            batch.append(logging.makeLogRecord({
+                'name': __name__,
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': f'Log queue full: dropped {dropped - self._reported_drops} record(s)',
+            }))
+            self._reported_drops = dropped
+        for record in batch:
+            self.sink.handle(record)
+        for handler in self.sink.handlers:
+            handler.flush()
+        _count('written', len(batch))
+        _count('batches')
+
+    def drain(self):
+        """Write out everything still queued (called at interpreter exit)."""
+        batch = []
+        while True:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
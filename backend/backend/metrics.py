@@ -0,0 +1,179 @@
+"""
+Prometheus metrics for the portfolio API.
+
+``MetricsMiddleware`` records per-route request counts, latency and response
+sizes, throttle rejections, and database query counts/time. The cache backend
+``InstrumentedLocMemCache`` records hits, misses and evictions. Everything is
+exposed at ``/metrics`` by ``metrics_view`` to staff users, to requests
+carrying ``Authorization: Bearer <METRICS_TOKEN>``, or to addresses listed in
+``METRICS_ALLOWED_IPS``.
+
+Under gunicorn, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty writable
+directory. Each worker then writes its samples to memory-mapped files in that
+directory and ``/metrics`` aggregates all workers (see gunicorn.conf.py).
+"""
+
+import hmac
+import os
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+REQUESTS = Counter(
+    'portfolio_http_requests_total', 'HTTP requests by route, method and status',
+    ['route', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'portfolio_http_request_duration_seconds', 'Request latency by route',
+    ['route', 'method'], buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    'portfolio_http_response_size_bytes', 'Response body size by route',
+    ['route'], buckets=SIZE_BUCKETS,
+)
+THROTTLED = Counter(
+    'portfolio_throttle_rejections_total', 'Requests rejected by rate limiting', ['route'],
+)
+DB_QUERY_DURATION = Histogram(
+    'portfolio_db_query_duration_seconds', 'Database query time', ['alias'], buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    'portfolio_db_queries_per_request', 'Database queries per request', ['route'], buckets=QUERY_COUNT_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'portfolio_cache_requests_total', 'Cache lookups by result (hit/miss)', ['cache', 'result'],
+)
+CACHE_EVICTIONS = Counter(
+    'portfolio_cache_evictions_total', 'Entries culled from the cache to make room', ['cache'],
+)
+CACHE_INVALIDATIONS = Counter(
+    'portfolio_cache_invalidated_keys_total', 'Cache keys deleted by coalesced invalidation flushes',
+)
+CACHE_INVALIDATION_FLUSHES = Counter(
+    'portfolio_cache_invalidation_flushes_total', 'Coalesced invalidation flushes',
+)
+CONTACT_SUBMISSIONS = Counter(
+    'portfolio_contact_submissions_total', 'Contact form submissions by outcome', ['outcome'],
+)
+SSE_CONNECTIONS = Gauge(
+    'portfolio_sse_connections', 'Open Server-Sent Events connections', multiprocess_mode='livesum',
+)
+SSE_REJECTED = Counter(
+    'portfolio_sse_rejected_connections_total', 'Event stream connections refused by a limit', ['limit'],
+)
+SSE_EVENTS = Counter(
+    'portfolio_sse_events_total', 'Change events published to event stream subscribers',
+)
+PAYLOAD_STORE_REQUESTS = Counter(
+    'portfolio_payload_store_requests_total', 'Public API requests by payload store result (hit/miss)', ['result'],
+)
+PAYLOAD_STORE_BUILDS = Counter(
+    'portfolio_payload_store_builds_total', 'Payload store snapshots written, by reason', ['reason'],
+)
+
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route or 'unknown'
+
+
+class MetricsMiddleware:
+    """Record request, response and database metrics for every request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        query_count = [0]
+
+        def record_query(execute, sql, params, many, context, alias):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                DB_QUERY_DURATION.labels(alias).observe(time.perf_counter() - start)
+                query_count[0] += 1
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(
+                    lambda *args, alias=alias: record_query(*args, alias=alias)
+                ))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        route = _route(request)
+        REQUESTS.labels(route, request.method, str(response.status_code)).inc()
+        REQUEST_LATENCY.labels(route, request.method).observe(duration)
+        DB_QUERIES_PER_REQUEST.labels(route).observe(query_count[0])
+        if not response.streaming:
+            RESPONSE_SIZE.labels(route).observe(len(response.content))
+        if response.status_code == 429:
+            THROTTLED.labels(route).inc()
+        return response
+
+
+class InstrumentedLocMemCache(LocMemCache):
+    """``LocMemCache`` that counts hits, misses and evictions."""
+
+    _missing = object()
+
+    def __init__(self, name, params):
+        super().__init__(name, params)
+        self._metrics_name = name
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, self._missing, version=version)
+        if value is self._missing:
+            CACHE_REQUESTS.labels(self._metrics_name, 'miss').inc()
+            return default
+        CACHE_REQUESTS.labels(self._metrics_name, 'hit').inc()
+        return value
+
+    def _cull(self):
+        before = len(self._cache)
+        super()._cull()
+        CACHE_EVICTIONS.labels(self._metrics_name).inc(before - len(self._cache))
+
+
+def record_invalidation(sender, keys, **kwargs):
+    """``content_invalidated`` receiver counting coalesced flushes."""
+    CACHE_INVALIDATION_FLUSHES.inc()
+    CACHE_INVALIDATIONS.inc(len(keys))
+
+
+def _is_authorized(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if token and header.startswith('Bearer ') and hmac.compare_digest(header[7:], token):
+        return True
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', [])
+
+
+def metrics_view(request):
+    """Expose metrics in the Prometheus text format, aggregated across workers."""
+    if not _is_authorized(request):
+        return HttpResponseForbidden('Forbidden')
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -11,28 +11,31 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
-import re
 from pathlib import Path
 from datetime import timedelta
 
 import dj_database_url
-import dotenv
-
-# Load environment variables from .env if present
-dotenv.load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load environment variables from the nearest .env (this directory or a parent,
+# like dotenv.find_dotenv()). python-dotenv is only imported when there is a
+# file, so deployments configured through the environment start without it.
+for _directory in (Path(__file__).resolve().parent, *Path(__file__).resolve().parents):
+    if (_directory / '.env').is_file():
+        import dotenv
+
+        dotenv.load_dotenv(_directory / '.env')
+        break
+
 # -------------------------
 # Helper to read list envs
 # -------------------------
 def _list_from_env(name: str, default: str = "") -> list:
     raw = os.environ.get(name, default)
-    if not raw:
-        return []
     # allow comma or whitespace separated lists
-    return [h.strip() for h in re.split(r"[,\s]+", raw) if h.strip()]
+    return raw.replace(",", " ").split()
 
 # =============================================================================
 # SECURITY SETTINGS
@@ -102,13 +105,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'backend.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'portfolio_api.tenancy.PortfolioMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'portfolio_api.profiling.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -161,6 +167,59 @@ if 'sqlite' in DATABASES['default']['ENGINE']:
         'timeout': 20,
         'check_same_thread': False,
     }
+
+# Opt-in SQLite performance profile: WAL journal plus tuned pragmas applied to
+# every connection (see backend/db/sqlite.py). Transactions stay DEFERRED;
+# the write paths open theirs with immediate_atomic() so they take the write
+# lock up front instead of failing with "locked" when upgrading.
+SQLITE_PERFORMANCE_PROFILE = os.environ.get("SQLITE_PERFORMANCE_PROFILE", "False").lower() in ("1", "true", "yes")
+if SQLITE_PERFORMANCE_PROFILE and 'sqlite' in DATABASES['default']['ENGINE']:
+    from backend.db.sqlite import DEFAULT_PRAGMAS
+
+    DATABASES['default']['OPTIONS']['timeout'] = 5
+    DATABASES['default']['PRAGMAS'] = dict(DEFAULT_PRAGMAS)
+
+# Connection pooling for PostgreSQL (psycopg2). Replaces one persistent
+# connection per thread with a bounded, health-checked pool per worker.
+DB_POOL_ENABLED = os.environ.get("DB_POOL", "False").lower() in ("1", "true", "yes")
+if DB_POOL_ENABLED and 'postgresql' in DATABASES['default']['ENGINE']:
+    DATABASES['default']['ENGINE'] = 'backend.db.postgresql_pool'
+    # Connections go back to the pool at the end of each request
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['POOL'] = {
+        'MIN_SIZE': int(os.environ.get("DB_POOL_MIN_SIZE", "1")),
+        'MAX_SIZE': int(os.environ.get("DB_POOL_MAX_SIZE", "10")),
+        'TIMEOUT': float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+        'PRE_PING': os.environ.get("DB_POOL_PRE_PING", "True").lower() in ("1", "true", "yes"),
+        'MAX_LIFETIME': float(os.environ.get("DB_POOL_MAX_LIFETIME", "3600")),
+    }
+# Read replicas for the public read-only endpoints. Each URL becomes
+# DATABASES['replica_<n>']; safe requests under REPLICA_PATH_PREFIXES read
+# from one of them (see backend/db/routers.py) while writes, read-after-write,
+# the admin, sessions and auth stay on 'default'.
+REPLICA_DATABASE_URLS = _list_from_env("REPLICA_DATABASE_URLS")
+REPLICA_PATH_PREFIXES = tuple(_list_from_env("REPLICA_PATH_PREFIXES", "/api/"))
+REPLICA_SELECTION = os.environ.get("REPLICA_SELECTION", "round_robin")  # or "least_loaded"
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "5"))
+REPLICA_RETRY_SECONDS = int(os.environ.get("REPLICA_RETRY_SECONDS", "30"))
+
+for _index, _url in enumerate(REPLICA_DATABASE_URLS):
+    _replica = dj_database_url.parse(_url, conn_max_age=600, conn_health_checks=True, ssl_require=not DEBUG)
+    if 'sqlite' in _replica['ENGINE']:
+        _replica['OPTIONS'] = {'timeout': 20, 'check_same_thread': False}
+        if SQLITE_PERFORMANCE_PROFILE:
+            _replica['PRAGMAS'] = DATABASES['default']['PRAGMAS']
+    _replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[f'replica_{_index}'] = _replica
+
+if REPLICA_DATABASE_URLS:
+    DATABASE_ROUTERS = ['backend.db.routers.ReplicaRouter']
+    # Choose the replica before anything (sessions, auth) touches the database
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.contrib.sessions.middleware.SessionMiddleware'),
+        'backend.db.routers.ReplicaPinningMiddleware',
+    )
+
 # =============================================================================
 # PASSWORD VALIDATION
 # =============================================================================
@@ -212,13 +271,30 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Built frontend (npm run build). Its index.html is served by portfolio_api.views.index
+# with the portfolio data embedded; the bundle and other build files are served by WhiteNoise.
+FRONTEND_BUILD_DIR = os.environ.get('FRONTEND_BUILD_DIR', str(BASE_DIR.parent / 'frontend' / 'build'))
+FRONTEND_INDEX_FILE = os.path.join(FRONTEND_BUILD_DIR, 'index.html')
+if os.path.isdir(FRONTEND_BUILD_DIR):
+    WHITENOISE_ROOT = FRONTEND_BUILD_DIR
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
-# File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
-DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+# File upload settings. Uploaded files are streamed to disk and validated
+# chunk by chunk (portfolio_api/uploads.py), so they never sit in worker RAM;
+# the memory limits only apply to the non-file part of a request.
+FILE_UPLOAD_HANDLERS = ['portfolio_api.uploads.StreamingUploadHandler']
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024  # 256KB
+DATA_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB (Django default)
+MAX_IMAGE_UPLOAD_SIZE = 5 * 1024 * 1024  # 5MB
+MAX_DOCUMENT_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_IMAGE_PIXELS = 40_000_000  # 40 megapixels
+
+# Resume preview/metadata is generated by a background thread after upload;
+# set to False to generate it inline (e.g. in tests).
+RESUME_PROCESSING_ASYNC = os.environ.get("RESUME_PROCESSING_ASYNC", "True").lower() in ("1", "true", "yes")
 
 # Allowed file types for uploads
 ALLOWED_IMAGE_TYPES = ['image/jpeg', 'image/png', 'image/gif', 'image/webp']
@@ -290,7 +366,7 @@ CORS_ALLOW_HEADERS = [
 # =============================================================================
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'backend.metrics.InstrumentedLocMemCache',  # LocMemCache + hit/miss/eviction metrics
         'LOCATION': 'unique-snowflake',
         'TIMEOUT': 300,  # 5 minutes
         'OPTIONS': {
@@ -307,6 +383,11 @@ CACHE_TTL = 5 * 24 * 60 * 60 # 5 days (432000 seconds)
 # LOGGING CONFIGURATION
 # =============================================================================
 
+# Loggers only talk to the 'async' queue handler; a background listener
+# thread batches records into the 'log_sink' logger, whose handlers write the
+# rotating JSON file and the console, so request threads never block on log
+# I/O. All worker processes share the file; appends and rotation are done
+# under a lock on logs/django.log.lock (see backend/log_handlers.py).
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -319,19 +400,32 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'backend.log_handlers.JsonFormatter',
+        },
     },
     'handlers': {
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'backend.log_handlers.SizeAndTimeRotatingFileHandler',
             'filename': BASE_DIR / 'logs' / 'django.log',
-            'formatter': 'verbose',
+            'max_bytes': int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024)),
+            'backup_count': int(os.environ.get("LOG_BACKUP_COUNT", "5")),
+            'interval': int(os.environ.get("LOG_ROTATE_SECONDS", 24 * 60 * 60)),
+            'formatter': 'json',
         },
         'console': {
             'level': 'DEBUG',
             'class': 'logging.StreamHandler',
             'formatter': 'simple',
         },
+        'async': {
+            '()': 'backend.log_handlers.AsyncQueueHandler',
+            'level': 'DEBUG',
+            'sink': 'log_sink',
+            'queue_size': int(os.environ.get("LOG_QUEUE_SIZE", "10000")),
+            'batch_size': 200,
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -339,11 +433,16 @@ LOGGING = {
     },
     'loggers': {
         'django': {
-            'handlers': ['file', 'console'],
+            'handlers': ['async'],
             'level': 'INFO',
             'propagate': False,
         },
         'portfolio_api': {
+            'handlers': ['async'],
+            'level': 'DEBUG',
+            'propagate': False,
+        },
+        'log_sink': {
             'handlers': ['file', 'console'],
             'level': 'DEBUG',
             'propagate': False,
@@ -351,8 +450,64 @@ LOGGING = {
     },
 }
 
-# Create logs directory if it doesn't exist
-os.makedirs(BASE_DIR / 'logs', exist_ok=True)
+
+# =============================================================================
+# METRICS CONFIGURATION
+# =============================================================================
+
+# /metrics is open to staff users, to "Authorization: Bearer <METRICS_TOKEN>"
+# and to the listed scraper addresses. Under gunicorn also set
+# PROMETHEUS_MULTIPROC_DIR so all workers are aggregated (see gunicorn.conf.py).
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = _list_from_env("METRICS_ALLOWED_IPS")
+
+# Request profiling (portfolio_api/profiling.py). Staff users profile a request
+# with "X-Profile: cprofile|sample" or "?_profile=cprofile|sample"; results are
+# listed under "Request Profiles" in the admin. PROFILING_SAMPLE_RATE profiles
+# that fraction of all requests with the sampling profiler (e.g. 0.001).
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_SAMPLE_INTERVAL = float(os.environ.get("PROFILING_SAMPLE_INTERVAL_MS", "5")) / 1000
+PROFILING_RETENTION = int(os.environ.get("PROFILING_RETENTION", "500"))
+
+# Cold-start budget for a fresh worker up to its first response, checked by
+# "python manage.py profile_startup --check" (e.g. in CI or build.sh)
+COLD_START_BUDGET_MS = float(os.environ.get("COLD_START_BUDGET_MS", "750"))
+
+# Multi-tenant hosting (portfolio_api/tenancy.py). The portfolio is picked by the
+# Host header, so every portfolio host must also be in ALLOWED_HOSTS (e.g.
+# ".example.com"). Each process reloads the host -> portfolio map this often.
+PORTFOLIO_HOSTS_TTL = float(os.environ.get("PORTFOLIO_HOSTS_TTL", "60"))
+
+# Change feed (/api/changes/, see portfolio_api/changelog.py). Entries are served
+# once they are this many seconds old, so concurrent commits cannot be skipped.
+CHANGELOG_SETTLE_SECONDS = float(os.environ.get("CHANGELOG_SETTLE_SECONDS", "1"))
+
+# Let the database render /api/projects/ and /api/experience/ list rows as JSON
+# (SQLite JSON1 or PostgreSQL; check with: python manage.py verify_db_json)
+API_DB_JSON = os.environ.get("API_DB_JSON", "False").lower() in ("1", "true", "yes")
+
+# Shared payload store (portfolio_api/payloads.py): the public read endpoints are
+# rendered into memory-mapped snapshot files that all worker processes serve from.
+# PAYLOAD_STORE_DIR must be shared by the workers; /dev/shm keeps it off the disk.
+API_PAYLOAD_STORE = os.environ.get("API_PAYLOAD_STORE", "False").lower() in ("1", "true", "yes")
+PAYLOAD_STORE_DIR = os.environ.get(
+    "PAYLOAD_STORE_DIR",
+    "/dev/shm/portfolio-payloads" if os.path.isdir("/dev/shm") else str(BASE_DIR / "payloads"),
+)
+if API_PAYLOAD_STORE:
+    MIDDLEWARE.append('portfolio_api.payloads.PayloadStoreMiddleware')
+
+# Server-Sent Events (/api/events/, ASGI only, see portfolio_api/events.py).
+# Each process polls the change log once per SSE_POLL_INTERVAL for all clients
+# and pushes entries once they are CHANGELOG_SETTLE_SECONDS old.
+SSE_POLL_INTERVAL = float(os.environ.get("SSE_POLL_INTERVAL", "2"))
+SSE_HEARTBEAT_SECONDS = float(os.environ.get("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_MAX_CONNECTIONS = int(os.environ.get("SSE_MAX_CONNECTIONS", "5000"))
+SSE_MAX_CONNECTIONS_PER_CLIENT = int(os.environ.get("SSE_MAX_CONNECTIONS_PER_CLIENT", "10"))
+# The per-client limit keys on the last X-Forwarded-For address of requests
+# from these proxies; other requests are keyed on their peer address.
+SSE_TRUSTED_PROXIES = _list_from_env("SSE_TRUSTED_PROXIES", "127.0.0.1 ::1")
+SSE_BUFFER_SIZE = int(os.environ.get("SSE_BUFFER_SIZE", "256"))
 
 
 # =============================================================================
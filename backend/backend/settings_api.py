@@ -0,0 +1,60 @@
+"""
+Settings for API-only worker processes.
+
+The public read endpoints are anonymous JSON reads, so these workers do not
+load what only the admin, the frontend entry page and staff features use:
+the admin, sessions, messages and static files apps, the session, CSRF,
+authentication, message, clickjacking, profiling and WhiteNoise middleware,
+and the template context processors. Everything else (database, caches,
+tenancy, replicas, payload store, logging, metrics) comes from
+``backend/settings.py`` unchanged.
+
+Run them with the matching entry points and send the public API to them at
+the proxy, leaving ``/admin/``, writes and the frontend to the full stack:
+
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi_api
+    uvicorn backend.asgi_api:application
+
+``python manage.py bench_api_profile`` compares startup time, memory and
+per-request overhead of both profiles.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+# contenttypes and auth stay: ProfileRecord references the user model
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS
+    if app not in (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+        'rest_framework',
+    )
+]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'whitenoise.middleware.WhiteNoiseMiddleware',
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'portfolio_api.profiling.ProfilingMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+]
+
+ROOT_URLCONF = 'backend.urls_api'
+WSGI_APPLICATION = 'backend.wsgi_api.application'
+
+# Only the error pages are rendered from templates
+TEMPLATES = [{**TEMPLATES[0], 'OPTIONS': {'context_processors': []}}]
+
+# Every request is anonymous: skip the session and basic authentication classes
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+}
@@ -0,0 +1,26 @@
+"""
+Settings for the test suite (``pytest``, see ``pytest.ini``).
+
+Everything comes from ``backend/settings.py``. The environment variables it
+expects get throwaway defaults so the tests run without a ``.env``, uploads
+and payload snapshots go to a temporary directory, and resumes are
+processed inline.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("SECRET_KEY", "insecure-test-only-key")
+os.environ.setdefault("CORS_ALLOWED_ORIGIN", "http://localhost:3000")
+
+from .settings import *  # noqa: E402,F401,F403
+
+_TEST_DIR = tempfile.mkdtemp(prefix="portfolio-tests-")
+
+ALLOWED_HOSTS = ["testserver", "localhost", ".test"]
+SECURE_SSL_REDIRECT = False
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+MEDIA_ROOT = os.path.join(_TEST_DIR, "media")
+PAYLOAD_STORE_DIR = os.path.join(_TEST_DIR, "payloads")
+RESUME_PROCESSING_ASYNC = False
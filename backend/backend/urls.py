@@ -17,21 +17,27 @@ Including another URLconf
 """
 
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from portfolio_api import views
+from backend.metrics import metrics_view
 
 # API Documentation and Home
 urlpatterns = [
-    # Home page with API information
-    path('', views.home, name='home'),
+    # Frontend entry page with the portfolio data embedded (API information
+    # when the frontend has not been built)
+    path('', views.index, name='index'),
+    re_path(r'^(?:about|projects|experience|contact)/?$', views.index),
     
     # Django admin interface
     path('admin/', admin.site.urls),
     
     # Portfolio API endpoints
     path('api/', include('portfolio_api.urls')),
+
+    # Prometheus scrape endpoint (staff, bearer token or allowlisted IPs)
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Serve media files during development
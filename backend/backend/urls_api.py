@@ -0,0 +1,20 @@
+"""
+URL configuration of the API-only worker profile (``backend.settings_api``).
+
+Only the public read endpoints and the Prometheus scrape endpoint; the
+frontend, the admin and the write endpoints are served by ``backend.urls``.
+"""
+
+from django.urls import path, include
+from backend.metrics import metrics_view
+
+urlpatterns = [
+    # Public read endpoints of the portfolio API
+    path('api/', include('portfolio_api.urls_api')),
+
+    # Prometheus scrape endpoint (bearer token or allowlisted IPs)
+    path('metrics', metrics_view, name='metrics'),
+]
+
+handler404 = 'portfolio_api.views.custom_404'
+handler500 = 'portfolio_api.views.custom_500'
@@ -0,0 +1,16 @@
+"""
+WSGI config for API-only worker processes (see ``backend/settings_api.py``).
+
+Unlike ``backend/wsgi.py`` it does not serve media files.
+
+Usage:
+    gunicorn -c backend/gunicorn.conf.py backend.wsgi_api
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings_api')
+
+application = get_wsgi_application()
@@ -39,3 +39,8 @@ from django.contrib.auth import get_user_model;
 User = get_user_model();
 print(list(User.objects.values('username','is_staff','is_superuser')))
 "
+
+# Build machines are slower and noisier than the workers, so the build fails
+# only on a gross regression: over BUILD_COLD_START_BUDGET_MS (default 3000).
+echo "⏱️ Checking cold start against BUILD_COLD_START_BUDGET_MS..."
+python manage.py profile_startup --runs 3 --depth 1 --check --budget "${BUILD_COLD_START_BUDGET_MS:-3000}"
@@ -1,18 +1,49 @@
 from django.contrib import admin
+from django.http import Http404, HttpResponse
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import path, reverse
 from django.utils.safestring import mark_safe
-from .models import PersonalInfo, Skill, Project, Experience, Education, Contact, SocialLink
+from .admin_utils import (
+    CachedAllValuesFieldListFilter, CachedRelatedFieldListFilter,
+    EstimatedCountPaginator, PortfolioMemberAdminMixin, ReorderAdminMixin, SuperuserAdminMixin,
+    UploadErrorsAdminMixin, get_thumbnail_url
+)
+from .utils import format_file_size
+from .models import (
+    Portfolio, PersonalInfo, Skill, Project, Experience, Education, Contact, SocialLink, ProfileRecord, MediaBlob
+)
+
+
+@admin.register(Portfolio)
+class PortfolioAdmin(SuperuserAdminMixin, admin.ModelAdmin):
+    """
+    Admin configuration for Portfolio model.
+
+    Content is edited on each portfolio's own host: the other admin pages
+    only show the portfolio the admin is being accessed through, and only
+    to its members. Portfolios and their members are managed by superusers.
+    """
+
+    list_display = ('name', 'host', 'is_active', 'created_at')
+    list_filter = ('is_active',)
+    search_fields = ('name', 'host')
+    readonly_fields = ('created_at',)
+    filter_horizontal = ('members',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(SocialLink)
-class SocialLinkAdmin(admin.ModelAdmin):
+class SocialLinkAdmin(PortfolioMemberAdminMixin, ReorderAdminMixin, admin.ModelAdmin):
     """Admin configuration for SocialLink model."""
     
     list_display = ('platform', 'display_text', 'url', 'is_active', 'order', 'personal_info')
     list_filter = ('platform', 'is_active')
     search_fields = ('display_text', 'url')
     list_editable = ('is_active', 'order')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['reorder_selected']
     ordering = ('order', 'platform')
     fieldsets = (
         (None, {
@@ -39,19 +70,21 @@ class SocialLinkInline(admin.StackedInline):
 
 
 @admin.register(PersonalInfo)
-class PersonalInfoAdmin(admin.ModelAdmin):
+class PersonalInfoAdmin(PortfolioMemberAdminMixin, UploadErrorsAdminMixin, admin.ModelAdmin):
     """Admin configuration for PersonalInfo model."""
     
     list_display = ('name', 'title', 'email', 'location', 'created_at')
     list_filter = ('created_at', 'updated_at')
     search_fields = ('name', 'title', 'email', 'bio')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'get_resume_preview', 'resume_page_count',
+                       'get_resume_size', 'resume_status')
     fieldsets = (
         ('Basic Information', {
             'fields': ('name', 'title', 'bio', 'email', 'phone', 'location')
         }),
         ('Files', {
-            'fields': ('profile_image', 'resume'),
+            'fields': ('profile_image', 'resume', 'get_resume_preview', 'resume_page_count',
+                       'get_resume_size', 'resume_status'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -67,9 +100,21 @@ class PersonalInfoAdmin(admin.ModelAdmin):
             return []
         return super().get_inline_instances(request, obj)
     
+    def get_resume_preview(self, obj):
+        """Display the generated first-page preview of the resume."""
+        if obj.resume_preview:
+            return format_html('<img src="{}" width="200" loading="lazy" />', obj.resume_preview.url)
+        return "No preview"
+    get_resume_preview.short_description = 'Resume Preview'
+
+    def get_resume_size(self, obj):
+        """Display the resume size in human-readable form."""
+        return format_file_size(obj.resume_size) if obj.resume_size is not None else '-'
+    get_resume_size.short_description = 'Resume Size'
+
     def has_add_permission(self, request):
-        """Only allow one PersonalInfo instance."""
-        return not PersonalInfo.objects.exists()
+        """Only allow one PersonalInfo instance per portfolio."""
+        return super().has_add_permission(request) and not PersonalInfo.objects.exists()
     
     def save_formset(self, request, form, formset, change):
         """
@@ -84,7 +129,7 @@ class PersonalInfoAdmin(admin.ModelAdmin):
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(PortfolioMemberAdminMixin, ReorderAdminMixin, admin.ModelAdmin):
     """Admin configuration for Skill model."""
     
     list_display = ('name', 'category', 'proficiency', 'order', 'get_proficiency_bar')
@@ -92,6 +137,9 @@ class SkillAdmin(admin.ModelAdmin):
     search_fields = ('name', 'description')
     ordering = ('category', 'order', 'name')
     list_editable = ('order', 'proficiency')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['reorder_selected']
     
     fieldsets = (
         ('Basic Information', {
@@ -115,16 +163,19 @@ class SkillAdmin(admin.ModelAdmin):
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(PortfolioMemberAdminMixin, UploadErrorsAdminMixin, ReorderAdminMixin, admin.ModelAdmin):
     """Admin configuration for Project model."""
     
     list_display = ('title', 'featured', 'order', 'get_technologies', 'created_at')
-    list_filter = ('featured', 'technologies', 'created_at')
+    list_filter = ('featured', ('technologies', CachedRelatedFieldListFilter), 'created_at')
     search_fields = ('title', 'description', 'short_description')
     filter_horizontal = ('technologies',)
     ordering = ('-featured', 'order', '-created_at')
     readonly_fields = ('created_at', 'updated_at')
     list_editable = ('featured', 'order')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['reorder_selected']
     
     fieldsets = (
         ('Basic Information', {
@@ -142,22 +193,30 @@ class ProjectAdmin(admin.ModelAdmin):
         })
     )
     
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.prefetch_related('technologies')
+
     def get_technologies(self, obj):
         """Display technologies as a comma-separated list."""
-        return ', '.join([tech.name for tech in obj.technologies.all()[:3]])
+        # Slice in Python so the prefetched technologies are reused
+        return ', '.join([tech.name for tech in list(obj.technologies.all())[:3]])
     get_technologies.short_description = 'Technologies'
 
 
 @admin.register(Experience)
-class ExperienceAdmin(admin.ModelAdmin):
+class ExperienceAdmin(PortfolioMemberAdminMixin, UploadErrorsAdminMixin, ReorderAdminMixin, admin.ModelAdmin):
     """Admin configuration for Experience model."""
     
     list_display = ('position', 'company', 'location', 'start_date', 'end_date', 'current', 'order', 'company_logo_preview')
-    list_filter = ('current', 'start_date', 'company')
+    list_filter = ('current', 'start_date', ('company', CachedAllValuesFieldListFilter))
     search_fields = ('position', 'company', 'description', 'achievements')
     filter_horizontal = ('technologies_used',)
     ordering = ('-start_date', 'order')
     list_editable = ('order', 'current')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['reorder_selected']
     readonly_fields = ('company_logo_preview',)
     fieldsets = (
             ('Position Details', {
@@ -179,20 +238,26 @@ class ExperienceAdmin(admin.ModelAdmin):
     
     def company_logo_preview(self, obj):
         if obj.company_logo:
-            return mark_safe(f'<img src="{obj.company_logo.url}" width="50" height="50" style="object-fit: contain;" />')
+            return format_html(
+                '<img src="{}" width="50" height="50" style="object-fit: contain;" loading="lazy" />',
+                get_thumbnail_url(obj.company_logo)
+            )
         return "No logo"
     company_logo_preview.short_description = 'Logo Preview'
 
 
 @admin.register(Education)
-class EducationAdmin(admin.ModelAdmin):
+class EducationAdmin(PortfolioMemberAdminMixin, UploadErrorsAdminMixin, ReorderAdminMixin, admin.ModelAdmin):
     """Admin configuration for Education model."""
     
     list_display = ('degree', 'field_of_study', 'institution', 'start_date', 'end_date', 'current', 'cpi', 'order', 'institution_logo_preview')
-    list_filter = ('current', 'start_date', 'institution')
+    list_filter = ('current', 'start_date', ('institution', CachedAllValuesFieldListFilter))
     search_fields = ('degree', 'field_of_study', 'institution', 'description')
     ordering = ('-start_date', 'order')
     list_editable = ('order', 'current')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ['reorder_selected']
     readonly_fields = ('institution_logo_preview',)
     fieldsets = (
             ('Institution Details', {
@@ -214,13 +279,16 @@ class EducationAdmin(admin.ModelAdmin):
     
     def institution_logo_preview(self, obj):
         if obj.institution_logo:
-            return mark_safe(f'<img src="{obj.institution_logo.url}" width="50" height="50" style="object-fit: contain;" />')
+            return format_html(
+                '<img src="{}" width="50" height="50" style="object-fit: contain;" loading="lazy" />',
+                get_thumbnail_url(obj.institution_logo)
+            )
         return "No logo"
     institution_logo_preview.short_description = 'Logo Preview'
 
 
 @admin.register(Contact)
-class ContactAdmin(admin.ModelAdmin):
+class ContactAdmin(PortfolioMemberAdminMixin, admin.ModelAdmin):
     """Admin configuration for Contact model."""
     
     list_display = ('name', 'email', 'subject', 'created_at', 'read', 'get_message_preview')
@@ -230,6 +298,8 @@ class ContactAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     list_editable = ('read',)
     actions = ['mark_as_read', 'mark_as_unread']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Contact Information', {
@@ -260,3 +330,94 @@ class ContactAdmin(admin.ModelAdmin):
         updated = queryset.update(read=False)
         self.message_user(request, f'{updated} message(s) marked as unread.')
     mark_as_unread.short_description = "Mark selected messages as unread"
+
+
+@admin.register(ProfileRecord)
+class ProfileRecordAdmin(SuperuserAdminMixin, admin.ModelAdmin):
+    """Admin configuration for request profiles captured by ProfilingMiddleware."""
+
+    list_display = ('created_at', 'method', 'path', 'status_code', 'duration_ms', 'query_count',
+                    'mode', 'trigger', 'user')
+    list_filter = ('mode', 'trigger', 'method', 'created_at')
+    search_fields = ('path',)
+    list_select_related = ('user',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-created_at',)
+    fields = ('created_at', 'method', 'path', 'status_code', 'duration_ms', 'query_count',
+              'mode', 'trigger', 'user', 'get_downloads', 'get_summary')
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == 'portfolio_api_profilerecord_changelist':
+            # The profile payloads can be large and are only shown on the detail page
+            qs = qs.defer('summary', 'collapsed_stacks', 'pstats_data')
+        return qs
+
+    def get_urls(self):
+        urls = [
+            path('<int:pk>/download/<str:fmt>/', self.admin_site.admin_view(self.download_view),
+                 name='portfolio_api_profilerecord_download'),
+        ]
+        return urls + super().get_urls()
+
+    def download_view(self, request, pk, fmt):
+        """Download the pstats file (cProfile) or collapsed stacks (sampling)."""
+        if not self.has_view_permission(request):
+            raise Http404
+        record = self.get_object(request, pk)
+        if record is None:
+            raise Http404
+        if fmt == 'pstats' and record.pstats_data:
+            response = HttpResponse(bytes(record.pstats_data), content_type='application/octet-stream')
+            filename = f'profile-{record.pk}.prof'
+        elif fmt == 'collapsed' and record.collapsed_stacks:
+            response = HttpResponse(record.collapsed_stacks, content_type='text/plain; charset=utf-8')
+            filename = f'profile-{record.pk}.collapsed'
+        else:
+            raise Http404
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def get_downloads(self, obj):
+        """Links to the raw profile data."""
+        links = []
+        if obj.pstats_data:
+            url = reverse('admin:portfolio_api_profilerecord_download', args=[obj.pk, 'pstats'])
+            links.append(format_html('<a href="{}">pstats (.prof)</a>', url))
+        if obj.collapsed_stacks:
+            url = reverse('admin:portfolio_api_profilerecord_download', args=[obj.pk, 'collapsed'])
+            links.append(format_html('<a href="{}">collapsed stacks (flamegraph)</a>', url))
+        return mark_safe(' | '.join(links)) if links else '-'
+    get_downloads.short_description = 'Download'
+
+    def get_summary(self, obj):
+        """Text summary of the profile."""
+        return format_html('<pre style="white-space: pre; overflow-x: auto;">{}</pre>', obj.summary)
+    get_summary.short_description = 'Summary'
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(SuperuserAdminMixin, admin.ModelAdmin):
+    """Read-only view of the content-addressed media store."""
+
+    list_display = ('name', 'size', 'ref_count', 'created_at')
+    list_filter = ('created_at',)
+    search_fields = ('name', 'sha256')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    readonly_fields = ('name', 'sha256', 'size', 'ref_count', 'created_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
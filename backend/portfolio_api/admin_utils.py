@@ -0,0 +1,265 @@
+"""
+Helpers for keeping the Portfolio API admin changelists cheap on large tables.
+
+This module contains a paginator with bounded/estimated counts, list filters
+whose choices are cached until the underlying content changes, small cached
+preview thumbnails for logo fields, a drag-and-drop bulk reorder page,
+reporting of uploads rejected by the streaming upload handler, and the
+mixins that limit each admin to the users allowed to manage it.
+"""
+
+import logging
+import os
+from io import BytesIO
+
+from django.contrib import admin, messages
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.functional import cached_property
+
+from .constants import ADMIN_COUNT_LIMIT, ADMIN_FILTER_CACHE_KEY, ADMIN_THUMBNAIL_SIZE, CACHE_TTL_ADMIN
+from .ordering import apply_order
+from .tenancy import cache_key, can_manage
+
+logger = logging.getLogger(__name__)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids full ``COUNT(*)`` scans where it can.
+
+    Rows are counted up to ``ADMIN_COUNT_LIMIT`` first, which answers small
+    tables and narrow filters exactly. Larger unfiltered PostgreSQL tables
+    use the planner estimate from ``pg_class`` (kept current by autovacuum);
+    anything else that exceeds the limit is counted in full, so every page
+    stays reachable.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        estimate = self._estimated_count(queryset)
+        if estimate is not None and estimate > ADMIN_COUNT_LIMIT:
+            return estimate
+        bounded = queryset[:ADMIN_COUNT_LIMIT + 1].count()
+        if bounded <= ADMIN_COUNT_LIMIT:
+            return bounded
+        return queryset.count()
+
+    def _estimated_count(self, queryset):
+        if queryset.query.where:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] > 0 else None
+
+
+class PortfolioMemberAdminMixin:
+    """
+    Limit a content admin to users who manage the portfolio it is accessed through.
+
+    The rows are already scoped to that portfolio by its host; this keeps
+    staff users of other portfolios out (see ``tenancy.can_manage``).
+    """
+
+    def _can_manage(self, request):
+        return can_manage(request.user, getattr(request, 'portfolio_id', None))
+
+    def has_module_permission(self, request):
+        return self._can_manage(request) and super().has_module_permission(request)
+
+    def has_view_permission(self, request, obj=None):
+        return self._can_manage(request) and super().has_view_permission(request, obj)
+
+    def has_add_permission(self, request):
+        return self._can_manage(request) and super().has_add_permission(request)
+
+    def has_change_permission(self, request, obj=None):
+        return self._can_manage(request) and super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        return self._can_manage(request) and super().has_delete_permission(request, obj)
+
+
+class SuperuserAdminMixin:
+    """Limit an admin for deployment-wide data (portfolios, profiles, the media store) to superusers."""
+
+    def has_module_permission(self, request):
+        return request.user.is_superuser and super().has_module_permission(request)
+
+    def has_view_permission(self, request, obj=None):
+        return request.user.is_superuser and super().has_view_permission(request, obj)
+
+    def has_add_permission(self, request):
+        return request.user.is_superuser and super().has_add_permission(request)
+
+    def has_change_permission(self, request, obj=None):
+        return request.user.is_superuser and super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        return request.user.is_superuser and super().has_delete_permission(request, obj)
+
+
+class CachedAllValuesFieldListFilter(admin.AllValuesFieldListFilter):
+    """``AllValuesFieldListFilter`` that caches its distinct values."""
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        # ``lookup_choices`` is still a lazy queryset here, so no query has run yet
+        key = cache_key(ADMIN_FILTER_CACHE_KEY.format(model=model._meta.model_name, field=field_path))
+        choices = cache.get(key)
+        if choices is None:
+            choices = list(self.lookup_choices)
+            cache.set(key, choices, CACHE_TTL_ADMIN)
+        self.lookup_choices = choices
+
+
+class CachedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """``RelatedFieldListFilter`` that caches the related object choices."""
+
+    def field_choices(self, field, request, model_admin):
+        key = cache_key(ADMIN_FILTER_CACHE_KEY.format(
+            model=field.model._meta.model_name, field=field.name
+        ))
+        choices = cache.get(key)
+        if choices is None:
+            choices = super().field_choices(field, request, model_admin)
+            cache.set(key, choices, CACHE_TTL_ADMIN)
+        return choices
+
+
+def get_thumbnail_url(image_field, size=ADMIN_THUMBNAIL_SIZE):
+    """
+    Return the URL of a small PNG thumbnail for an image field.
+
+    Thumbnails are written once to ``thumbnails/<size>/`` next to the media
+    files and their URLs are cached, so changelists never embed full-size
+    images.
+
+    Args:
+        image_field: The ``ImageFieldFile`` to preview
+        size (int): Maximum width/height in pixels
+
+    Returns:
+        Optional[str]: The thumbnail URL, or the original URL if it cannot be built
+    """
+    if not image_field:
+        return None
+    key = f'admin_thumbnail_{size}_{image_field.name}'
+    url = cache.get(key)
+    if url:
+        return url
+
+    root, _ = os.path.splitext(image_field.name)
+    thumb_name = f'thumbnails/{size}/{root}.png'
+    try:
+        if not default_storage.exists(thumb_name):
+            from PIL import Image
+
+            with image_field.open('rb') as source:
+                image = Image.open(source)
+                image.draft('RGB', (size, size))
+                image.thumbnail((size, size))
+                buffer = BytesIO()
+                image.save(buffer, format='PNG', optimize=True)
+            thumb_name = default_storage.save(thumb_name, ContentFile(buffer.getvalue()))
+        url = default_storage.url(thumb_name)
+    except (OSError, ValueError) as exc:
+        logger.warning('Could not build thumbnail for %s: %s', image_field.name, exc)
+        return image_field.url
+    cache.set(key, url, CACHE_TTL_ADMIN)
+    return url
+
+
+class ReorderAdminMixin:
+    """
+    Add a drag-and-drop reorder page to a ModelAdmin.
+
+    The page is reachable through the ``reorder_selected`` action (for the
+    selected rows) or directly at ``<changelist>/reorder/`` (for all rows),
+    and saves the new order with a single ``apply_order`` call.
+    """
+    reorder_template = 'admin/portfolio_api/reorder.html'
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        urls = [
+            path('reorder/', self.admin_site.admin_view(self.reorder_view), name='%s_%s_reorder' % info),
+        ]
+        return urls + super().get_urls()
+
+    def reorder_selected(self, request, queryset):
+        """Open the reorder page for the selected items."""
+        info = self.opts.app_label, self.opts.model_name
+        ids = ','.join(str(pk) for pk in queryset.values_list('pk', flat=True))
+        return HttpResponseRedirect(f"{reverse('admin:%s_%s_reorder' % info)}?ids={ids}")
+    reorder_selected.short_description = "Reorder selected items (drag and drop)"
+
+    def reorder_view(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        info = self.opts.app_label, self.opts.model_name
+        changelist_url = reverse('admin:%s_%s_changelist' % info)
+        if request.method == 'POST':
+            try:
+                ids = [int(pk) for pk in request.POST.getlist('ids')]
+                updated = apply_order(self.model, ids)
+            except ValueError as e:
+                self.message_user(request, f'Could not reorder: {e}', messages.ERROR)
+            else:
+                self.message_user(request, f'{updated} item(s) reordered.')
+            return HttpResponseRedirect(changelist_url)
+
+        queryset = self.get_queryset(request)
+        ids = request.GET.get('ids')
+        if ids:
+            queryset = queryset.filter(pk__in=[pk for pk in ids.split(',') if pk.isdigit()])
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.opts,
+            'title': f'Reorder {self.opts.verbose_name_plural}',
+            'objects': queryset,
+            'changelist_url': changelist_url,
+        }
+        return TemplateResponse(request, self.reorder_template, context)
+
+
+class UploadErrorsAdminMixin:
+    """
+    Show uploads rejected by ``StreamingUploadHandler`` as errors on their fields.
+
+    The handler drops a rejected file while the request is parsed and records
+    the reason in ``request.upload_errors``; without this the form would
+    silently keep the previous file.
+    """
+
+    def get_form(self, request, obj=None, **kwargs):
+        form_class = super().get_form(request, obj, **kwargs)
+
+        class UploadCheckedForm(form_class):
+            def clean(self):
+                cleaned_data = super().clean()
+                for field, message in getattr(request, 'upload_errors', {}).items():
+                    if field in self.fields:
+                        self.add_error(field, message)
+                return cleaned_data
+
+        UploadCheckedForm.__name__ = form_class.__name__
+        return UploadCheckedForm
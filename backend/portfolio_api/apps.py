@@ -23,3 +23,19 @@ class PortfolioApiConfig(AppConfig):
             import portfolio_api.signals  # noqa
         except ImportError:
             pass
+
+        # Apply per-connection SQLite pragmas when a performance profile is configured
+        from django.db.backends.signals import connection_created
+        from backend.db.sqlite import configure_connection
+        connection_created.connect(configure_connection, dispatch_uid='sqlite_performance_profile')
+
+        # Count coalesced cache invalidations for /metrics
+        from portfolio_api.invalidation import content_invalidated
+        from backend.metrics import record_invalidation
+        content_invalidated.connect(record_invalidation, dispatch_uid='metrics_cache_invalidation')
+
+        # Rebuild the shared payload snapshots when public content changes
+        from django.conf import settings
+        if settings.API_PAYLOAD_STORE:
+            from portfolio_api.payloads import rebuild_invalidated
+            content_invalidated.connect(rebuild_invalidated, dispatch_uid='payload_store_rebuild')
@@ -0,0 +1,161 @@
+"""
+Change log behind the ``/api/changes/`` feed.
+
+The signal receivers in ``signals.py`` (and the bulk helpers that bypass
+them) call ``record`` for every created, updated or deleted PersonalInfo,
+SocialLink, Skill, Project, Experience and Education. Like cache
+invalidations, changes made inside a transaction are collected per
+connection, collapsed to one entry per object and written with a single
+``bulk_create`` when the transaction commits, so a rolled-back edit never
+shows up in the feed.
+
+Clients read the feed from an opaque token (``encode_token``) that wraps the
+id of the last entry they saw. Entries are only served once they are
+``CHANGELOG_SETTLE_SECONDS`` old, so an entry committed by a slower
+concurrent transaction with a lower id cannot be skipped.
+``manage.py compact_changelog`` drops entries superseded by a newer entry
+for the same object; that never invalidates a token. Entries belong to the
+portfolio of their object, so each portfolio has its own feed.
+"""
+
+import base64
+import binascii
+import sys
+import threading
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from . import tenancy
+
+TOKEN_PREFIX = 'c1:'
+
+_local = threading.local()
+
+# (previous action, new action) -> resulting action; None drops the entry
+_COMBINED = {
+    ('created', 'updated'): 'created',
+    ('created', 'deleted'): None,
+    ('deleted', 'created'): 'updated',
+}
+
+
+class _Batch:
+    """Changes waiting for the current transaction on one connection to commit."""
+
+    def __init__(self, using):
+        self.using = using
+        self.changes = {}
+        self.done = False
+
+    def add(self, model_name, pk, action, portfolio_id):
+        key = (model_name, pk)
+        previous = self.changes.get(key)
+        if previous is not None:
+            action = _COMBINED.get((previous[0], action), action)
+        # Re-inserting keeps the entries in the order of their last change
+        self.changes.pop(key, None)
+        if action is not None:
+            self.changes[key] = (action, portfolio_id)
+
+    def flush(self):
+        self.done = True
+        _write(self.changes, self.using)
+
+
+def _write(changes, using):
+    if not changes:
+        return
+    ChangeLogEntry = apps.get_model('portfolio_api', 'ChangeLogEntry')
+    Portfolio = apps.get_model('portfolio_api', 'Portfolio')
+    # Deleting a portfolio deletes (and logs) all of its content; drop those entries
+    existing = set(Portfolio.objects.using(using).filter(
+        pk__in={portfolio_id for _, portfolio_id in changes.values()}
+    ).values_list('pk', flat=True))
+    ChangeLogEntry.objects.using(using).bulk_create([
+        ChangeLogEntry(model=model_name, object_id=pk, action=action, portfolio_id=portfolio_id)
+        for (model_name, pk), (action, portfolio_id) in changes.items()
+        if portfolio_id in existing
+    ])
+    # Push to event stream clients of this process without waiting for the next poll.
+    # Only processes serving the stream (ASGI) have imported the events module.
+    events = sys.modules.get('portfolio_api.events')
+    if events is not None:
+        events.notify()
+
+
+def _pending():
+    if not hasattr(_local, 'batches'):
+        _local.batches = {}
+    return _local.batches
+
+
+def _is_registered(batch):
+    # A rollback discards the on_commit callback; see invalidation._is_registered
+    connection = connections[batch.using]
+    return any(func == batch.flush for _, func, _ in connection.run_on_commit)
+
+
+def _portfolios(model, pks, portfolio_id, using):
+    """Return ``{pk: portfolio id}`` for the changed objects."""
+    portfolio_id = portfolio_id or tenancy.current_portfolio_id()
+    if portfolio_id is not None:
+        return dict.fromkeys(pks, portfolio_id)
+    # Outside a request (management commands): look the objects up
+    found = dict(model._base_manager.using(using).filter(pk__in=pks).values_list('pk', 'portfolio_id'))
+    default = tenancy.default_portfolio_id()
+    return {pk: found.get(pk, default) for pk in pks}
+
+
+def record(model, pks, action, using=None, portfolio_id=None):
+    """
+    Add objects to the change log once the current transaction commits.
+
+    Args:
+        model: Model class (or instance) the objects belong to
+        pks (Iterable[int]): Primary keys of the changed objects
+        action (str): ``created``, ``updated`` or ``deleted``
+        using (str): Database alias whose transaction should be followed
+        portfolio_id (int | None): Portfolio of the objects; defaults to the
+            active portfolio, or is looked up
+    """
+    using = using or DEFAULT_DB_ALIAS
+    model_name = model._meta.model_name
+    pks = [pk for pk in pks if pk is not None]
+    if not pks:
+        return
+    portfolios = _portfolios(model, pks, portfolio_id, using)
+
+    if not connections[using].in_atomic_block:
+        _write({(model_name, pk): (action, portfolios[pk]) for pk in pks}, using)
+        return
+
+    batches = _pending()
+    batch = batches.get(using)
+    if batch is None or batch.done or not _is_registered(batch):
+        batch = _Batch(using)
+        batches[using] = batch
+        transaction.on_commit(batch.flush, using=using)
+    for pk in pks:
+        batch.add(model_name, pk, action, portfolios[pk])
+
+
+def encode_token(position):
+    """Return the opaque feed token for a change log position."""
+    return base64.urlsafe_b64encode(f'{TOKEN_PREFIX}{position}'.encode()).decode().rstrip('=')
+
+
+def decode_token(token):
+    """
+    Return the change log position wrapped in a feed token.
+
+    Raises:
+        ValueError: If the token was not produced by ``encode_token``
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError('Malformed token') from None
+    if not raw.startswith(TOKEN_PREFIX) or not raw[len(TOKEN_PREFIX):].isdigit():
+        raise ValueError('Malformed token')
+    return int(raw[len(TOKEN_PREFIX):])
@@ -27,6 +27,19 @@ UPLOAD_PATHS = {
     'projects': 'media/projects/',
 }
 
+# Content-addressed media (see storage.py)
+MEDIA_BLOB_PREFIX = 'cas'
+MEDIA_INCOMING_DIR = '.incoming'
+MEDIA_GC_GRACE_HOURS = 24
+
+# Change feed (see changelog.py)
+CHANGES_PAGE_SIZE = 500  # Log entries read per /api/changes/ request
+CHANGELOG_COMPACT_AFTER_DAYS = 7
+
+# Resume preview and metadata (see resume.py)
+RESUME_PREVIEW_WIDTH = 800  # pixels
+RESUME_TEXT_MAX_CHARS = 20000
+
 # API Configuration
 API_VERSION = '1.0.0'
 API_TITLE = 'Portfolio API'
@@ -45,5 +58,67 @@ VALIDATION_MESSAGES = {
     'end_date_before_start': 'End date cannot be before start date',
     'current_with_end_date': 'Current position should not have an end date',
     'only_one_personal_info': 'Only one PersonalInfo instance can exist',
+    'upload_too_large': 'File is too large (maximum {}).',
+    'upload_bad_type': 'Unsupported file type: the content does not match an allowed format.',
+    'upload_invalid_image': 'Upload a valid image. The file is not an image or is corrupted.',
+    'upload_too_many_pixels': 'Image dimensions {}x{} are too large.',
+}
+
+# Upload form fields and the kind of content they accept (see uploads.py)
+UPLOAD_FIELD_KINDS = {
+    'profile_image': 'image',
+    'image': 'image',
+    'company_logo': 'image',
+    'institution_logo': 'image',
+    'resume': 'document',
+}
+
+# Skills bucketed by category (/api/skills/grouped/)
+SKILLS_GROUPED_CACHE_KEY = 'skills_grouped'
+TIMELINE_CACHE_KEY = 'timeline'
+INDEX_PAGE_CACHE_KEY = 'index_page'
+
+# Public read endpoints kept in the shared payload store (see payloads.py),
+# with the further pages of paginated lists up to PAYLOAD_STORE_MAX_PAGES
+PAYLOAD_STORE_PATHS = [
+    '/api/personal-info/',
+    '/api/skills/',
+    '/api/skills/grouped/',
+    '/api/skills/top/',
+    '/api/projects/',
+    '/api/experience/',
+    '/api/education/',
+    '/api/timeline/',
+]
+PAYLOAD_STORE_MAX_PAGES = 20
+PAYLOAD_STORE_MAX_ORIGINS = 8  # Snapshots per portfolio (one per scheme and host)
+
+# Worker profiles: settings module and WSGI module (see backend/settings_api.py)
+WORKER_PROFILES = {
+    'full': ('backend.settings', 'backend.wsgi'),
+    'api': ('backend.settings_api', 'backend.wsgi_api'),
+}
+
+# Orderings accepted by /api/skills/top/?by=
+TOP_SKILLS_ORDERING = {
+    'total': '-total_count',
+    'projects': '-project_count',
+    'experience': '-experience_count',
+}
+
+# Cache keys cleared when content of each model changes
+CACHE_KEYS = {
+    'personalinfo': ['personal_info_current', 'index_page'],
+    'sociallink': ['personal_info_current', 'index_page'],
+    'skill': ['skills_all', 'skills_grouped', 'timeline', 'index_page', 'admin_filter_project_technologies'],
+    'project': ['projects_all', 'projects_featured', 'skills_grouped', 'index_page'],
+    'experience': ['experience_all', 'skills_grouped', 'timeline', 'index_page', 'admin_filter_experience_company'],
+    'education': ['education_all', 'timeline', 'index_page', 'admin_filter_education_institution'],
+    'contact': ['contacts_unread_count'],
 }
 
+# Admin changelists
+ADMIN_COUNT_LIMIT = 10000  # Rows counted with a bounded query before using estimates or a full count
+ADMIN_THUMBNAIL_SIZE = 100  # Max width/height of logo previews, in pixels
+ADMIN_FILTER_CACHE_KEY = 'admin_filter_{model}_{field}'
+CACHE_TTL_ADMIN = 24 * 60 * 60  # 1 day
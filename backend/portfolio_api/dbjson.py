@@ -0,0 +1,193 @@
+"""
+Database-side JSON rendering for the project and experience lists.
+
+With ``API_DB_JSON`` enabled, ``ProjectViewSet`` and ``ExperienceViewSet``
+let the database build each result row as a JSON document, in exactly the
+bytes ``ProjectSerializer``/``ExperienceSerializer`` plus ``JSONRenderer``
+would produce, and stream those rows into the response. No model instances
+or serializers are created for the rows.
+
+* SQLite (JSON1) uses ``json_object`` for the row and ``json_each`` /
+  ``json_group_array`` to re-emit the pre-rendered technologies.
+* PostgreSQL concatenates ``to_json(...)::text`` values under fixed keys:
+  ``json_build_object``/``json_agg`` pad their output with spaces and jsonb
+  reorders keys, so neither yields the renderer's compact bytes.
+
+Technologies and media URLs come from the ``rendered`` column (see
+``readmodel``). Each element of the stored technologies is rebuilt field by
+field because Django stores JSON with ASCII escapes and the renderer does
+not. Other databases, or a non-UTC time zone, fall back to the ORM path.
+
+``manage.py verify_db_json`` compares both paths byte for byte and times
+them.
+"""
+
+import json
+
+from django.conf import settings
+from django.db import connections, models
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .models import Experience, Project
+from .readmodel import SKILL_FIELDS
+
+SUPPORTED_VENDORS = ('sqlite', 'postgresql')
+
+# Serializer fields that are not plain model columns
+SPECIAL_FIELDS = {
+    Project: {'technologies': 'technologies', 'image': 'media', 'project_image_url': 'media'},
+    Experience: {'technologies_used': 'technologies', 'company_logo': 'media', 'company_logo_url': 'media'},
+}
+
+ROW_ALIAS = 'json_row'
+
+
+def supported(queryset):
+    """Return True if rows of this queryset can be rendered by its database."""
+    return (
+        queryset.model in SPECIAL_FIELDS
+        and connections[queryset.db].vendor in SUPPORTED_VENDORS
+        # The serializers render datetimes in the current time zone; the SQL renders UTC
+        and (not settings.USE_TZ or timezone.get_current_timezone_name() == 'UTC')
+    )
+
+
+def _field_kinds(model, field_names):
+    """Return ``[(key, kind, column)]`` in serializer field order."""
+    special = SPECIAL_FIELDS[model]
+    kinds = []
+    for name in field_names:
+        if name in special:
+            kinds.append((name, special[name], 'rendered'))
+            continue
+        field = model._meta.get_field(name)
+        if isinstance(field, models.DateTimeField):
+            kind = 'datetime'
+        elif isinstance(field, models.BooleanField):
+            kind = 'bool'
+        else:
+            kind = 'value'
+        kinds.append((name, kind, field.attname))
+    return kinds
+
+
+class JSONRow(models.Func):
+    """
+    One serialized row, as JSON text.
+
+    Args:
+        model: Project or Experience
+        field_names (list[str]): Serializer fields, in output order
+        origin (str): Scheme and host that relative media URLs are prefixed with
+    """
+
+    output_field = models.TextField()
+
+    def __init__(self, model, field_names, origin):
+        self.kinds = _field_kinds(model, field_names)
+        self.origin = origin
+        super().__init__(*[models.F(column) for _, _, column in self.kinds])
+
+    def _compiled(self, compiler, connection):
+        for (key, kind, _), expression in zip(self.kinds, self.source_expressions):
+            sql, params = compiler.compile(expression)
+            yield key, kind, sql, list(params)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        parts, params = [], []
+        for key, kind, sql, column_params in self._compiled(compiler, connection):
+            if kind == 'bool':
+                sql = f"json(CASE WHEN {sql} THEN 'true' ELSE 'false' END)"
+            elif kind == 'datetime':
+                # Stored as 'YYYY-MM-DD HH:MM:SS[.ffffff]' in UTC
+                sql = f"(replace({sql}, ' ', 'T') || 'Z')"
+            elif kind == 'media':
+                url = f"json_extract({sql}, '$.media_url')"
+                sql = (f"CASE WHEN {url} LIKE '/%%' AND {url} NOT LIKE '//%%' "
+                       f"THEN %s || {url} ELSE {url} END")
+                column_params = column_params * 2 + [self.origin] + column_params * 2
+            elif kind == 'technologies':
+                skill = ', '.join(f"'{name}', json_extract(t.value, '$.{name}')" for name in SKILL_FIELDS)
+                sql = (f"(SELECT json_group_array(json(o)) FROM (SELECT json_object({skill}) AS o "
+                       f"FROM json_each({sql}, '$.technologies') AS t ORDER BY t.key))")
+                sql = f'json({sql})'
+            parts.append(f'%s, {sql}')
+            params += [key, *column_params]
+        return f"json_object({', '.join(parts)})", params
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        parts, params = [], []
+        for key, kind, sql, column_params in self._compiled(compiler, connection):
+            if kind == 'datetime':
+                utc = f"({sql} AT TIME ZONE 'UTC')"
+                sql = (f"to_json(to_char({utc}, 'YYYY-MM-DD\"T\"HH24:MI:SS') || "
+                       f"CASE WHEN extract(microseconds FROM {utc})::bigint %% 1000000 = 0 "
+                       f"THEN '' ELSE to_char({utc}, '.US') END || 'Z')")
+                column_params = column_params * 3
+            elif kind == 'media':
+                url = f"({sql} ->> 'media_url')"
+                sql = (f"to_json(CASE WHEN {url} LIKE '/%%' AND {url} NOT LIKE '//%%' "
+                       f"THEN %s || {url} ELSE {url} END)")
+                column_params = column_params * 2 + [self.origin] + column_params * 2
+            elif kind == 'technologies':
+                skill = " || ',' || ".join(
+                    f"'\"{name}\":' || COALESCE((t -> '{name}')::text, 'null')" for name in SKILL_FIELDS
+                )
+                sql = (f"('[' || COALESCE((SELECT string_agg('{{' || {skill} || '}}', ',' ORDER BY n) "
+                       f"FROM jsonb_array_elements(COALESCE({sql} -> 'technologies', '[]'::jsonb)) "
+                       f"WITH ORDINALITY AS x(t, n)), '') || ']')")
+                parts.append((key, sql, column_params))
+                continue
+            else:
+                sql = f'to_json({sql})'
+            parts.append((key, f"COALESCE({sql}::text, 'null')", column_params))
+
+        pieces = []
+        for index, (key, sql, column_params) in enumerate(parts):
+            pieces.append('%s')
+            params.append(('{' if index == 0 else ',') + json.dumps(key) + ':')
+            pieces.append(sql)
+            params += column_params
+        params.append('}')
+        return f"({' || '.join(pieces)} || %s)", params
+
+
+def json_rows(queryset, serializer_class, request):
+    """
+    Return the queryset as a flat values list of serialized rows (JSON text).
+    """
+    origin = request.build_absolute_uri('/')[:-1]
+    expression = JSONRow(queryset.model, list(serializer_class.Meta.fields), origin)
+    return queryset.annotate(**{ROW_ALIAS: expression}).values_list(ROW_ALIAS, flat=True)
+
+
+def _encode(row):
+    # JSONRenderer escapes these two for JavaScript; the databases do not
+    if '\u2028' in row or '\u2029' in row:
+        row = row.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029')
+    return row.encode()
+
+
+def stream(rows, envelope=None):
+    """
+    Yield the response body for serialized rows.
+
+    Args:
+        rows (Iterable[str]): JSON text of each row
+        envelope (dict | None): Pagination fields to wrap the rows in as ``results``;
+            None renders a bare list
+
+    Yields:
+        bytes: Chunks of the JSON document
+    """
+    if envelope is None:
+        yield b'['
+        closing = b']'
+    else:
+        # Render the envelope like JSONRenderer, leaving the object open for "results"
+        yield JSONRenderer().render(envelope)[:-1] + b',"results":['
+        closing = b']}'
+    for index, row in enumerate(rows):
+        yield (b',' if index else b'') + _encode(row)
+    yield closing
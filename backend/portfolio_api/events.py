@@ -0,0 +1,355 @@
+"""
+Server-Sent Events push channel for content changes.
+
+``event_stream`` is a plain ASGI handler mounted at ``/api/events/`` in
+``backend/asgi.py``, ahead of Django, so an idle connection costs one
+suspended coroutine and no request/middleware objects. Every connection is
+fed by the process-wide ``Broadcaster``:
+
+* one polling task per process reads new ``ChangeLogEntry`` rows (one query
+  every ``SSE_POLL_INTERVAL`` seconds, however many clients are connected)
+  and turns them into ``change`` events, encoded once and shared by all
+  subscribers. Like ``/api/changes/``, it only reads entries that are
+  ``CHANGELOG_SETTLE_SECONDS`` old, so an entry committed late with a lower
+  id is not skipped. Changes committed in this process wake the poller
+  (``notify``), which reads them as soon as they have settled instead of
+  waiting for the interval;
+* subscribers all wait on one shared future that is resolved on publish,
+  then copy the new events from a ring buffer of the last
+  ``SSE_BUFFER_SIZE`` events. There are no per-client queues;
+* a comment line is sent every ``SSE_HEARTBEAT_SECONDS`` to keep proxies
+  from closing idle connections;
+* connections are capped per process (``SSE_MAX_CONNECTIONS``) and per
+  client address (``SSE_MAX_CONNECTIONS_PER_CLIENT``). Behind a reverse
+  proxy listed in ``SSE_TRUSTED_PROXIES`` the client address is the last
+  one the proxy added to ``X-Forwarded-For``;
+* the portfolio is resolved from the Host header like in
+  ``tenancy.PortfolioMiddleware``, and each connection only receives the
+  events of its portfolio.
+
+An event looks like::
+
+    id: 1234
+    event: change
+    data: {"resource": "project", "version": 1234}
+
+``version`` is the change log position of the latest change to the
+resource. Browsers send the last id back as ``Last-Event-ID`` when they
+reconnect and receive what they missed from the ring buffer, or from one
+change log read if the buffer no longer reaches back that far. If even that
+is too much, a ``reset`` event tells the client to refetch everything.
+Details of what changed are available from ``/api/changes/``.
+"""
+
+import asyncio
+import collections
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http.request import split_domain_port, validate_host
+from django.utils import timezone
+
+from backend.metrics import SSE_CONNECTIONS, SSE_EVENTS, SSE_REJECTED
+from .models import ChangeLogEntry
+from .tenancy import portfolio_for_host
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PATH = '/api/events/'
+READ_BATCH = 1000  # change log rows read per poll
+
+
+def _format(event, data, event_id=None):
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines += [f'event: {event}', f'data: {json.dumps(data, separators=(",", ":"))}', '', '']
+    return '\n'.join(lines).encode()
+
+
+def _read_changes(position, portfolio_id=None):
+    """
+    Read the settled change log rows after ``position``.
+
+    With ``position`` None only the current end of the settled log is returned.
+    Without ``portfolio_id`` the changes of every portfolio are read.
+
+    Returns:
+        tuple: New position, ``[(position, portfolio id, resource), ...]`` and
+        whether every row up to the end of the log was read
+    """
+    close_old_connections()
+    settled = timezone.now() - timedelta(seconds=settings.CHANGELOG_SETTLE_SECONDS)
+    entries = ChangeLogEntry._base_manager.filter(created_at__lte=settled).order_by('-id')
+    if position is None:
+        return entries.values_list('id', flat=True).first() or 0, [], True
+    entries = entries.filter(id__gt=position)
+    if portfolio_id is not None:
+        entries = entries.filter(portfolio_id=portfolio_id)
+    rows = list(entries.order_by('id').values_list('id', 'portfolio_id', 'model')[:READ_BATCH])
+    if not rows:
+        return position, [], True
+    # One event per resource of each portfolio, at its latest position
+    latest = {}
+    for entry_id, portfolio, model in rows:
+        latest[(portfolio, model)] = entry_id
+    changes = sorted((entry_id, portfolio, model) for (portfolio, model), entry_id in latest.items())
+    return rows[-1][0], changes, len(rows) < READ_BATCH
+
+
+def _portfolio_for_host(host):
+    close_old_connections()
+    return portfolio_for_host(host)
+
+
+class Broadcaster:
+    """Fan change events out to every subscriber of this process."""
+
+    def __init__(self):
+        self.events = collections.deque(maxlen=settings.SSE_BUFFER_SIZE)
+        self.position = None
+        # Events after this position are all in the ring buffer
+        self.floor = None
+        self.connections = 0
+        self.per_client = collections.Counter()
+        self._loop = None
+        self._published = None
+        self._wake = None
+        self._task = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._published = loop.create_future()
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._poll())
+
+    async def _poll(self):
+        while True:
+            try:
+                new_position, changes, _ = await sync_to_async(_read_changes, thread_sensitive=False)(self.position)
+            except Exception:
+                logger.exception('Could not read the change log')
+            else:
+                if self.position is None:
+                    self.floor = new_position
+                self.position = new_position
+                if changes:
+                    self.publish(changes)
+                    # More rows may be waiting; read again without sleeping
+                    continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.SSE_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                # A local commit: read its entries once they have settled
+                await asyncio.sleep(settings.CHANGELOG_SETTLE_SECONDS)
+            self._wake.clear()
+
+    def publish(self, changes):
+        """Append ``(position, portfolio id, resource)`` changes to the buffer and wake every subscriber."""
+        for position, portfolio_id, resource in changes:
+            payload = _format('change', {'resource': resource, 'version': position}, event_id=position)
+            if len(self.events) == self.events.maxlen:
+                self.floor = self.events[0][0]
+            self.events.append((position, portfolio_id, payload))
+        SSE_EVENTS.inc(len(changes))
+        published, self._published = self._published, self._loop.create_future()
+        published.set_result(None)
+
+    def notify(self):
+        """Wake the poller; safe to call from any thread."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake.set)
+
+    def acquire(self, client):
+        """
+        Reserve a connection slot.
+
+        Returns:
+            str | None: The limit that was hit, or None if the connection is allowed
+        """
+        with self._lock:
+            if self.connections >= settings.SSE_MAX_CONNECTIONS:
+                return 'total'
+            if self.per_client[client] >= settings.SSE_MAX_CONNECTIONS_PER_CLIENT:
+                return 'client'
+            self.connections += 1
+            self.per_client[client] += 1
+        SSE_CONNECTIONS.inc()
+        return None
+
+    def release(self, client):
+        with self._lock:
+            self.connections -= 1
+            self.per_client[client] -= 1
+            if self.per_client[client] <= 0:
+                del self.per_client[client]
+        SSE_CONNECTIONS.dec()
+
+    async def subscribe(self, portfolio_id, last_event_id=None):
+        """Yield encoded events (and heartbeats) of one portfolio for one connection."""
+        self._ensure_started()
+        while self.position is None:
+            # First connection of the process: wait for the poller's first read
+            await asyncio.sleep(0.05)
+
+        position = self.position
+        if last_event_id is not None and last_event_id < position:
+            if last_event_id >= self.floor:
+                # Everything missed is still in the ring buffer
+                position = last_event_id
+            else:
+                # Older than the buffer: catch up from the database once
+                caught_up, changes, complete = await sync_to_async(_read_changes, thread_sensitive=False)(
+                    last_event_id, portfolio_id,
+                )
+                if caught_up < self.floor and not complete:
+                    yield _format('reset', {'version': self.position})
+                else:
+                    for pos, _, resource in changes:
+                        if pos <= self.floor:
+                            yield _format('change', {'resource': resource, 'version': pos}, event_id=pos)
+                    position = self.floor
+
+        heartbeat = settings.SSE_HEARTBEAT_SECONDS
+        while True:
+            pending = [(pos, payload) for pos, portfolio, payload in self.events
+                       if pos > position and portfolio == portfolio_id]
+            published = self._published
+            for pos, payload in pending:
+                position = pos
+                yield payload
+            if published.done():
+                continue
+            try:
+                await asyncio.wait_for(asyncio.shield(published), heartbeat)
+            except asyncio.TimeoutError:
+                yield b': ping\n\n'
+
+
+_broadcaster = None
+_broadcaster_lock = threading.Lock()
+
+
+def broadcaster():
+    """Return the broadcaster of this process."""
+    global _broadcaster
+    if _broadcaster is None:
+        with _broadcaster_lock:
+            if _broadcaster is None:
+                _broadcaster = Broadcaster()
+    return _broadcaster
+
+
+def notify():
+    """Tell this process's broadcaster (if any client is connected) that the change log grew."""
+    if _broadcaster is not None:
+        _broadcaster.notify()
+
+
+def _client_address(scope, headers):
+    """Address the per-client connection limit applies to."""
+    address = (scope.get('client') or ('unknown', 0))[0]
+    forwarded = headers.get('x-forwarded-for')
+    if forwarded and address in settings.SSE_TRUSTED_PROXIES:
+        # The proxy appends the address it received the request from
+        return forwarded.split(',')[-1].strip() or address
+    return address
+
+
+def _headers(scope):
+    return {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+
+
+async def _respond(send, status, body, extra=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), *extra],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+
+async def event_stream(scope, receive, send):
+    """ASGI handler for ``GET /api/events/``."""
+    if scope['method'] not in ('GET', 'HEAD'):
+        await _respond(send, 405, {'error': 'Method not allowed'}, [(b'allow', b'GET')])
+        return
+
+    headers = _headers(scope)
+    cors = []
+    origin = headers.get('origin')
+    if origin and origin in settings.CORS_ALLOWED_ORIGINS:
+        cors = [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'Origin')]
+        if settings.CORS_ALLOW_CREDENTIALS:
+            cors.append((b'access-control-allow-credentials', b'true'))
+
+    # Same host validation as HttpRequest.get_host()
+    host = headers.get('host', '')
+    domain, _ = split_domain_port(host)
+    allowed_hosts = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed_hosts:
+        allowed_hosts = ['.localhost', '127.0.0.1', '[::1]']
+    if not domain or not validate_host(domain, allowed_hosts):
+        await _respond(send, 400, {'error': 'Invalid host'}, cors)
+        return
+    portfolio_id = await sync_to_async(_portfolio_for_host, thread_sensitive=False)(host)
+    if portfolio_id is None:
+        await _respond(send, 404, {'error': 'No portfolio is served on this host'}, cors)
+        return
+
+    client = _client_address(scope, headers)
+    hub = broadcaster()
+    limit = hub.acquire(client)
+    if limit is not None:
+        SSE_REJECTED.labels(limit).inc()
+        status = 503 if limit == 'total' else 429
+        await _respond(send, status, {'error': 'Too many event stream connections'},
+                       [(b'retry-after', b'30'), *cors])
+        return
+
+    try:
+        last_event_id = headers.get('last-event-id')
+        last_event_id = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/event-stream; charset=utf-8'),
+                (b'cache-control', b'no-cache'),
+                (b'x-accel-buffering', b'no'),
+                *cors,
+            ],
+        })
+        if scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        retry_ms = int(settings.SSE_HEARTBEAT_SECONDS * 1000)
+        await send({'type': 'http.response.body', 'body': f'retry: {retry_ms}\n\n'.encode(), 'more_body': True})
+
+        async def stream():
+            async for chunk in hub.subscribe(portfolio_id, last_event_id):
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+        async def disconnected():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+
+        tasks = [asyncio.ensure_future(stream()), asyncio.ensure_future(disconnected())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        hub.release(client)
@@ -0,0 +1,124 @@
+"""
+Transaction-aware cache invalidation for the Portfolio API application.
+
+Model signals fire once per saved row, so a bulk edit (for example an admin
+changelist save with ``list_editable``) would otherwise delete the same cache
+keys over and over. Invalidations requested inside a transaction are collected
+per connection, deduplicated, and flushed once when the transaction commits.
+Outside of a transaction they are flushed immediately.
+"""
+
+import logging
+import threading
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.dispatch import Signal
+
+# Sent once per flush with the deduplicated set of keys that were cleared.
+# Receivers that rebuild cached content should listen to this rather than
+# to the per-row model signals.
+content_invalidated = Signal()
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {
+    'requested': 0,
+    'flushed': 0,
+    'batches': 0,
+}
+
+
+class _Batch:
+    """Keys waiting for the current transaction on one connection to commit."""
+
+    def __init__(self, using):
+        self.using = using
+        self.keys = set()
+        self.done = False
+
+    def flush(self):
+        self.done = True
+        _flush(self.keys)
+
+
+def _pending():
+    if not hasattr(_local, 'batches'):
+        _local.batches = {}
+    return _local.batches
+
+
+def _is_registered(batch):
+    """
+    Check that the batch's on_commit callback is still queued.
+
+    A rollback (of the transaction or of the savepoint the callback was
+    registered in) discards the callback, in which case a new batch must be
+    started.
+    """
+    connection = connections[batch.using]
+    return any(func == batch.flush for _, func, _ in connection.run_on_commit)
+
+
+def _flush(keys):
+    if not keys:
+        return
+    cache.delete_many(list(keys))
+    with _stats_lock:
+        _stats['flushed'] += len(keys)
+        _stats['batches'] += 1
+    logger.debug('Invalidated %d cache key(s): %s', len(keys), ', '.join(sorted(keys)))
+    content_invalidated.send(sender=None, keys=frozenset(keys))
+
+
+def invalidate(*keys, using=None):
+    """
+    Invalidate one or more cache keys once the current transaction commits.
+
+    Args:
+        *keys: Cache keys to delete
+        using (str): Database alias whose transaction should be followed
+            (defaults to the default database)
+    """
+    if not keys:
+        return
+    using = using or DEFAULT_DB_ALIAS
+    with _stats_lock:
+        _stats['requested'] += len(keys)
+
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        _flush(set(keys))
+        return
+
+    batches = _pending()
+    batch = batches.get(using)
+    if batch is None or batch.done or not _is_registered(batch):
+        batch = _Batch(using)
+        batches[using] = batch
+        transaction.on_commit(batch.flush, using=using)
+    batch.keys.update(keys)
+
+
+def get_stats() -> dict:
+    """
+    Return invalidation counters for this process.
+
+    ``coalescing_ratio`` is the number of requested key deletions per key
+    actually deleted; 1.0 means no coalescing happened.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats['coalescing_ratio'] = (
+        round(stats['requested'] / stats['flushed'], 2) if stats['flushed'] else 1.0
+    )
+    return stats
+
+
+def reset_stats():
+    """Reset the invalidation counters (mainly useful in tests and benchmarks)."""
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
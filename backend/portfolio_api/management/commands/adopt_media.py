@@ -0,0 +1,65 @@
+"""
+Management command to move existing uploads into the content-addressed store.
+
+Usage:
+    python manage.py adopt_media [--dry-run]
+
+Every file field that still points outside cas/ is re-saved through the
+content-addressed storage, so duplicate files collapse into one blob, and
+the row is updated to the new name. The old files are left in place; run
+``python manage.py gc_media --include-legacy`` afterwards to delete them.
+"""
+from django.core.management.base import BaseCommand
+
+from portfolio_api import changelog, readmodel
+from portfolio_api.constants import MEDIA_BLOB_PREFIX
+from portfolio_api.invalidation import invalidate
+from portfolio_api.signals import MEDIA_MODELS, cache_keys_for
+from portfolio_api.storage import adjust_refs, file_fields, media_storage
+
+
+class Command(BaseCommand):
+    help = 'Move existing media files into the content-addressed blob store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be moved')
+
+    def handle(self, *args, **options):
+        storage = media_storage()
+        adopted = missing = 0
+        # Files shared by several rows are hashed and copied once
+        moved = {}
+        for model in MEDIA_MODELS:
+            before = adopted
+            updated_pks = set()
+            for field in file_fields(model):
+                rows = (model._base_manager.exclude(**{field: ''}).exclude(**{field: None})
+                        .exclude(**{f'{field}__startswith': f'{MEDIA_BLOB_PREFIX}/'})
+                        .values_list('pk', field))
+                for pk, name in rows.iterator():
+                    if not storage.exists(name):
+                        self.stdout.write(self.style.WARNING(f'{model.__name__} {pk}: {name} is missing, skipped'))
+                        missing += 1
+                        continue
+                    if options['dry_run']:
+                        self.stdout.write(f'{model.__name__} {pk}: {name}')
+                        adopted += 1
+                        continue
+                    if name not in moved:
+                        with storage.open(name, 'rb') as content:
+                            moved[name] = storage.save(name, content)
+                    new_name = moved[name]
+                    model._base_manager.filter(pk=pk).update(**{field: new_name})
+                    adjust_refs([new_name], 1)
+                    updated_pks.add(pk)
+                    if options['verbosity'] >= 2:
+                        self.stdout.write(f'{model.__name__} {pk}: {name} -> {new_name}')
+                    adopted += 1
+            if adopted > before and not options['dry_run']:
+                if model in readmodel.READ_MODELS:
+                    readmodel.sync(model, updated_pks)
+                invalidate(*cache_keys_for(model))
+                changelog.record(model, sorted(updated_pks), 'updated')
+
+        prefix = 'Would adopt' if options['dry_run'] else 'Adopted'
+        self.stdout.write(self.style.SUCCESS(f'{prefix} {adopted} file(s); {missing} missing'))
@@ -0,0 +1,169 @@
+"""
+Management command to compare the full stack with the API-only worker profile.
+
+Usage:
+    python manage.py bench_api_profile [--runs 5] [--requests 200] [--path /api/projects/] [--host localhost]
+
+Each profile (``backend.wsgi`` with ``backend.settings``, and
+``backend.wsgi_api`` with ``backend.settings_api``) is started ``--runs``
+times in a fresh interpreter, alternating between the two. Every run
+reports how long importing the WSGI application took, the time to its first
+response, the resident memory of the process after ``--requests`` requests,
+the number of loaded modules, and the median time of a request through the
+WSGI application next to the median time of the view alone; the difference
+is the per-request cost of the handler and the middleware. Medians over the
+runs are printed, and the command fails if the two profiles answer the
+request differently.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_api.constants import WORKER_PROFILES as PROFILES
+
+# Run in a fresh interpreter; the clock starts before anything is imported
+WORKER = """
+import time
+start = time.perf_counter()
+import importlib, json, os, sys
+os.environ['DJANGO_SETTINGS_MODULE'] = sys.argv[1]
+application = importlib.import_module(sys.argv[2]).application
+loaded = time.perf_counter()
+from portfolio_api.management.commands.bench_api_profile import measure
+print(json.dumps(measure(application, start, loaded, sys.argv[3], sys.argv[4], int(sys.argv[5]))))
+"""
+
+METRICS = [
+    ('startup_ms', 'import WSGI application', 'ms'),
+    ('first_response_ms', 'time to first response', 'ms'),
+    ('rss_mb', 'resident memory', 'MB'),
+    ('modules', 'loaded modules', ''),
+    ('request_ms', 'request (median)', 'ms'),
+    ('view_ms', 'view alone (median)', 'ms'),
+    ('overhead_ms', 'handler + middleware', 'ms'),
+]
+
+
+def _request(application, path, host):
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'HTTP_HOST': host}
+    setup_testing_defaults(environ)
+    status = []
+    body = b''.join(application(environ, lambda code, headers, exc_info=None: status.append(code)))
+    return status[0], body
+
+
+def _rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current size; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def measure(application, start, loaded, path, host, requests):
+    """
+    Measure one worker process; called by ``WORKER`` after loading the application.
+
+    Returns:
+        dict: The values listed in ``METRICS``, the response status and body
+    """
+    status, body = _request(application, path, host)
+    first = time.perf_counter()
+
+    timings = []
+    for _ in range(requests):
+        began = time.perf_counter()
+        _request(application, path, host)
+        timings.append(time.perf_counter() - began)
+
+    from django.test import RequestFactory
+    from django.urls import resolve
+    from portfolio_api.tenancy import activate, portfolio_for_host
+
+    portfolio_id = portfolio_for_host(host)
+    match = resolve(path)
+    factory = RequestFactory()
+    view_timings = []
+    for _ in range(requests):
+        request = factory.get(path, HTTP_HOST=host)
+        request.portfolio_id = portfolio_id
+        began = time.perf_counter()
+        with activate(portfolio_id):
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            b''.join(response)
+        view_timings.append(time.perf_counter() - began)
+
+    request_ms = statistics.median(timings) * 1000
+    view_ms = statistics.median(view_timings) * 1000
+    return {
+        'startup_ms': (loaded - start) * 1000,
+        'first_response_ms': (first - start) * 1000,
+        'rss_mb': _rss_mb(),
+        'modules': len(sys.modules),
+        'request_ms': request_ms,
+        'view_ms': view_ms,
+        'overhead_ms': request_ms - view_ms,
+        'status': status,
+        'body': body.decode('utf-8', 'replace'),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compare startup time, memory and per-request overhead of the full and API-only worker profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5, help='Fresh processes started per profile')
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per process')
+        parser.add_argument('--path', default='/api/projects/', help='Public endpoint to request')
+        parser.add_argument('--host', default='localhost', help='Host header (must be in ALLOWED_HOSTS)')
+
+    def handle(self, *args, **options):
+        results = {name: [] for name in PROFILES}
+        for run in range(max(1, options['runs'])):
+            for name, (settings_module, wsgi_module) in PROFILES.items():
+                results[name].append(self._run(settings_module, wsgi_module, options))
+            self.stdout.write(f'Run {run + 1}/{options["runs"]} done')
+
+        self.stdout.write('')
+        self.stdout.write(f'{"median of " + str(len(results["full"])) + " runs":<26}{"full":>12}{"api":>12}{"change":>10}')
+        for key, label, unit in METRICS:
+            full, api = (statistics.median(run[key] for run in results[name]) for name in PROFILES)
+            change = f'{(api - full) / full * 100:+.0f}%' if full else ''
+            self.stdout.write(f'{label:<26}{full:>9.1f} {unit:<2}{api:>9.1f} {unit:<2}{change:>10}')
+
+        full, api = results['full'][0], results['api'][0]
+        if (full['status'], full['body']) != (api['status'], api['body']):
+            raise CommandError(f'The profiles answer {options["path"]} differently '
+                               f'({full["status"]} vs {api["status"]})')
+        self.stdout.write(self.style.SUCCESS(f'Both profiles answer {options["path"]} with the same '
+                                             f'{full["status"]} response'))
+
+    def _run(self, settings_module, wsgi_module, options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+        process = subprocess.run(
+            [sys.executable, '-c', WORKER, settings_module, wsgi_module,
+             options['path'], options['host'], str(options['requests'])],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if process.returncode != 0:
+            raise CommandError(f'{wsgi_module} failed:\n{process.stderr[-2000:]}')
+        # Log output may precede the result on stdout
+        return json.loads(process.stdout.strip().splitlines()[-1])
@@ -0,0 +1,204 @@
+"""
+Management command to benchmark SQLite under concurrent reads and writes.
+
+Usage:
+    python manage.py bench_sqlite [--readers 8] [--writers 2] [--duration 5]
+
+The current database is copied twice into a temporary directory. One copy
+runs with SQLite defaults (rollback journal, deferred transactions) and the
+other with the performance profile from backend/db/sqlite.py. Reader threads
+load projects with their technologies while writer threads insert contact
+messages (into the default portfolio, created in the copy if missing), and
+throughput and latency are reported for both. "database is locked" errors
+are counted; any other error in a thread fails the command.
+"""
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from backend.db.sqlite import DEFAULT_PRAGMAS, apply_pragmas, is_locked_error
+
+READ_QUERIES = [
+    'SELECT p.id, p.title, s.id, s.name FROM portfolio_api_project p '
+    'LEFT JOIN portfolio_api_project_technologies pt ON pt.project_id = p.id '
+    'LEFT JOIN portfolio_api_skill s ON s.id = pt.skill_id '
+    'ORDER BY p.featured DESC, p."order", p.created_at DESC',
+    'SELECT COUNT(*) FROM portfolio_api_contact WHERE "read" = 0',
+]
+WRITE_QUERY = (
+    'INSERT INTO portfolio_api_contact (portfolio_id, name, email, subject, message, created_at, "read") '
+    'VALUES (?, ?, ?, ?, ?, ?, 0)'
+)
+
+PROFILES = {
+    'default': {'pragmas': {'journal_mode': 'DELETE'}, 'begin': 'BEGIN', 'timeout': 20},
+    'performance': {'pragmas': DEFAULT_PRAGMAS, 'begin': 'BEGIN IMMEDIATE', 'timeout': 5},
+}
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent reads and contact writes with and without the SQLite performance profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8, help='Number of reader threads')
+        parser.add_argument('--writers', type=int, default=2, help='Number of writer threads')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds to run each profile')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('bench_sqlite only runs against a SQLite database.')
+
+        workdir = tempfile.mkdtemp(prefix='bench_sqlite_')
+        try:
+            results = {}
+            for name, profile in PROFILES.items():
+                path = os.path.join(workdir, f'{name}.sqlite3')
+                self._copy_database(path)
+                self.stdout.write(f'Running {name} profile for {options["duration"]}s...')
+                results[name] = self._run(path, profile, options)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        self.stdout.write('')
+        header = f'{"profile":<12}{"reads/s":>10}{"read p50":>10}{"read p99":>10}' \
+                 f'{"writes/s":>10}{"write p50":>11}{"write p99":>11}{"errors":>8}'
+        self.stdout.write(header)
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<12}{result["reads_per_s"]:>10.1f}{result["read_p50"]:>10.2f}{result["read_p99"]:>10.2f}'
+                f'{result["writes_per_s"]:>10.1f}{result["write_p50"]:>11.2f}{result["write_p99"]:>11.2f}'
+                f'{result["errors"]:>8}'
+            )
+        self.stdout.write('(latencies in milliseconds)')
+
+    def _copy_database(self, path):
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        try:
+            connection.connection.backup(target)
+        finally:
+            target.close()
+
+    def _connect(self, path, profile):
+        conn = sqlite3.connect(path, timeout=profile['timeout'], isolation_level=None, check_same_thread=False)
+        apply_pragmas(conn, profile['pragmas'])
+        return conn
+
+    def _portfolio_id(self, conn):
+        """Return the id of the portfolio the contact messages go to, creating one if needed."""
+        row = conn.execute(
+            "SELECT id FROM portfolio_api_portfolio ORDER BY host = '' DESC, id LIMIT 1"
+        ).fetchone()
+        if row:
+            return row[0]
+        cursor = conn.execute(
+            "INSERT INTO portfolio_api_portfolio (name, host, is_active, created_at) VALUES (?, '', 1, ?)",
+            ('Benchmark', timezone.now().isoformat()),
+        )
+        return cursor.lastrowid
+
+    def _run(self, path, profile, options):
+        # Set the journal mode once before the threads start
+        conn = self._connect(path, profile)
+        try:
+            portfolio_id = self._portfolio_id(conn)
+        finally:
+            conn.close()
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        read_latencies, write_latencies = [], []
+        errors = [0]
+        failures = []
+
+        def guarded(target):
+            def run():
+                try:
+                    target()
+                except Exception as exc:
+                    with lock:
+                        failures.append(exc)
+                    stop.set()
+            return run
+
+        def reader():
+            conn = self._connect(path, profile)
+            local = []
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    conn.execute('BEGIN')
+                    for query in READ_QUERIES:
+                        conn.execute(query).fetchall()
+                    conn.execute('COMMIT')
+                except sqlite3.OperationalError:
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+                    with lock:
+                        errors[0] += 1
+                    continue
+                local.append((time.perf_counter() - start) * 1000)
+            conn.close()
+            with lock:
+                read_latencies.extend(local)
+
+        def writer():
+            conn = self._connect(path, profile)
+            local = []
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    conn.execute(profile['begin'])
+                    conn.execute(WRITE_QUERY, (portfolio_id, 'Bench', 'bench@example.com', 'Benchmark',
+                                               'Benchmark message', timezone.now().isoformat()))
+                    conn.execute('COMMIT')
+                except sqlite3.OperationalError as exc:
+                    if conn.in_transaction:
+                        conn.execute('ROLLBACK')
+                    if not is_locked_error(exc):
+                        raise
+                    with lock:
+                        errors[0] += 1
+                    continue
+                local.append((time.perf_counter() - start) * 1000)
+            conn.close()
+            with lock:
+                write_latencies.extend(local)
+
+        threads = [threading.Thread(target=guarded(reader)) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=guarded(writer)) for _ in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        stop.wait(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if failures:
+            raise CommandError(f'{len(failures)} benchmark thread(s) failed: {failures[0]!r}')
+
+        duration = options['duration']
+        return {
+            'reads_per_s': len(read_latencies) / duration,
+            'read_p50': statistics.median(read_latencies) if read_latencies else 0.0,
+            'read_p99': _percentile(read_latencies, 99),
+            'writes_per_s': len(write_latencies) / duration,
+            'write_p50': statistics.median(write_latencies) if write_latencies else 0.0,
+            'write_p99': _percentile(write_latencies, 99),
+            'errors': errors[0],
+        }
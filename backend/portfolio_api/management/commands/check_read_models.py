@@ -0,0 +1,44 @@
+"""
+Management command to check the denormalized read model for drift.
+
+Usage:
+    python manage.py check_read_models [--repair]
+
+Compares the ``rendered`` column of every project and experience entry with
+what its technologies and image currently render to, and lists the rows that
+differ. Exits with an error if any do, so it can run from cron or CI; with
+``--repair`` the drifted rows are rewritten instead.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portfolio_api import changelog, readmodel
+from portfolio_api.invalidation import invalidate
+from portfolio_api.signals import cache_keys_for
+
+
+class Command(BaseCommand):
+    help = 'Report (and optionally repair) projects and experience entries whose read model drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true', help='Rewrite the rows that drifted')
+
+    def handle(self, *args, **options):
+        repair = options['repair']
+        drifted = 0
+        with transaction.atomic():
+            for model in readmodel.READ_MODELS:
+                stale = readmodel.sync(model, repair=repair)
+                drifted += len(stale)
+                for pk in stale:
+                    self.stdout.write(self.style.WARNING(f'{model.__name__} {pk}: rendered column is out of date'))
+                if stale and repair:
+                    invalidate(*cache_keys_for(model))
+                    changelog.record(model, stale, 'updated')
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('Read models are consistent'))
+        elif repair:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {drifted} row(s)'))
+        else:
+            raise CommandError(f'{drifted} row(s) drifted; run with --repair to fix them')
@@ -0,0 +1,44 @@
+"""
+Management command to compact the change log behind /api/changes/.
+
+Usage:
+    python manage.py compact_changelog [--older-than-days 7] [--dry-run]
+
+Deletes entries older than the cutoff that are superseded by a newer entry
+for the same object. Any client token stays valid: whoever still needed an
+old entry receives the newer one instead, and the feed already reports only
+the latest state of each object. The newest entry of every object is kept,
+including deletions, so clients syncing from an old token still learn about
+them.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from portfolio_api.constants import CHANGELOG_COMPACT_AFTER_DAYS
+from portfolio_api.models import ChangeLogEntry
+
+
+class Command(BaseCommand):
+    help = 'Delete change log entries superseded by newer changes to the same object'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=float, default=CHANGELOG_COMPACT_AFTER_DAYS,
+                            help='Only compact entries older than this')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        newer = ChangeLogEntry.objects.filter(
+            model=OuterRef('model'), object_id=OuterRef('object_id'), id__gt=OuterRef('id'),
+        )
+        superseded = ChangeLogEntry.objects.filter(created_at__lt=cutoff).filter(Exists(newer))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Would delete {superseded.count()} superseded entries'))
+            return
+        deleted, _ = superseded.delete()
+        remaining = ChangeLogEntry.objects.count()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} superseded entries; {remaining} remain'))
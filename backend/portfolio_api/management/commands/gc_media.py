@@ -0,0 +1,208 @@
+"""
+Management command to delete media files that nothing references.
+
+Usage:
+    python manage.py gc_media [--dry-run] [--recount] [--include-legacy] [--grace-hours 24]
+
+Removes:
+    * blobs whose MediaBlob.ref_count has dropped to zero;
+    * files under cas/ without a MediaBlob row (e.g. left by a rolled-back upload);
+    * stale temporary files in .incoming/;
+    * with --include-legacy, files outside cas/ and thumbnails/ that no model
+      field references (e.g. the suffixed copies Django used to create).
+
+Files modified within the grace period are kept, so uploads whose row is
+still being saved are never touched, and no file is deleted while a model
+field still names it, whatever its reference count says. Blob rows are
+re-checked and deleted under a row lock (the write lock on SQLite) and only
+the files of the rows actually deleted are unlinked. The media tree is
+walked lazily and checked against the database in batches, so memory use
+does not grow with the size of the tree.
+"""
+import collections
+import os
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from backend.db.sqlite import immediate_atomic
+from portfolio_api.constants import MEDIA_BLOB_PREFIX, MEDIA_GC_GRACE_HOURS, MEDIA_INCOMING_DIR
+from portfolio_api.models import MediaBlob
+from portfolio_api.signals import MEDIA_MODELS
+from portfolio_api.storage import file_fields, media_storage
+
+BATCH_SIZE = 500
+SKIPPED_DIRS = {MEDIA_INCOMING_DIR, 'thumbnails'}
+
+
+def _walk(root, relative=''):
+    """Yield ``(relative path, mtime)`` for every file below ``root`` without listing it all at once."""
+    pending = [relative]
+    while pending:
+        current = pending.pop()
+        with os.scandir(os.path.join(root, current)) as entries:
+            for entry in entries:
+                name = f'{current}/{entry.name}' if current else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(name)
+                elif entry.is_file(follow_symlinks=False):
+                    yield name, entry.stat(follow_symlinks=False).st_mtime
+
+
+def _count_references(names):
+    """Return a Counter of how many model file fields name each of the given files."""
+    counts = collections.Counter()
+    for model in MEDIA_MODELS:
+        for field in file_fields(model):
+            counts.update(model._base_manager.filter(**{f'{field}__in': names}).values_list(field, flat=True))
+    return counts
+
+
+def _batches(iterable, size=BATCH_SIZE):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Command(BaseCommand):
+    help = 'Delete unreferenced media blobs and orphaned files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+        parser.add_argument('--recount', action='store_true',
+                            help='Recompute reference counts from the model fields first')
+        parser.add_argument('--include-legacy', action='store_true',
+                            help='Also delete unreferenced files outside the blob store')
+        parser.add_argument('--grace-hours', type=float, default=MEDIA_GC_GRACE_HOURS,
+                            help='Keep anything modified more recently than this')
+
+    def handle(self, *args, **options):
+        self.storage = media_storage()
+        self.dry_run = options['dry_run']
+        self.verbosity = options['verbosity']
+        self.cutoff = time.time() - options['grace_hours'] * 3600
+        self.removed = collections.Counter()
+        self.freed = 0
+
+        if options['recount']:
+            self.recount()
+        self.collect_unreferenced_blobs(options['grace_hours'])
+        self.collect_untracked_blobs()
+        self.collect_incoming()
+        if options['include_legacy']:
+            self.collect_legacy()
+
+        prefix = 'Would remove' if self.dry_run else 'Removed'
+        for kind, count in self.removed.items():
+            self.stdout.write(f'{prefix} {count} {kind}')
+        self.stdout.write(self.style.SUCCESS(f'{prefix} {self.freed / 1024:.1f} KB in total'))
+
+    def recount(self):
+        corrected = 0
+        pks = MediaBlob.objects.order_by('pk').values_list('pk', flat=True)
+        for batch in _batches(pks.iterator(chunk_size=BATCH_SIZE)):
+            # Count under the row locks, so adjust_refs() calls waiting on
+            # them apply their change on top of the corrected value
+            with immediate_atomic():
+                blobs = list(MediaBlob.objects.select_for_update().filter(pk__in=batch)
+                             .only('pk', 'name', 'ref_count'))
+                counts = _count_references([blob.name for blob in blobs])
+                changed = []
+                for blob in blobs:
+                    if blob.ref_count != counts[blob.name]:
+                        blob.ref_count = counts[blob.name]
+                        changed.append(blob)
+                if changed and not self.dry_run:
+                    MediaBlob.objects.bulk_update(changed, ['ref_count'])
+            corrected += len(changed)
+        self.stdout.write(f'Corrected {corrected} reference count(s)')
+
+    def collect_unreferenced_blobs(self, grace_hours):
+        created_before = timezone.now() - timedelta(hours=grace_hours)
+        candidates = MediaBlob.objects.filter(ref_count__lte=0, created_at__lt=created_before)
+        for batch in _batches(candidates.values_list('pk', flat=True).iterator(chunk_size=BATCH_SIZE)):
+            with immediate_atomic():
+                # Re-check under the row locks so a blob referenced meanwhile is kept
+                blobs = list(MediaBlob.objects.select_for_update().filter(pk__in=batch, ref_count__lte=0)
+                             .values_list('pk', 'name'))
+                referenced = _count_references([name for _, name in blobs])
+                doomed = [(pk, name) for pk, name in blobs if not referenced[name] and not self._recent(name)]
+                if doomed and not self.dry_run:
+                    MediaBlob.objects.filter(pk__in=[pk for pk, _ in doomed]).delete()
+            for _, name in doomed:
+                self._remove(name, 'unreferenced blob(s)')
+
+    def collect_untracked_blobs(self):
+        root = self.storage.path('')
+        if not os.path.isdir(os.path.join(root, MEDIA_BLOB_PREFIX)):
+            return
+        for batch in _batches(_walk(root, MEDIA_BLOB_PREFIX)):
+            names = [name for name, _ in batch]
+            known = set(MediaBlob.objects.filter(name__in=names).values_list('name', flat=True))
+            # A row deleted while its blob was being re-uploaded leaves a referenced file behind
+            referenced = _count_references(names)
+            for name, mtime in batch:
+                if name not in known and not referenced[name] and mtime < self.cutoff:
+                    self._remove(name, 'untracked blob file(s)')
+
+    def collect_incoming(self):
+        root = self.storage.path('')
+        if not os.path.isdir(os.path.join(root, MEDIA_INCOMING_DIR)):
+            return
+        for name, mtime in _walk(root, MEDIA_INCOMING_DIR):
+            if mtime < self.cutoff:
+                self._remove(name, 'stale temporary file(s)')
+
+    def collect_legacy(self):
+        protected = set()
+        for model in MEDIA_MODELS:
+            for field in file_fields(model):
+                default = model._meta.get_field(field).default
+                if isinstance(default, str):
+                    protected.add(default)
+
+        root = self.storage.path('')
+        top_level = []
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.name in SKIPPED_DIRS or entry.name == MEDIA_BLOB_PREFIX:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    top_level.append(entry.name)
+
+        for directory in top_level:
+            for batch in _batches(_walk(root, directory)):
+                referenced = _count_references([name for name, _ in batch])
+                for name, mtime in batch:
+                    if name not in protected and not referenced[name] and mtime < self.cutoff:
+                        self._remove(name, 'unreferenced legacy file(s)')
+
+    def _recent(self, name):
+        """Return True if a file was modified within the grace period (e.g. re-uploaded)."""
+        try:
+            return os.stat(self.storage.path(name)).st_mtime >= self.cutoff
+        except FileNotFoundError:
+            return False
+
+    def _remove(self, name, kind):
+        path = self.storage.path(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        # A re-upload of the same content touches the blob; keep it
+        if stat.st_mtime >= self.cutoff:
+            return
+        if self.verbosity >= 2:
+            self.stdout.write(f'  {name}')
+        if not self.dry_run:
+            os.unlink(path)
+        self.removed[kind] += 1
+        self.freed += stat.st_size
@@ -0,0 +1,36 @@
+"""
+Management command to generate resume previews and metadata.
+
+Usage:
+    python manage.py process_resumes [--force]
+
+Normally the background worker does this after each upload. This command
+processes every PersonalInfo whose resume has not been processed yet (e.g.
+because the server restarted before the worker got to it), or all of them
+with --force.
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from portfolio_api import resume
+from portfolio_api.models import PersonalInfo
+
+
+class Command(BaseCommand):
+    help = 'Generate resume previews, page counts and text for pending uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Reprocess resumes that are already done')
+
+    def handle(self, *args, **options):
+        queryset = PersonalInfo.objects.all()
+        if options['force']:
+            queryset.update(resume_processed_for='')
+        else:
+            queryset = queryset.exclude(resume_processed_for=F('resume'))
+
+        processed = 0
+        for pk in queryset.values_list('pk', flat=True):
+            resume.process(pk)
+            processed += 1
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} resume(s)'))
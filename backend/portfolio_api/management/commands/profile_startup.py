@@ -0,0 +1,173 @@
+"""
+Management command to profile cold start: import-time tree and time to first response.
+
+Usage:
+    python manage.py profile_startup [--profile full|api] [--runs 5] [--path /api/projects/]
+                                     [--host localhost] [--depth 3] [--min-ms 2]
+                                     [--check] [--budget 750]
+
+Starts a worker profile (see ``WORKER_PROFILES``) ``--runs`` times in a
+fresh interpreter running with ``python -X importtime``, and splits the
+start into three phases: importing the settings, loading the WSGI
+application (``django.setup()``, app registry, middleware) and serving the
+first request (URLconf, views, serializers, first queries). It prints the
+median duration of each phase and, for the median run, the tree of modules
+imported in each phase with their cumulative import time.
+
+With ``--check`` the command fails if the median time to first response is
+over ``--budget`` milliseconds (``COLD_START_BUDGET_MS`` by default), so it
+can guard against cold-start regressions in CI or in the build script.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_api.constants import WORKER_PROFILES
+
+# Run in a fresh interpreter under -X importtime. Phase markers go to stderr
+# between imports, in order with the import lines.
+WORKER = """
+from wsgiref.util import setup_testing_defaults
+import time
+start = time.perf_counter()
+import importlib, os, sys
+
+def phase(name):
+    sys.stderr.write(f'phase: {(time.perf_counter() - start) * 1000:.3f} {name}\\n')
+    sys.stderr.flush()
+
+phase('start')  # imports before this point belong to the harness
+os.environ['DJANGO_SETTINGS_MODULE'] = sys.argv[1]
+importlib.import_module(sys.argv[1])
+phase('settings')
+application = importlib.import_module(sys.argv[2]).application
+phase('application')
+environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[3], 'HTTP_HOST': sys.argv[4]}
+setup_testing_defaults(environ)
+status = []
+b''.join(application(environ, lambda code, headers, exc_info=None: status.append(code)))
+phase('first response')
+sys.stderr.write(f'status: {status[0]}\\n')
+"""
+
+PHASES = ['settings', 'application', 'first response']
+
+
+class ImportNode:
+    """One module in the ``-X importtime`` tree."""
+
+    def __init__(self, name, self_ms, total_ms):
+        self.name = name
+        self.self_ms = self_ms
+        self.total_ms = total_ms
+        self.children = []
+
+
+def parse(stderr):
+    """
+    Parse the stderr of a worker run.
+
+    Returns:
+        tuple: ``{phase: end time in ms}``, ``{phase: [root ImportNode, ...]}``
+        and the response status line
+    """
+    ends, roots, status = {}, {}, None
+    # Children are printed before their parent: collect them per depth
+    pending = {}
+    for line in stderr.splitlines():
+        if line.startswith('phase: '):
+            end, name = line[len('phase: '):].split(' ', 1)
+            ends[name] = float(end)
+            roots[name] = pending.pop(0, [])
+            pending = {}
+        elif line.startswith('status: '):
+            status = line[len('status: '):]
+        elif line.startswith('import time:'):
+            parts = line[len('import time:'):].split('|')
+            if len(parts) != 3 or not parts[0].strip().isdigit():
+                continue  # the header line
+            label = parts[2][1:]
+            name = label.lstrip()
+            depth = (len(label) - len(name)) // 2
+            node = ImportNode(name, int(parts[0]) / 1000, int(parts[1]) / 1000)
+            node.children = pending.pop(depth + 1, [])
+            pending.setdefault(depth, []).append(node)
+    return ends, roots, status
+
+
+def _durations(ends):
+    previous, durations = 0.0, {}
+    for name in PHASES:
+        durations[name] = ends[name] - previous
+        previous = ends[name]
+    return durations
+
+
+class Command(BaseCommand):
+    help = 'Show the import-time tree and time to first response of a fresh worker, optionally against a budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', choices=sorted(WORKER_PROFILES), default='full',
+                            help='Worker profile to start')
+        parser.add_argument('--runs', type=int, default=5, help='Fresh processes to start')
+        parser.add_argument('--path', default='/api/projects/', help='Endpoint of the first request')
+        parser.add_argument('--host', default='localhost', help='Host header (must be in ALLOWED_HOSTS)')
+        parser.add_argument('--depth', type=int, default=3, help='Levels of the import tree to show')
+        parser.add_argument('--min-ms', type=float, default=2.0, help='Hide imports faster than this')
+        parser.add_argument('--check', action='store_true', help='Fail if the time to first response is over budget')
+        parser.add_argument('--budget', type=float, default=None,
+                            help='Cold-start budget in ms (default: COLD_START_BUDGET_MS)')
+
+    def handle(self, *args, **options):
+        settings_module, wsgi_module = WORKER_PROFILES[options['profile']]
+        runs = [self._run(settings_module, wsgi_module, options) for _ in range(max(1, options['runs']))]
+        runs.sort(key=lambda run: run[0]['first response'])
+        ends, roots, status = runs[len(runs) // 2]
+
+        for name in PHASES:
+            phase_roots = sorted(roots[name], key=lambda node: -node.total_ms)
+            imported = sum(node.total_ms for node in phase_roots)
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{name}: {_durations(ends)[name]:.1f} ms, of which imports {imported:.1f} ms'
+            ))
+            for node in phase_roots:
+                self._write_node(node, 1, options)
+
+        self.stdout.write('')
+        self.stdout.write(f'{options["profile"]} profile, {options["path"]} -> {status}; median of {len(runs)} runs:')
+        medians = {name: statistics.median(_durations(run[0])[name] for run in runs) for name in PHASES}
+        for name in PHASES:
+            self.stdout.write(f'  {name:<16}{medians[name]:>9.1f} ms')
+        first_response = statistics.median(run[0]['first response'] for run in runs)
+        self.stdout.write(f'  {"total":<16}{first_response:>9.1f} ms')
+
+        if options['check']:
+            budget = options['budget'] if options['budget'] is not None else settings.COLD_START_BUDGET_MS
+            if first_response > budget:
+                raise CommandError(f'Cold start took {first_response:.1f} ms, over the {budget:.0f} ms budget')
+            self.stdout.write(self.style.SUCCESS(f'Cold start is within the {budget:.0f} ms budget'))
+
+    def _write_node(self, node, depth, options):
+        if depth > options['depth'] or node.total_ms < options['min_ms']:
+            return
+        self.stdout.write(f'{node.total_ms:>9.1f} ms {"  " * depth}{node.name}')
+        for child in sorted(node.children, key=lambda child: -child.total_ms):
+            self._write_node(child, depth + 1, options)
+
+    def _run(self, settings_module, wsgi_module, options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module}
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', WORKER, settings_module, wsgi_module,
+             options['path'], options['host']],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if process.returncode != 0:
+            raise CommandError(f'{wsgi_module} failed:\n{process.stderr[-2000:]}')
+        ends, roots, status = parse(process.stderr)
+        if any(name not in ends for name in PHASES):
+            raise CommandError(f'{wsgi_module} did not finish starting:\n{process.stderr[-2000:]}')
+        return ends, roots, status
@@ -0,0 +1,51 @@
+"""
+Management command to rebuild the shared payload store.
+
+Usage:
+    python manage.py rebuild_payload_store [--origin https://example.com ...] [--clear]
+
+Snapshots are rebuilt by signals when content changes and built on first
+request otherwise. Run this after bulk changes that bypass the signals, or
+with ``--origin`` to build the snapshots of a host before it gets traffic.
+``--clear`` removes every snapshot instead.
+"""
+import glob
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio_api import payloads
+from portfolio_api.models import Portfolio
+from portfolio_api.tenancy import portfolio_for_host
+
+
+class Command(BaseCommand):
+    help = 'Re-render the memory-mapped snapshots of the public API responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--origin', action='append', default=[],
+                            help='Also build the snapshot for this scheme and host (repeatable)')
+        parser.add_argument('--clear', action='store_true', help='Remove all snapshots instead')
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            paths = glob.glob(os.path.join(settings.PAYLOAD_STORE_DIR, '*.snapshot'))
+            for path in paths:
+                os.remove(path)
+            self.stdout.write(self.style.SUCCESS(f'Removed {len(paths)} snapshot(s)'))
+            return
+
+        for origin in options['origin']:
+            scheme, _, host = origin.rstrip('/').partition('://')
+            if scheme not in ('http', 'https') or not host:
+                raise CommandError(f'{origin!r} is not an origin like https://example.com')
+            portfolio_id = portfolio_for_host(host)
+            if portfolio_id is None:
+                raise CommandError(f'No portfolio is served on {host}')
+            version = payloads.build(portfolio_id, f'{scheme}://{host}', 'command')
+            self.stdout.write(f'{scheme}://{host}: portfolio {portfolio_id}, version {version}')
+
+        for portfolio in Portfolio.objects.order_by('pk'):
+            rebuilt = payloads.rebuild(portfolio.pk, reason='command')
+            self.stdout.write(self.style.SUCCESS(f'{portfolio}: rebuilt {rebuilt} snapshot(s)'))
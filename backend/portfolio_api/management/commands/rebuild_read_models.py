@@ -0,0 +1,30 @@
+"""
+Management command to rebuild the denormalized read model of projects and experience.
+
+Usage:
+    python manage.py rebuild_read_models
+
+The ``rendered`` columns are normally kept current by signals; run this after
+bulk changes that bypass them (raw SQL, queryset.update, bulk_create).
+"""
+from django.core.management.base import BaseCommand
+
+from backend.db.sqlite import immediate_atomic
+from portfolio_api import changelog, readmodel
+from portfolio_api.invalidation import invalidate
+from portfolio_api.signals import cache_keys_for
+
+
+class Command(BaseCommand):
+    help = 'Re-render the technologies and media URLs stored on projects and experience entries'
+
+    def handle(self, *args, **options):
+        with immediate_atomic():
+            for model in readmodel.READ_MODELS:
+                stale = readmodel.sync(model)
+                if stale:
+                    invalidate(*cache_keys_for(model))
+                    changelog.record(model, stale, 'updated')
+                self.stdout.write(self.style.SUCCESS(
+                    f'{model._meta.verbose_name_plural}: rewrote {len(stale)} of {model._base_manager.count()} row(s)'
+                ))
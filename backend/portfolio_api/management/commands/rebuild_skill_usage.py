@@ -0,0 +1,26 @@
+"""
+Management command to rebuild the materialized technology usage statistics.
+
+Usage:
+    python manage.py rebuild_skill_usage
+
+Usage rows are normally kept current by signals; run this after bulk
+changes that bypass them (raw SQL, queryset.update, fixtures).
+"""
+from django.core.management.base import BaseCommand
+
+from backend.db.sqlite import immediate_atomic
+from portfolio_api.invalidation import invalidate
+from portfolio_api.models import Skill
+from portfolio_api.signals import cache_keys_for
+from portfolio_api.usage import refresh_skill_usage
+
+
+class Command(BaseCommand):
+    help = 'Recompute SkillUsage for every skill'
+
+    def handle(self, *args, **options):
+        with immediate_atomic():
+            written = refresh_skill_usage()
+            invalidate(*cache_keys_for(Skill))
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt usage statistics for {written} skill(s)'))
@@ -2,16 +2,19 @@
 Management command to set up initial portfolio data.
 
 Usage:
-    python manage.py setup_portfolio
+    python manage.py setup_portfolio [--host alice.example.com] [--name Alice]
 
 This command creates sample data for the portfolio application
 including personal info, skills, projects, experience, and education.
+With --host the data goes into the portfolio served on that host (created
+if needed) instead of the default portfolio.
 """
 import os
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
-from portfolio_api.models import PersonalInfo, Skill, Project, Experience, Education, SocialLink
+from portfolio_api.models import Portfolio, PersonalInfo, Skill, Project, Experience, Education, SocialLink
 from portfolio_api.constants import SKILL_CATEGORIES
+from portfolio_api.tenancy import activate
 
 
 class Command(BaseCommand):
@@ -23,8 +26,20 @@ class Command(BaseCommand):
             action='store_true',
             help='Force creation even if data already exists',
         )
+        parser.add_argument('--host', default='', help='Host of the portfolio to fill (default: the default portfolio)')
+        parser.add_argument('--name', help='Name of the portfolio if it has to be created')
 
     def handle(self, *args, **options):
+        host = options['host'].strip().lower()
+        portfolio, created = Portfolio.objects.get_or_create(
+            host=host, defaults={'name': options['name'] or host or 'Default'},
+        )
+        if created:
+            self.stdout.write(self.style.SUCCESS(f'Created portfolio "{portfolio}".'))
+        with activate(portfolio.pk):
+            self._setup(**options)
+
+    def _setup(self, **options):
         force = options['force']
         
         self.stdout.write(
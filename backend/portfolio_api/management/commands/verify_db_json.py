@@ -0,0 +1,150 @@
+"""
+Management command to verify and benchmark database-side JSON rendering.
+
+Usage:
+    python manage.py verify_db_json [--rows 1000] [--repeat 5]
+
+Renders the full project and experience lists through the serializers and
+through the database (``portfolio_api/dbjson.py``), fails if the bytes
+differ anywhere, and reports the median time of each path. With ``--rows``
+that many synthetic projects and experience entries (with awkward text:
+quotes, control characters, non-ASCII, U+2028) are added inside a
+transaction that is rolled back afterwards.
+"""
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from portfolio_api import dbjson, readmodel
+from portfolio_api.models import Experience, Project, Skill
+from portfolio_api.serializers import ExperienceSerializer, ProjectSerializer
+from portfolio_api.tenancy import portfolio_id_for_writes
+
+LISTS = [
+    (Project, ProjectSerializer),
+    (Experience, ExperienceSerializer),
+]
+
+AWKWARD_TEXT = 'Quotes " and \\ slashes / tabs\t newlines\n, café, 日本語, emoji 🚀, separator   and \x01'
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Check that database-rendered list JSON matches the serializers byte for byte, and time both'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=0,
+                            help='Synthetic projects and experience entries to add (rolled back afterwards)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs of each path')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in dbjson.SUPPORTED_VENDORS:
+            raise CommandError(f'Database-side JSON is not available on {connection.vendor}.')
+
+        request = RequestFactory().get('/api/projects/', HTTP_HOST='localhost')
+        failures = []
+        try:
+            with transaction.atomic():
+                if options['rows']:
+                    self._add_rows(options['rows'])
+                for model, serializer_class in LISTS:
+                    if not self._check(model, serializer_class, request, options['repeat']):
+                        failures.append(model.__name__)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f'Database JSON differs from the serializers for: {", ".join(failures)}')
+        self.stdout.write(self.style.SUCCESS('Database JSON matches the serializers byte for byte'))
+
+    def _check(self, model, serializer_class, request, repeat):
+        queryset = model.objects.all()
+
+        def orm():
+            data = serializer_class(queryset.all(), many=True, context={'request': request}).data
+            return JSONRenderer().render(data)
+
+        def database():
+            return b''.join(dbjson.stream(dbjson.json_rows(queryset.all(), serializer_class, request).iterator()))
+
+        expected, actual = orm(), database()
+        count = queryset.count()
+        if expected != actual:
+            offset = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b), min(len(expected), len(actual)))
+            self.stdout.write(self.style.ERROR(
+                f'{model.__name__}: differs at byte {offset}\n'
+                f'  serializer: {expected[max(0, offset - 60):offset + 60]!r}\n'
+                f'  database:   {actual[max(0, offset - 60):offset + 60]!r}'
+            ))
+            return False
+
+        timings = {}
+        for name, render in (('serializer', orm), ('database', database)):
+            runs = []
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                render()
+                runs.append(time.perf_counter() - start)
+            timings[name] = statistics.median(runs)
+        speedup = timings['serializer'] / timings['database'] if timings['database'] else 0
+        self.stdout.write(
+            f'{model.__name__}: {count} rows, {len(actual)} bytes identical; '
+            f'serializer {timings["serializer"] * 1000:.1f} ms, database {timings["database"] * 1000:.1f} ms '
+            f'({speedup:.1f}x)'
+        )
+        return True
+
+    def _add_rows(self, rows):
+        # bulk_create() skips Model.save(), which assigns the portfolio
+        portfolio_id = portfolio_id_for_writes()
+        skills = Skill.objects.bulk_create([
+            Skill(name=f'Skill {i} {AWKWARD_TEXT}', category='programming', description=AWKWARD_TEXT, order=i,
+                  portfolio_id=portfolio_id)
+            for i in range(8)
+        ])
+        skills += list(Skill.objects.filter(portfolio_id=portfolio_id).exclude(pk__in=[skill.pk for skill in skills])[:8])
+
+        projects = Project.objects.bulk_create([
+            Project(
+                title=f'Project {i}', short_description=AWKWARD_TEXT, description=AWKWARD_TEXT * 5,
+                image=f'projects/screenshot-{i}.png' if i % 2 else None,
+                github_url='https://github.com/example/project', featured=i % 7 == 0, order=i,
+                portfolio_id=portfolio_id,
+            )
+            for i in range(rows)
+        ])
+        Project.technologies.through.objects.bulk_create([
+            Project.technologies.through(project_id=project.pk, skill_id=skill.pk)
+            for i, project in enumerate(projects)
+            for skill in skills[i % 5:i % 5 + 4]
+        ])
+
+        experiences = Experience.objects.bulk_create([
+            Experience(
+                company=f'Company {i} {AWKWARD_TEXT}', position='Engineer', location='Zürich',
+                company_logo=f'company_logos/logo-{i}.png' if i % 3 else None,
+                start_date=date(2000, 1, 1) + timedelta(days=i), end_date=None if i % 4 == 0 else date(2030, 1, 1),
+                current=i % 4 == 0, description=AWKWARD_TEXT, achievements=AWKWARD_TEXT, order=i,
+                portfolio_id=portfolio_id,
+            )
+            for i in range(rows)
+        ])
+        Experience.technologies_used.through.objects.bulk_create([
+            Experience.technologies_used.through(experience_id=experience.pk, skill_id=skill.pk)
+            for i, experience in enumerate(experiences)
+            for skill in skills[i % 3:i % 3 + 5]
+        ])
+
+        # bulk_create bypasses the signals that maintain the read model
+        for model in readmodel.READ_MODELS:
+            readmodel.sync(model)
+        self.stdout.write(f'Added {rows} synthetic projects and experience entries')
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0002_alter_education_institution_logo_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(db_index=True, help_text='Request path', max_length=255)),
+                ('method', models.CharField(max_length=10)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('mode', models.CharField(choices=[('cprofile', 'cProfile (deterministic)'), ('sample', 'Sampling')], max_length=10)),
+                ('trigger', models.CharField(choices=[('request', 'Requested by staff'), ('random', 'Random sample')], max_length=10)),
+                ('duration_ms', models.FloatField(help_text='Wall time of the profiled request')),
+                ('query_count', models.PositiveIntegerField(default=0, help_text='Database queries executed')),
+                ('summary', models.TextField(blank=True, help_text='Top functions by cumulative time or samples')),
+                ('collapsed_stacks', models.TextField(blank=True, help_text="Collapsed stacks ('frame;frame;frame count'), for flamegraph.pl or speedscope")),
+                ('pstats_data', models.BinaryField(blank=True, help_text='Marshalled pstats (cProfile only)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('user', models.ForeignKey(blank=True, help_text='Staff user who requested the profile', null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Request Profile',
+                'verbose_name_plural': 'Request Profiles',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:34
+
+import django.core.validators
+import portfolio_api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0003_profilerecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Storage name (cas/ab/<sha256>.ext)', max_length=100, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('size', models.PositiveBigIntegerField(help_text='Size in bytes')),
+                ('ref_count', models.IntegerField(default=0, help_text='Number of model fields pointing at this blob')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Media Blob',
+                'verbose_name_plural': 'Media Blobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='education',
+            name='institution_logo',
+            field=models.ImageField(blank=True, null=True, storage=portfolio_api.storage.media_storage, upload_to='institution_logos/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'webp'])], verbose_name='Institution logo (optional)'),
+        ),
+        migrations.AlterField(
+            model_name='experience',
+            name='company_logo',
+            field=models.ImageField(blank=True, null=True, storage=portfolio_api.storage.media_storage, upload_to='company_logos/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'webp'])], verbose_name='Company logo (optional)'),
+        ),
+        migrations.AlterField(
+            model_name='personalinfo',
+            name='profile_image',
+            field=models.ImageField(blank=True, default='profile/default_profile.png', help_text='Upload profile image (recommended size: 500x500px)', storage=portfolio_api.storage.media_storage, upload_to='profile/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'webp'])], verbose_name='Profile Image'),
+        ),
+        migrations.AlterField(
+            model_name='personalinfo',
+            name='resume',
+            field=models.FileField(blank=True, help_text='Upload your resume/CV (PDF format recommended)', null=True, storage=portfolio_api.storage.media_storage, upload_to='resumes/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])], verbose_name='Resume/CV'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=portfolio_api.storage.media_storage, upload_to='projects/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'webp'])], verbose_name='Project screenshot (optional)'),
+        ),
+    ]
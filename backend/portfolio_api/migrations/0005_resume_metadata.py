@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:37
+
+import portfolio_api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0004_content_addressed_media'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='personalinfo',
+            name='resume_page_count',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='resume_preview',
+            field=models.ImageField(blank=True, editable=False, help_text='PNG of the first page, generated from the resume', null=True, storage=portfolio_api.storage.media_storage, upload_to='resume_previews/', verbose_name='Resume preview'),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='resume_processed_for',
+            field=models.CharField(blank=True, editable=False, help_text='Resume file the generated fields belong to', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='resume_size',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Size in bytes', null=True),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='resume_status',
+            field=models.CharField(blank=True, choices=[('ready', 'Ready'), ('failed', 'Failed')], editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='resume_text',
+            field=models.TextField(blank=True, editable=False, help_text='Text extracted from the resume'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_skill_usage(apps, schema_editor):
+    Skill = apps.get_model('portfolio_api', 'Skill')
+    SkillUsage = apps.get_model('portfolio_api', 'SkillUsage')
+    Experience = apps.get_model('portfolio_api', 'Experience')
+    usage = []
+    for skill in Skill.objects.using(schema_editor.connection.alias).annotate(
+        n_projects=models.Count('projects', distinct=True),
+        n_experiences=models.Count('experiences', distinct=True),
+        first=models.Min('experiences__start_date'),
+        last=models.Max('experiences__end_date'),
+    ).iterator():
+        usage.append(SkillUsage(
+            skill_id=skill.pk,
+            project_count=skill.n_projects,
+            experience_count=skill.n_experiences,
+            total_count=skill.n_projects + skill.n_experiences,
+            first_used=skill.first,
+            last_used=skill.last,
+            in_use=Experience.objects.filter(technologies_used=skill, current=True).exists(),
+        ))
+    SkillUsage.objects.bulk_create(usage, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0005_resume_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillUsage',
+            fields=[
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='usage', serialize=False, to='portfolio_api.skill')),
+                ('project_count', models.PositiveIntegerField(default=0)),
+                ('experience_count', models.PositiveIntegerField(default=0)),
+                ('total_count', models.PositiveIntegerField(db_index=True, default=0, help_text='Projects plus experiences')),
+                ('first_used', models.DateField(blank=True, help_text='Earliest experience start date', null=True)),
+                ('last_used', models.DateField(blank=True, help_text='Latest experience end date', null=True)),
+                ('in_use', models.BooleanField(default=False, help_text='Used in a current position')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Skill Usage',
+                'verbose_name_plural': 'Skill Usage',
+                'ordering': ['-total_count'],
+            },
+        ),
+        migrations.RunPython(populate_skill_usage, migrations.RunPython.noop),
+    ]
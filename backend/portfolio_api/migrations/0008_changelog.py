@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:46
+
+from django.db import migrations, models
+
+FEED_MODELS = ['PersonalInfo', 'SocialLink', 'Skill', 'Project', 'Experience', 'Education']
+
+
+def seed_changelog(apps, schema_editor):
+    # Existing content enters the feed as created, so a full sync sees it
+    using = schema_editor.connection.alias
+    ChangeLogEntry = apps.get_model('portfolio_api', 'ChangeLogEntry')
+    for name in FEED_MODELS:
+        model = apps.get_model('portfolio_api', name)
+        ChangeLogEntry.objects.using(using).bulk_create(
+            [ChangeLogEntry(model=name.lower(), object_id=pk, action='created')
+             for pk in model.objects.using(using).order_by('pk').values_list('pk', flat=True).iterator()],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0007_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(help_text="Model name, e.g. 'project'", max_length=32)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=7)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Change Log Entry',
+                'verbose_name_plural': 'Change Log',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['model', 'object_id', 'id'], name='changelog_object_idx')],
+            },
+        ),
+        migrations.RunPython(seed_changelog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:50
+
+from django.db import migrations, models
+
+# Same fields, in the same order, as SkillSerializer
+SKILL_FIELDS = ['id', 'name', 'category', 'proficiency', 'description', 'icon', 'order']
+
+
+def populate_rendered(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    for model_name, m2m_field, media_field in (
+        ('Project', 'technologies', 'image'),
+        ('Experience', 'technologies_used', 'company_logo'),
+    ):
+        model = apps.get_model('portfolio_api', model_name)
+        rows = []
+        for row in model.objects.using(alias).iterator():
+            media = getattr(row, media_field)
+            row.rendered = {
+                'technologies': list(getattr(row, m2m_field).values(*SKILL_FIELDS)),
+                'media_url': media.url if media else None,
+            }
+            rows.append(row)
+        model.objects.using(alias).bulk_update(rows, ['rendered'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0008_changelog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='experience',
+            name='rendered',
+            field=models.JSONField(default=dict, editable=False, help_text='Serialized technologies and logo URL, maintained by signals'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='rendered',
+            field=models.JSONField(default=dict, editable=False, help_text='Serialized technologies and image URL, maintained by signals'),
+        ),
+        migrations.RunPython(populate_rendered, migrations.RunPython.noop),
+    ]
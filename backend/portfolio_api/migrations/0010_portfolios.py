@@ -0,0 +1,170 @@
+# Generated by Django 5.2.5 on 2026-10-19 08:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CONTENT_MODELS = ['ChangeLogEntry', 'Contact', 'Education', 'Experience', 'PersonalInfo', 'Project', 'Skill', 'SocialLink']
+
+
+def assign_default_portfolio(apps, schema_editor):
+    """Existing content becomes the default (blank host) portfolio."""
+    alias = schema_editor.connection.alias
+    Portfolio = apps.get_model('portfolio_api', 'Portfolio')
+    portfolio, _ = Portfolio.objects.using(alias).get_or_create(host='', defaults={'name': 'Default'})
+    for model_name in CONTENT_MODELS:
+        model = apps.get_model('portfolio_api', model_name)
+        model.objects.using(alias).filter(portfolio__isnull=True).update(portfolio=portfolio)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0009_read_model'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Portfolio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Internal name', max_length=100)),
+                ('host', models.CharField(blank=True, help_text='Host name it is served on (lowercase, no port); blank for the default portfolio. Must also match ALLOWED_HOSTS', max_length=253, unique=True)),
+                ('is_active', models.BooleanField(default=True, help_text='Serve this portfolio')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Portfolio',
+                'verbose_name_plural': 'Portfolios',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='education',
+            name='education_timeline_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='education',
+            name='education_end_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='experience',
+            name='experience_timeline_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='experience',
+            name='experience_end_date_idx',
+        ),
+        migrations.AddField(
+            model_name='changelogentry',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AddField(
+            model_name='contact',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AddField(
+            model_name='education',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AddField(
+            model_name='experience',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AddField(
+            model_name='personalinfo',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AddField(
+            model_name='sociallink',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.RunPython(assign_default_portfolio, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='changelogentry',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AlterField(
+            model_name='contact',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AlterField(
+            model_name='education',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AlterField(
+            model_name='experience',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AlterField(
+            model_name='personalinfo',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AlterField(
+            model_name='skill',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AlterField(
+            model_name='sociallink',
+            name='portfolio',
+            field=models.ForeignKey(editable=False, help_text='Portfolio this belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='portfolio_api.portfolio'),
+        ),
+        migrations.AddIndex(
+            model_name='changelogentry',
+            index=models.Index(fields=['portfolio', 'id'], name='changelog_portfolio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['portfolio', '-created_at'], name='contact_portfolio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['portfolio', '-start_date', 'order'], name='education_timeline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(fields=['portfolio', 'end_date'], name='education_end_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['portfolio', '-start_date', 'order'], name='experience_timeline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='experience',
+            index=models.Index(fields=['portfolio', 'end_date'], name='experience_end_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['portfolio', '-featured', 'order', '-created_at'], name='project_portfolio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['portfolio', 'category', 'order', 'name'], name='skill_portfolio_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0010_portfolios'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='personalinfo',
+            name='resume_status',
+            field=models.CharField(blank=True, choices=[('ready', 'Ready'), ('partial', 'Partial (some tools missing)'), ('unsupported', 'Unsupported (no tool for this file)'), ('failed', 'Failed')], editable=False, max_length=12),
+        ),
+    ]
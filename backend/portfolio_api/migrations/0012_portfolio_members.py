@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def add_staff_to_default_portfolio(apps, schema_editor):
+    """Staff users keep managing the default portfolio, as they did before members existed."""
+    alias = schema_editor.connection.alias
+    Portfolio = apps.get_model('portfolio_api', 'Portfolio')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    portfolio = Portfolio.objects.using(alias).filter(host='').first()
+    if portfolio is not None:
+        portfolio.members.add(*User.objects.using(alias).filter(is_staff=True, is_superuser=False))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio_api', '0011_resume_status_unsupported'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='portfolio',
+            name='members',
+            field=models.ManyToManyField(blank=True, help_text="Staff users who may manage this portfolio's content (superusers manage every portfolio)", related_name='portfolios', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(add_staff_to_default_portfolio, migrations.RunPython.noop),
+    ]
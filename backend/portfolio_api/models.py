@@ -1,14 +1,75 @@
+from django.conf import settings
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator, FileExtensionValidator
 from django.utils.text import slugify
-from django.core.files.storage import FileSystemStorage
 from .constants import (
     SKILL_CATEGORIES, PROFICIENCY_CHOICES, CPI_MIN, CPI_MAX,
     UPLOAD_PATHS, VALIDATION_MESSAGES
 )
+from .storage import media_storage
+from .tenancy import PortfolioManager, portfolio_id_for_writes
 
 
-class SocialLink(models.Model):
+class Portfolio(models.Model):
+    """A portfolio (tenant) and the host it is served on."""
+
+    name = models.CharField(max_length=100, help_text="Internal name")
+    host = models.CharField(
+        max_length=253,
+        unique=True,
+        blank=True,
+        help_text="Host name it is served on (lowercase, no port); blank for the default portfolio. "
+                  "Must also match ALLOWED_HOSTS"
+    )
+    is_active = models.BooleanField(default=True, help_text="Serve this portfolio")
+    members = models.ManyToManyField(
+        settings.AUTH_USER_MODEL,
+        blank=True,
+        related_name='portfolios',
+        help_text="Staff users who may manage this portfolio's content (superusers manage every portfolio)"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = "Portfolio"
+        verbose_name_plural = "Portfolios"
+
+    def __str__(self):
+        return f"{self.name} ({self.host or 'default'})"
+
+    def save(self, *args, **kwargs):
+        self.host = self.host.strip().lower()
+        super().save(*args, **kwargs)
+
+
+class PortfolioOwnedModel(models.Model):
+    """
+    Base for content that belongs to one portfolio.
+
+    The default manager is scoped to the active portfolio (see ``tenancy``),
+    and new rows are assigned to it.
+    """
+    portfolio = models.ForeignKey(
+        Portfolio,
+        on_delete=models.CASCADE,
+        related_name='+',
+        editable=False,
+        help_text="Portfolio this belongs to"
+    )
+
+    objects = PortfolioManager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self.portfolio_id is None:
+            self.portfolio_id = portfolio_id_for_writes()
+        super().save(*args, **kwargs)
+
+
+class SocialLink(PortfolioOwnedModel):
     """Model to store various social media and profile links."""
     personal_info = models.ForeignKey(
         'PersonalInfo',
@@ -28,6 +89,7 @@ class SocialLink(models.Model):
         ('instagram', 'Instagram'),
         ('youtube', 'YouTube'),
     ]
+    PLATFORM_NAMES = dict(PLATFORM_CHOICES)
     
     platform = models.CharField(
         max_length=20,
@@ -65,22 +127,25 @@ class SocialLink(models.Model):
         return f"{self.get_platform_display()}: {self.display_text or self.url}"
 
     def save(self, *args, **kwargs):
-        # Automatically set display_text to platform name if not provided
-        if not self.display_text and self.platform:
-            # Get the display name from PLATFORM_CHOICES
-            display_name = dict(self.PLATFORM_CHOICES).get(self.platform, self.platform)
-            self.display_text = display_name
+        self.set_default_display_text()
+        if self.portfolio_id is None and self.personal_info_id is not None:
+            self.portfolio_id = self.personal_info.portfolio_id
         super().save(*args, **kwargs)
+
+    def set_default_display_text(self):
+        """Automatically set display_text to the platform name if not provided."""
+        if not self.display_text and self.platform:
+            self.display_text = self.get_platform_display()
         
     def get_platform_display(self):
         """Get the display name for the platform."""
-        return dict(self.PLATFORM_CHOICES).get(self.platform, self.platform)
+        return self.PLATFORM_NAMES.get(self.platform, self.platform)
 
 
-class PersonalInfo(models.Model):
+class PersonalInfo(PortfolioOwnedModel):
     """
     Model to store personal information for the portfolio owner.
-    Only one instance should exist at a time.
+    Only one instance should exist per portfolio.
     """
     name = models.CharField(max_length=100, help_text="Full name")
     title = models.CharField(max_length=200, help_text="Professional title or role")
@@ -96,6 +161,7 @@ class PersonalInfo(models.Model):
     profile_image = models.ImageField(
         "Profile Image",
         upload_to='profile/',
+        storage=media_storage,
         blank=True,
         help_text="Upload profile image (recommended size: 500x500px)",
         default='profile/default_profile.png',
@@ -106,12 +172,40 @@ class PersonalInfo(models.Model):
     resume = models.FileField(
         "Resume/CV",
         upload_to='resumes/',
+        storage=media_storage,
         blank=True,
         null=True,
         help_text="Upload your resume/CV (PDF format recommended)",
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
 
+    # Generated from the resume in the background (see resume.py)
+    RESUME_STATUS_CHOICES = [
+        ('ready', 'Ready'),
+        ('partial', 'Partial (some tools missing)'),
+        ('unsupported', 'Unsupported (no tool for this file)'),
+        ('failed', 'Failed'),
+    ]
+    resume_preview = models.ImageField(
+        "Resume preview",
+        upload_to='resume_previews/',
+        storage=media_storage,
+        blank=True,
+        null=True,
+        editable=False,
+        help_text="PNG of the first page, generated from the resume"
+    )
+    resume_page_count = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    resume_size = models.PositiveIntegerField(null=True, blank=True, editable=False, help_text="Size in bytes")
+    resume_text = models.TextField(blank=True, editable=False, help_text="Text extracted from the resume")
+    resume_status = models.CharField(max_length=12, choices=RESUME_STATUS_CHOICES, blank=True, editable=False)
+    resume_processed_for = models.CharField(
+        max_length=100,
+        blank=True,
+        editable=False,
+        help_text="Resume file the generated fields belong to"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -135,13 +229,15 @@ class PersonalInfo(models.Model):
         return f"{self.name} - {self.title}"
 
     def save(self, *args, **kwargs):
-        """Ensure only one PersonalInfo instance exists"""
-        if not self.pk and PersonalInfo.objects.exists():
+        """Ensure only one PersonalInfo instance exists per portfolio"""
+        if self.portfolio_id is None:
+            self.portfolio_id = portfolio_id_for_writes()
+        if not self.pk and PersonalInfo._base_manager.filter(portfolio_id=self.portfolio_id).exists():
             raise ValueError(VALIDATION_MESSAGES['only_one_personal_info'])
         super().save(*args, **kwargs)
 
 
-class Skill(models.Model):
+class Skill(PortfolioOwnedModel):
     """Model to store technical and soft skills with proficiency levels."""
     
     name = models.CharField(max_length=100, help_text="Skill name")
@@ -158,6 +254,9 @@ class Skill(models.Model):
     
     class Meta:
         ordering = ['category', 'order', 'name']
+        indexes = [
+            models.Index(fields=['portfolio', 'category', 'order', 'name'], name='skill_portfolio_idx'),
+        ]
         verbose_name = "Skill"
         verbose_name_plural = "Skills"
     
@@ -165,24 +264,56 @@ class Skill(models.Model):
         return f"{self.name} ({self.get_category_display()})"
 
 
-class Project(models.Model):
+class SkillUsage(models.Model):
+    """
+    How much each skill is used, materialized from the project/experience M2M tables.
+
+    Rows are refreshed for the affected skills whenever technologies are
+    added or removed, an experience's dates change, or a project/experience
+    is deleted (see usage.py); ``manage.py rebuild_skill_usage`` recomputes
+    everything.
+    """
+    skill = models.OneToOneField(Skill, on_delete=models.CASCADE, primary_key=True, related_name='usage')
+    project_count = models.PositiveIntegerField(default=0)
+    experience_count = models.PositiveIntegerField(default=0)
+    total_count = models.PositiveIntegerField(default=0, db_index=True, help_text="Projects plus experiences")
+    first_used = models.DateField(null=True, blank=True, help_text="Earliest experience start date")
+    last_used = models.DateField(null=True, blank=True, help_text="Latest experience end date")
+    in_use = models.BooleanField(default=False, help_text="Used in a current position")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-total_count']
+        verbose_name = "Skill Usage"
+        verbose_name_plural = "Skill Usage"
+
+    def __str__(self):
+        return f"{self.skill_id}: {self.total_count} use(s)"
+
+
+class Project(PortfolioOwnedModel):
     """Model to store portfolio projects with technologies and links."""
     
     title = models.CharField(max_length=200, help_text="Project title")
     description = models.TextField(help_text="Detailed project description")
     short_description = models.CharField(max_length=300, help_text="Brief project summary")
-    image = models.ImageField("Project screenshot (optional)", upload_to='projects/', blank=True, null=True, 
+    image = models.ImageField("Project screenshot (optional)", upload_to='projects/', storage=media_storage, blank=True, null=True, 
                              validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'webp'])])
     github_url = models.URLField(blank=True, help_text="GitHub repository URL (optional)")
     live_url = models.URLField(blank=True, help_text="Live demo URL (optional)")
     technologies = models.ManyToManyField(Skill, related_name='projects', help_text="Technologies used")
     featured = models.BooleanField(default=False, help_text="Mark as featured project")
     order = models.PositiveIntegerField(default=0, help_text="Display order")
+    rendered = models.JSONField(default=dict, editable=False,
+                                help_text="Serialized technologies and image URL, maintained by signals")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-featured', 'order', '-created_at']
+        indexes = [
+            models.Index(fields=['portfolio', '-featured', 'order', '-created_at'], name='project_portfolio_idx'),
+        ]
         verbose_name = "Project"
         verbose_name_plural = "Projects"
     
@@ -190,11 +321,11 @@ class Project(models.Model):
         return self.title
 
 
-class Experience(models.Model):
+class Experience(PortfolioOwnedModel):
     """Model to store work experience with achievements and technologies."""
     
     company = models.CharField(max_length=200, help_text="Company name")
-    company_logo = models.ImageField("Company logo (optional)", upload_to='company_logos/', blank=True, null=True,
+    company_logo = models.ImageField("Company logo (optional)", upload_to='company_logos/', storage=media_storage, blank=True, null=True,
                                    validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'webp'])])
     position = models.CharField(max_length=200, help_text="Job title/position")
     location = models.CharField(max_length=100, blank=True, help_text="Work location (optional)")
@@ -210,9 +341,16 @@ class Experience(models.Model):
         help_text="Technologies used in this role"
     )
     order = models.PositiveIntegerField(default=0, help_text="Display order")
+    rendered = models.JSONField(default=dict, editable=False,
+                                help_text="Serialized technologies and logo URL, maintained by signals")
     
     class Meta:
         ordering = ['-start_date', 'order']
+        indexes = [
+            # Serve the default ordering and the /api/timeline/ date-range filters, per portfolio
+            models.Index(fields=['portfolio', '-start_date', 'order'], name='experience_timeline_idx'),
+            models.Index(fields=['portfolio', 'end_date'], name='experience_end_date_idx'),
+        ]
         verbose_name = "Work Experience"
         verbose_name_plural = "Work Experience"
     
@@ -230,11 +368,11 @@ class Experience(models.Model):
             raise ValidationError(VALIDATION_MESSAGES['current_with_end_date'])
 
 
-class Education(models.Model):
+class Education(PortfolioOwnedModel):
     """Model to store educational background and achievements."""
     
     institution = models.CharField(max_length=200, help_text="Educational institution name")
-    institution_logo = models.ImageField("Institution logo (optional)", upload_to='institution_logos/', blank=True, null=True,
+    institution_logo = models.ImageField("Institution logo (optional)", upload_to='institution_logos/', storage=media_storage, blank=True, null=True,
                                        validators=[FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'gif', 'webp'])])
     degree = models.CharField(max_length=200, help_text="Degree obtained")
     field_of_study = models.CharField(max_length=200, help_text="Field of study/major")
@@ -255,6 +393,11 @@ class Education(models.Model):
     
     class Meta:
         ordering = ['-start_date', 'order']
+        indexes = [
+            # Serve the default ordering and the /api/timeline/ date-range filters, per portfolio
+            models.Index(fields=['portfolio', '-start_date', 'order'], name='education_timeline_idx'),
+            models.Index(fields=['portfolio', 'end_date'], name='education_end_date_idx'),
+        ]
         verbose_name = "Education"
         verbose_name_plural = "Education"
     
@@ -272,7 +415,7 @@ class Education(models.Model):
             raise ValidationError(VALIDATION_MESSAGES['current_with_end_date'])
 
 
-class Contact(models.Model):
+class Contact(PortfolioOwnedModel):
     """Model to store contact form submissions from visitors."""
     
     name = models.CharField(max_length=100, help_text="Visitor's name")
@@ -284,8 +427,107 @@ class Contact(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['portfolio', '-created_at'], name='contact_portfolio_idx'),
+        ]
         verbose_name = "Contact Message"
         verbose_name_plural = "Contact Messages"
     
     def __str__(self):
         return f"Message from {self.name}: {self.subject}"
+
+
+class ProfileRecord(models.Model):
+    """Profile of a single request captured by ProfilingMiddleware."""
+
+    MODE_CHOICES = [
+        ('cprofile', 'cProfile (deterministic)'),
+        ('sample', 'Sampling'),
+    ]
+    TRIGGER_CHOICES = [
+        ('request', 'Requested by staff'),
+        ('random', 'Random sample'),
+    ]
+
+    path = models.CharField(max_length=255, db_index=True, help_text="Request path")
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES)
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        help_text="Staff user who requested the profile"
+    )
+    duration_ms = models.FloatField(help_text="Wall time of the profiled request")
+    query_count = models.PositiveIntegerField(default=0, help_text="Database queries executed")
+    summary = models.TextField(blank=True, help_text="Top functions by cumulative time or samples")
+    collapsed_stacks = models.TextField(
+        blank=True,
+        help_text="Collapsed stacks ('frame;frame;frame count'), for flamegraph.pl or speedscope"
+    )
+    pstats_data = models.BinaryField(blank=True, null=True, help_text="Marshalled pstats (cProfile only)")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Request Profile"
+        verbose_name_plural = "Request Profiles"
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms, {self.mode})"
+
+
+class MediaBlob(models.Model):
+    """A file in the content-addressed media store and how many fields reference it."""
+
+    name = models.CharField(max_length=100, unique=True, help_text="Storage name (cas/ab/<sha256>.ext)")
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField(help_text="Size in bytes")
+    ref_count = models.IntegerField(default=0, help_text="Number of model fields pointing at this blob")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Media Blob"
+        verbose_name_plural = "Media Blobs"
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} ref(s))"
+
+
+class ChangeLogEntry(PortfolioOwnedModel):
+    """
+    Append-only record of a created, updated or deleted portfolio object.
+
+    The auto-incrementing id is the position in the change feed served by
+    ``/api/changes/``.
+    """
+
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=32, help_text="Model name, e.g. 'project'")
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=7, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # Finding superseded entries during compaction
+            models.Index(fields=['model', 'object_id', 'id'], name='changelog_object_idx'),
+            # Reading one portfolio's feed
+            models.Index(fields=['portfolio', 'id'], name='changelog_portfolio_idx'),
+        ]
+        verbose_name = "Change Log Entry"
+        verbose_name_plural = "Change Log"
+
+    def __str__(self):
+        return f"#{self.id} {self.model} {self.object_id} {self.action}"
@@ -0,0 +1,86 @@
+"""
+Bulk reordering for models sorted on an ``order`` field.
+
+Reordering N items through ``save()`` costs N queries, N rounds of signals and
+an ``updated_at`` bump per row. ``apply_order`` writes every changed position
+with a single ``bulk_update`` inside one transaction and requests one
+coalesced cache invalidation (and change log write) for the whole batch.
+``bulk_update`` sends no signals, so a skill reorder re-renders the projects
+and experience entries that embed those skills (see ``readmodel``) itself,
+once the transaction commits.
+"""
+
+from django.db import router
+
+from backend.db.sqlite import immediate_atomic
+
+from . import changelog
+from .invalidation import invalidate
+from .models import Skill, Project, Experience, Education, SocialLink
+from .signals import cache_keys_for, sync_skill_owners
+
+# URL/resource names accepted by the reorder endpoint
+REORDERABLE_MODELS = {
+    'skills': Skill,
+    'projects': Project,
+    'experience': Experience,
+    'education': Education,
+    'social-links': SocialLink,
+}
+
+
+def apply_order(model, ids):
+    """
+    Set ``order`` on the given objects to match their position in ``ids``.
+
+    The objects keep the order slots they already occupy and are only
+    rearranged among them, so reordering a subset leaves it in the same
+    place relative to the rows that were not submitted. Slots shared by
+    several of the objects (e.g. the default 0) are spread out to the next
+    free values. Rows whose order is already correct are not written.
+
+    Args:
+        model: A model class with an ``order`` field
+        ids (list): Primary keys in the desired display order
+
+    Returns:
+        int: Number of rows updated
+
+    Raises:
+        ValueError: If ``ids`` contains duplicates or unknown primary keys
+    """
+    if len(set(ids)) != len(ids):
+        raise ValueError('Duplicate IDs in ordering')
+
+    using = router.db_for_write(model)
+    with immediate_atomic(using=using):
+        objects = {
+            obj.pk: obj
+            for obj in model.objects.using(using).select_for_update().filter(pk__in=ids)
+        }
+        missing = [pk for pk in ids if pk not in objects]
+        if missing:
+            raise ValueError(f"Unknown IDs: {', '.join(str(pk) for pk in missing)}")
+
+        slots = sorted(obj.order for obj in objects.values())
+        for i in range(1, len(slots)):
+            slots[i] = max(slots[i], slots[i - 1] + 1)
+
+        changed = []
+        keys = set()
+        for pk, position in zip(ids, slots):
+            obj = objects[pk]
+            keys.update(cache_keys_for(model, obj))
+            if obj.order != position:
+                obj.order = position
+                changed.append(obj)
+
+        if changed:
+            model.objects.using(using).bulk_update(changed, ['order'])
+            invalidate(*keys, using=using)
+            changelog.record(model, [obj.pk for obj in changed], 'updated', using=using)
+
+            if model is Skill:
+                for obj in changed:
+                    sync_skill_owners([obj.pk], obj.portfolio_id, using=using)
+    return len(changed)
@@ -0,0 +1,339 @@
+"""
+Shared, memory-mapped store of rendered public API responses.
+
+With ``API_PAYLOAD_STORE`` enabled, the response bodies of the public read
+endpoints (``PAYLOAD_STORE_PATHS`` and the further pages of the paginated
+ones) are rendered once into a snapshot file per portfolio and origin under
+``PAYLOAD_STORE_DIR``. Every worker process maps the file read-only and
+``PayloadStoreMiddleware`` answers those requests from it, so:
+
+* a payload exists once in the page cache however many gunicorn workers
+  serve it, instead of once per worker cache;
+* all workers serve the same version: a worker checks the file with one
+  ``stat`` per request and maps the new file as soon as it was replaced.
+
+A snapshot file is a header (magic, version, index length), a JSON index
+of ``full path -> [offset, length, etag, headers]`` and the bodies back to
+back. Lookups return ``memoryview`` slices of the mapping; the only copy is
+the one made when the body is handed to the server, which wants ``bytes``.
+
+Snapshots are written to a temporary file and swapped in with
+``os.replace``, so readers see either the old or the new version and never
+a partial one. Builds of one portfolio are serialized with a file lock, and
+a snapshot is rebuilt in the process that changed the content as soon as
+the change commits (``content_invalidated``). A rebuild that fails removes
+the snapshot, so stale payloads are never served. Snapshots also expire at
+the next midnight, since ``/api/skills/top/`` reports today's date for skills
+in use.
+
+Media URLs in the payloads are absolute, hence one snapshot per origin,
+capped at ``PAYLOAD_STORE_MAX_ORIGINS`` per portfolio. Requests served from
+the store skip the views, including DRF throttling.
+
+The store relies on POSIX file locking and on replacing files that other
+processes have mapped; keep it disabled on Windows.
+"""
+
+import contextlib
+import fcntl
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+
+from backend.metrics import PAYLOAD_STORE_BUILDS, PAYLOAD_STORE_REQUESTS
+from .constants import (
+    INDEX_PAGE_CACHE_KEY, PAYLOAD_STORE_MAX_ORIGINS, PAYLOAD_STORE_MAX_PAGES, PAYLOAD_STORE_PATHS,
+)
+from .tenancy import activate
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PFSNAP1\n'
+HEADER = struct.Struct('<8sQI')  # magic, version, index length
+
+# Every change to public content clears the entry page of its portfolio
+_CONTENT_KEY = re.compile(rf'^p(\d+):{INDEX_PAGE_CACHE_KEY}$')
+
+_stored_paths = frozenset(PAYLOAD_STORE_PATHS)
+
+# Snapshot file path -> Snapshot mapped by this process
+_snapshots = {}
+
+
+def _snapshot_path(portfolio_id, origin):
+    digest = hashlib.sha256(origin.encode()).hexdigest()[:16]
+    return os.path.join(settings.PAYLOAD_STORE_DIR, f'p{portfolio_id}-{digest}.snapshot')
+
+
+def _portfolio_snapshots(portfolio_id):
+    return glob.glob(os.path.join(settings.PAYLOAD_STORE_DIR, f'p{portfolio_id}-*.snapshot'))
+
+
+@contextlib.contextmanager
+def _locked(portfolio_id):
+    """Hold the build lock of a portfolio, across processes."""
+    os.makedirs(settings.PAYLOAD_STORE_DIR, exist_ok=True)
+    with open(os.path.join(settings.PAYLOAD_STORE_DIR, f'p{portfolio_id}.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class Snapshot:
+    """One snapshot file, mapped read-only."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        magic, self.version, index_length = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a payload snapshot')
+        index = json.loads(self._map[HEADER.size:HEADER.size + index_length])
+        self.origin = index['origin']
+        self.expires = index['expires']
+        self.entries = index['entries']
+        self.body = memoryview(self._map)[HEADER.size + index_length:]
+
+    @property
+    def expired(self):
+        return time.time() >= self.expires
+
+    def get(self, full_path):
+        """
+        Look up a stored response.
+
+        Returns:
+            tuple | None: Body (``memoryview``), ETag and ``[name, value]`` headers
+        """
+        entry = self.entries.get(full_path)
+        if entry is None:
+            return None
+        offset, length, etag, headers = entry
+        return self.body[offset:offset + length], etag, headers
+
+
+def snapshot(portfolio_id, origin):
+    """
+    Return the current snapshot of a portfolio and origin, mapping it if it changed.
+
+    Returns:
+        Snapshot | None: None if there is no snapshot yet
+    """
+    path = _snapshot_path(portfolio_id, origin)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _snapshots.pop(path, None)
+        return None
+    current = _snapshots.get(path)
+    if current is None or current.key != (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+        try:
+            current = Snapshot(path)
+        except FileNotFoundError:
+            return None
+        _snapshots[path] = current
+    return current
+
+
+def _seconds_until_tomorrow():
+    now = timezone.localtime()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo)
+    return (midnight - now).total_seconds()
+
+
+def _render(request):
+    match = resolve(request.path_info)
+    response = match.func(request, *match.args, **match.kwargs)
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+def render_payloads(portfolio_id, origin):
+    """
+    Render the stored endpoints of a portfolio as requested on an origin.
+
+    Yields:
+        tuple: Full path, body (bytes) and ``[name, value]`` headers of each 200 response
+    """
+    scheme, host = origin.split('://', 1)
+    factory = RequestFactory()
+    pending = list(PAYLOAD_STORE_PATHS)
+    pages = {}
+    with activate(portfolio_id):
+        while pending:
+            full_path = pending.pop(0)
+            request = factory.get(full_path, HTTP_HOST=host, secure=scheme == 'https')
+            request.portfolio_id = portfolio_id
+            response = _render(request)
+            if response.status_code != 200:
+                continue
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+            headers = [[name, value] for name, value in response.items() if name.lower() != 'content-length']
+            yield full_path, body, headers
+
+            # Follow the pagination links of list endpoints
+            data = json.loads(body)
+            next_link = data.get('next') if isinstance(data, dict) else None
+            if next_link:
+                path = request.path
+                pages[path] = pages.get(path, 1) + 1
+                link = urlsplit(next_link)
+                if link.path == path and pages[path] <= PAYLOAD_STORE_MAX_PAGES:
+                    pending.append(f'{link.path}?{link.query}')
+
+
+def build(portfolio_id, origin, reason, force=True):
+    """
+    Render and swap in a new version of a snapshot.
+
+    Args:
+        portfolio_id (int): Portfolio to render
+        origin (str): Scheme and host the payloads are requested on
+        reason (str): Why the snapshot is built, for metrics
+        force (bool): False keeps a current snapshot written by another
+            process while this one waited for the lock
+
+    Returns:
+        int: Version of the snapshot
+    """
+    path = _snapshot_path(portfolio_id, origin)
+    with _locked(portfolio_id):
+        current = snapshot(portfolio_id, origin)
+        if current is not None and not force and not current.expired:
+            return current.version
+
+        entries, bodies, offset = {}, [], 0
+        for full_path, body, headers in render_payloads(portfolio_id, origin):
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            entries[full_path] = [offset, len(body), etag, headers]
+            bodies.append(body)
+            offset += len(body)
+
+        version = current.version + 1 if current is not None else 1
+        expires = time.time() + min(settings.CACHE_TTL, _seconds_until_tomorrow())
+        index = json.dumps({'origin': origin, 'expires': expires, 'entries': entries}).encode()
+
+        temporary = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(temporary, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, version, len(index)))
+                f.write(index)
+                f.writelines(bodies)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporary)
+            raise
+    PAYLOAD_STORE_BUILDS.labels(reason).inc()
+    logger.debug('Payload snapshot v%d for portfolio %s on %s: %d responses, %d bytes',
+                 version, portfolio_id, origin, len(entries), offset)
+    return version
+
+
+def rebuild(portfolio_id, reason='content'):
+    """
+    Rebuild every snapshot of a portfolio; snapshots that cannot be rebuilt are removed.
+
+    Returns:
+        int: Number of snapshots rebuilt
+    """
+    rebuilt = 0
+    for path in _portfolio_snapshots(portfolio_id):
+        try:
+            build(portfolio_id, Snapshot(path).origin, reason)
+            rebuilt += 1
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.exception('Could not rebuild payload snapshot %s; removing it', path)
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+    return rebuilt
+
+
+def rebuild_invalidated(sender, keys, **kwargs):
+    """``content_invalidated`` receiver rebuilding the snapshots of the changed portfolios."""
+    portfolio_ids = {int(match.group(1)) for match in map(_CONTENT_KEY.match, keys) if match}
+    for portfolio_id in sorted(portfolio_ids):
+        rebuild(portfolio_id)
+
+
+def respond(request):
+    """
+    Answer a request from the store.
+
+    Builds the snapshot of the request's portfolio and origin first if there
+    is none or it expired.
+
+    Returns:
+        HttpResponse | None: None if the request has to go to the view
+    """
+    origin = request.build_absolute_uri('/')[:-1]
+    current = snapshot(request.portfolio_id, origin)
+    if current is None or current.expired:
+        reason = 'missing' if current is None else 'expired'
+        if current is None and len(_portfolio_snapshots(request.portfolio_id)) >= PAYLOAD_STORE_MAX_ORIGINS:
+            return None
+        try:
+            build(request.portfolio_id, origin, reason, force=False)
+        except Exception:
+            logger.exception('Could not build the payload snapshot of portfolio %s on %s',
+                             request.portfolio_id, origin)
+            return None
+        current = snapshot(request.portfolio_id, origin)
+        if current is None:
+            return None
+
+    entry = current.get(request.get_full_path())
+    if entry is None:
+        return None
+    body, etag, headers = entry
+    response = HttpResponse(body)
+    for name, value in headers:
+        response[name] = value
+    response['ETag'] = etag
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+class PayloadStoreMiddleware:
+    """
+    Serve the public read endpoints from the shared payload store.
+
+    Must come after ``tenancy.PortfolioMiddleware``; anything the store
+    does not hold goes on to the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD') and request.path_info in _stored_paths:
+            response = respond(request)
+            PAYLOAD_STORE_REQUESTS.labels('miss' if response is None else 'hit').inc()
+            if response is not None:
+                # Label the request's metrics with its route, as if the view had run
+                request.resolver_match = resolve(request.path_info)
+                return response
+        return self.get_response(request)
@@ -0,0 +1,200 @@
+"""
+On-demand request profiling.
+
+``ProfilingMiddleware`` profiles a request when an authenticated staff user
+asks for it with the ``X-Profile`` header or the ``_profile`` query parameter:
+
+* ``X-Profile: cprofile`` (or ``1``) runs cProfile around the view and stores
+  the pstats data plus a text summary sorted by cumulative time;
+* ``X-Profile: sample`` runs a low-overhead sampling profiler and stores
+  collapsed stacks (``frame;frame;frame count``) for flamegraph.pl/speedscope.
+
+With ``PROFILING_SAMPLE_RATE`` above zero, that fraction of all requests is
+also profiled with the sampling profiler. Profiles are saved as
+``ProfileRecord`` rows and browsable in the admin; the response carries
+``X-Profile-Id`` and ``X-Profile-Url`` headers pointing at the record.
+"""
+
+import collections
+import io
+import logging
+import random
+import sys
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.urls import reverse
+
+from .models import ProfileRecord
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = '_profile'
+SUMMARY_LIMIT = 40
+
+_MODES = {'1': 'cprofile', 'true': 'cprofile', 'cprofile': 'cprofile', 'sample': 'sample'}
+
+
+def _frame_label(frame):
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}:{frame.f_code.co_qualname}'
+
+
+class SamplingProfiler:
+    """
+    Sample the call stack of one thread at a fixed interval from a background thread.
+
+    Args:
+        thread_id (int): ``threading.get_ident()`` of the thread to sample
+        root_frame: Frame at which stacks are cut off (frames above it are ignored)
+        interval (float): Seconds between samples
+    """
+
+    def __init__(self, thread_id, root_frame=None, interval=0.005):
+        self.thread_id = thread_id
+        self.root_frame = root_frame
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='request-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame is not self.root_frame:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Return the samples in the collapsed-stack format used by flamegraph tools."""
+        return '\n'.join(f'{";".join(stack)} {count}' for stack, count in self.stacks.most_common())
+
+    def summary(self, limit=SUMMARY_LIMIT) -> str:
+        """Return the functions with the most inclusive and self samples."""
+        total = sum(self.stacks.values())
+        inclusive, own = collections.Counter(), collections.Counter()
+        for stack, count in self.stacks.items():
+            for label in set(stack):
+                inclusive[label] += count
+            own[stack[-1]] += count
+
+        lines = [f'{total} samples every {self.interval * 1000:.1f} ms', '',
+                 f'{"inclusive":>10} {"self":>8}  function']
+        for label, count in inclusive.most_common(limit):
+            lines.append(f'{count / total:>10.1%} {own[label] / total:>8.1%}  {label}')
+        return '\n'.join(lines)
+
+
+class ProfilingMiddleware:
+    """
+    Profile staff requests on demand, plus a random sample of all requests.
+
+    Must come after AuthenticationMiddleware so ``request.user`` is available.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        self.interval = getattr(settings, 'PROFILING_SAMPLE_INTERVAL', 0.005)
+        self.retention = getattr(settings, 'PROFILING_RETENTION', 500)
+
+    def __call__(self, request):
+        mode, trigger = self._requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        query_count = [0]
+
+        def count_query(execute, sql, params, many, context):
+            query_count[0] += 1
+            return execute(sql, params, many, context)
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count_query))
+            start = time.perf_counter()
+            if mode == 'cprofile':
+                import cProfile  # only loaded once a profile is requested
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.disable()
+            else:
+                profiler = SamplingProfiler(threading.get_ident(), sys._getframe(), self.interval)
+                profiler.start()
+                try:
+                    response = self.get_response(request)
+                finally:
+                    profiler.stop()
+            duration_ms = (time.perf_counter() - start) * 1000
+
+        record = self._store(request, response, profiler, mode, trigger, duration_ms, query_count[0])
+        if record is not None and trigger == 'request':
+            response['X-Profile-Id'] = str(record.pk)
+            response['X-Profile-Url'] = reverse('admin:portfolio_api_profilerecord_change', args=[record.pk])
+        return response
+
+    def _requested_mode(self, request):
+        flag = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+        if flag:
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated and user.is_staff:
+                return _MODES.get(flag.lower(), 'cprofile'), 'request'
+        if self.sample_rate and random.random() < self.sample_rate:
+            return 'sample', 'random'
+        return None, None
+
+    def _store(self, request, response, profiler, mode, trigger, duration_ms, query_count):
+        if mode == 'cprofile':
+            import marshal
+            import pstats
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream)
+            stats.sort_stats('cumulative').print_stats(SUMMARY_LIMIT)
+            summary, collapsed, data = stream.getvalue(), '', marshal.dumps(stats.stats)
+        else:
+            summary, collapsed, data = profiler.summary(), profiler.collapsed(), None
+
+        user = getattr(request, 'user', None)
+        try:
+            record = ProfileRecord.objects.create(
+                path=request.path[:255],
+                method=request.method,
+                status_code=response.status_code,
+                mode=mode,
+                trigger=trigger,
+                user=user if user is not None and user.is_authenticated else None,
+                duration_ms=duration_ms,
+                query_count=query_count,
+                summary=summary,
+                collapsed_stacks=collapsed,
+                pstats_data=data,
+            )
+            self._prune()
+        except DatabaseError:
+            logger.exception('Could not store profile for %s %s', request.method, request.path)
+            return None
+        return record
+
+    def _prune(self):
+        cutoff = (ProfileRecord.objects.order_by('-created_at')
+                  .values_list('created_at', flat=True)[self.retention:self.retention + 1].first())
+        if cutoff is not None:
+            ProfileRecord.objects.filter(created_at__lte=cutoff).delete()
@@ -0,0 +1,120 @@
+"""
+Denormalized read model for projects and work experience.
+
+Each Project and Experience row carries a ``rendered`` JSON column with its
+technologies, already in the shape ``SkillSerializer`` returns, and the
+relative URL of its image or company logo. The list endpoints serialize
+straight from that column, so they are single-table scans with no prefetch
+query.
+
+Signal receivers keep the column current: ``sync`` is called for the rows
+touched by an M2M change, a save of the row itself, or a change to a skill
+it uses. ``sync`` compares what is stored with what it should be and only
+writes rows that differ, which also makes it the consistency check behind
+``manage.py check_read_models``. ``manage.py rebuild_read_models`` brings
+every row up to date after bulk changes that bypass the signals.
+"""
+
+from .models import Experience, Project, Skill
+
+# Model -> (technologies M2M field, image field)
+READ_MODELS = {
+    Project: ('technologies', 'image'),
+    Experience: ('technologies_used', 'company_logo'),
+}
+
+CHUNK_SIZE = 500
+
+# SkillSerializer renders every Skill column but the portfolio; they are plain
+# str/int values, so reading the attributes gives the same JSON without DRF
+SKILL_FIELDS = [field.attname for field in Skill._meta.concrete_fields if field.name != 'portfolio']
+
+
+def skill_data(skill):
+    """Return a skill as ``SkillSerializer`` would serialize it."""
+    return {field: getattr(skill, field) for field in SKILL_FIELDS}
+
+
+def render(instance, technologies=None):
+    """
+    Return the ``rendered`` value a project or experience entry should have.
+
+    Args:
+        instance: Project or Experience
+        technologies (Iterable[Skill] | None): Its skills, if already loaded
+
+    Returns:
+        dict: ``technologies`` (serialized skills) and ``media_url`` (relative URL or None)
+    """
+    m2m_field, media_field = READ_MODELS[type(instance)]
+    if technologies is None:
+        technologies = getattr(instance, m2m_field).all()
+    media = getattr(instance, media_field)
+    return {
+        'technologies': [skill_data(skill) for skill in technologies],
+        'media_url': media.url if media else None,
+    }
+
+
+def sync(model, pks=None, using=None, repair=True):
+    """
+    Bring the ``rendered`` column of the given rows in line with their content.
+
+    Args:
+        model: Project or Experience
+        pks (Iterable[int] | None): Rows to check, or None for all
+        using (str | None): Database alias
+        repair (bool): Write the rows that differ; False only reports them
+
+    Returns:
+        list[int]: Primary keys of the rows whose stored value was out of date
+    """
+    m2m_field, _ = READ_MODELS[model]
+    rows = model._base_manager.using(using).order_by('pk').prefetch_related(m2m_field)
+    if pks is not None:
+        pks = {pk for pk in pks if pk is not None}
+        if not pks:
+            return []
+        rows = rows.filter(pk__in=pks)
+
+    stale = []
+    for instance in rows.iterator(chunk_size=CHUNK_SIZE):
+        rendered = render(instance, getattr(instance, m2m_field).all())
+        if instance.rendered != rendered:
+            instance.rendered = rendered
+            stale.append(instance)
+
+    if repair and stale:
+        # bulk_update sends no signals, so this never re-enters the receivers
+        model._base_manager.using(using).bulk_update(stale, ['rendered'], batch_size=CHUNK_SIZE)
+    return [instance.pk for instance in stale]
+
+
+def sync_instance(instance, using=None, technologies=None):
+    """
+    Refresh the ``rendered`` column of one saved row, in memory and in the database.
+
+    Returns:
+        bool: True if the stored value was out of date
+    """
+    rendered = render(instance, technologies)
+    if instance.rendered == rendered:
+        return False
+    instance.rendered = rendered
+    type(instance)._base_manager.using(using).filter(pk=instance.pk).update(rendered=rendered)
+    return True
+
+
+def owners_of(skill_ids, using=None):
+    """
+    Return ``{model: pks}`` of the projects and experience entries using the given skills.
+    """
+    skill_ids = list(skill_ids)
+    owners = {}
+    for model, (m2m_field, _) in READ_MODELS.items():
+        through = getattr(model, m2m_field).through
+        owner_field = f'{model._meta.model_name}_id'
+        owners[model] = set(
+            through.objects.using(using).filter(skill_id__in=skill_ids).values_list(owner_field, flat=True)
+        )
+    return owners
@@ -0,0 +1,234 @@
+"""
+Resume preview and metadata generation.
+
+When a new resume is uploaded, a background worker extracts the page count,
+the text, and a PNG preview of the first page, and stores them on the
+``PersonalInfo`` row so visitors can glance at the resume without
+downloading it. The work runs off the request path: ``enqueue`` is called
+after the upload transaction commits and a daemon thread (one per process)
+processes the queue. ``manage.py process_resumes`` handles anything left
+over, e.g. after a restart.
+
+Extraction uses whichever tools are available:
+
+* page count and text: ``pypdf`` if installed, otherwise poppler's
+  ``pdfinfo``/``pdftotext``;
+* first-page preview: poppler's ``pdftoppm``;
+* DOCX text: read directly from the document XML.
+
+The status tells whether everything was generated: ``ready``, ``partial``
+when a tool for some of the outputs is missing, ``unsupported`` when
+nothing could be generated (legacy .doc files, or a PDF on a host without
+pypdf and poppler) and ``failed`` when extraction raised.
+"""
+
+import logging
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import zipfile
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections
+
+from .constants import RESUME_PREVIEW_WIDTH, RESUME_TEXT_MAX_CHARS
+
+logger = logging.getLogger(__name__)
+
+TOOL_TIMEOUT = 30  # seconds per external command
+
+RESUME_FIELDS = [
+    'resume_preview', 'resume_page_count', 'resume_size', 'resume_text',
+    'resume_status', 'resume_processed_for',
+]
+
+
+def _run(args):
+    result = subprocess.run(args, capture_output=True, timeout=TOOL_TIMEOUT, check=True)
+    return result.stdout
+
+
+def pdf_page_count_and_text(path):
+    """
+    Return ``(page count, text)`` for a PDF; either is None if no tool for it is available.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        PdfReader = None
+
+    if PdfReader is not None:
+        reader = PdfReader(path)
+        text = []
+        length = 0
+        for page in reader.pages:
+            if length >= RESUME_TEXT_MAX_CHARS:
+                break
+            page_text = page.extract_text() or ''
+            text.append(page_text)
+            length += len(page_text)
+        return len(reader.pages), '\n'.join(text)
+
+    page_count, text = None, None
+    if shutil.which('pdfinfo'):
+        match = re.search(rb'^Pages:\s+(\d+)', _run(['pdfinfo', path]), re.MULTILINE)
+        page_count = int(match.group(1)) if match else None
+    if shutil.which('pdftotext'):
+        text = _run(['pdftotext', '-layout', '-enc', 'UTF-8', path, '-']).decode('utf-8', 'replace')
+    return page_count, text
+
+
+def pdf_preview(path, width=RESUME_PREVIEW_WIDTH):
+    """
+    Render the first page of a PDF to PNG bytes, or return None if ``pdftoppm`` is missing.
+    """
+    if not shutil.which('pdftoppm'):
+        return None
+    with tempfile.TemporaryDirectory() as workdir:
+        prefix = os.path.join(workdir, 'page')
+        _run(['pdftoppm', '-png', '-f', '1', '-l', '1', '-singlefile',
+              '-scale-to-x', str(width), '-scale-to-y', '-1', path, prefix])
+        with open(f'{prefix}.png', 'rb') as image:
+            return image.read()
+
+
+def docx_text(path):
+    """Return the paragraphs of a .docx file as plain text."""
+    namespace = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{namespace}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{namespace}t')))
+    return '\n'.join(paragraphs)
+
+
+def extract(path):
+    """
+    Extract metadata from a resume file.
+
+    Args:
+        path (str): Local path of the PDF/DOC/DOCX file
+
+    Returns:
+        dict: ``page_count`` (int or None), ``text`` (str), ``preview`` (PNG
+        bytes or None) and ``missing`` (the outputs no available tool could
+        produce)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    page_count, text, preview = None, None, None
+    if ext == '.pdf':
+        page_count, text = pdf_page_count_and_text(path)
+        preview = pdf_preview(path)
+        outputs = {'page_count': page_count, 'text': text, 'preview': preview}
+    elif ext == '.docx':
+        text = docx_text(path)
+        outputs = {'text': text}
+    else:
+        outputs = {'text': None}
+    return {
+        'page_count': page_count,
+        'text': re.sub(r'[ \t]+\n', '\n', text or '').strip()[:RESUME_TEXT_MAX_CHARS],
+        'preview': preview,
+        'missing': [output for output, value in outputs.items() if value is None],
+    }
+
+
+def process(pk):
+    """
+    Generate and store the resume metadata of one ``PersonalInfo`` row.
+
+    Does nothing if the row is gone or its resume was already processed.
+    """
+    from .models import PersonalInfo
+
+    info = PersonalInfo.objects.filter(pk=pk).first()
+    if info is None:
+        return
+    name = info.resume.name or ''
+    if name == info.resume_processed_for:
+        return
+
+    info.resume_preview = None
+    info.resume_page_count = None
+    info.resume_size = None
+    info.resume_text = ''
+    info.resume_status = ''
+    if name:
+        try:
+            info.resume_size = info.resume.size
+            metadata = extract(info.resume.path)
+        except Exception:
+            logger.exception('Could not process resume %s', name)
+            info.resume_status = 'failed'
+        else:
+            info.resume_page_count = metadata['page_count']
+            info.resume_text = metadata['text']
+            if metadata['preview']:
+                stem = os.path.splitext(os.path.basename(name))[0]
+                info.resume_preview.save(f'{stem}-page1.png', ContentFile(metadata['preview']), save=False)
+            missing = metadata['missing']
+            if not missing:
+                info.resume_status = 'ready'
+            elif metadata['page_count'] is None and not metadata['text'] and not metadata['preview']:
+                info.resume_status = 'unsupported'
+            else:
+                info.resume_status = 'partial'
+            if missing:
+                logger.warning('No tool available to generate %s for resume %s', ', '.join(missing), name)
+    info.resume_processed_for = name
+    info.save(update_fields=RESUME_FIELDS + ['updated_at'])
+    logger.info('Processed resume for PersonalInfo %s: %s', pk, info.resume_status or 'cleared')
+
+
+class ResumeWorker:
+    """Process queued ``PersonalInfo`` ids on a background thread."""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, pk):
+        self._ensure_thread()
+        self.queue.put(pk)
+
+    def _ensure_thread(self):
+        # Threads do not survive fork(), so each worker process starts its own
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid != pid:
+                self._thread = threading.Thread(target=self._run, name='resume-worker', daemon=True)
+                self._pid = pid
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            pk = self.queue.get()
+            close_old_connections()
+            try:
+                process(pk)
+            except Exception:
+                logger.exception('Resume worker failed for PersonalInfo %s', pk)
+            finally:
+                close_old_connections()
+
+
+_worker = ResumeWorker()
+
+
+def enqueue(pk):
+    """Schedule resume processing, in the background unless RESUME_PROCESSING_ASYNC is off."""
+    if getattr(settings, 'RESUME_PROCESSING_ASYNC', True):
+        _worker.enqueue(pk)
+    else:
+        process(pk)
@@ -1,7 +1,28 @@
 from rest_framework import serializers
 from django.templatetags.static import static
 from django.conf import settings
+from django.utils import timezone
+from backend.db.sqlite import immediate_atomic
+from . import changelog
+from .invalidation import invalidate
 from .models import PersonalInfo, Skill, Project, Experience, Education, Contact, SocialLink
+from .signals import cache_keys_for
+from .utils import format_file_size
+
+
+class UploadErrorsMixin:
+    """
+    Report uploads rejected by ``StreamingUploadHandler`` as field errors.
+    """
+
+    def validate(self, attrs):
+        request = self.context.get('request')
+        rejected = getattr(request, 'upload_errors', None) if request else None
+        if rejected:
+            errors = {field: [message] for field, message in rejected.items() if field in self.fields}
+            if errors:
+                raise serializers.ValidationError(errors)
+        return super().validate(attrs)
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -9,7 +30,7 @@ class SkillSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Skill
-        fields = '__all__'
+        exclude = ['portfolio']
 
 
 class SocialLinkSerializer(serializers.ModelSerializer):
@@ -36,10 +57,108 @@ class SocialLinkSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class PersonalInfoSerializer(serializers.ModelSerializer):
+def sync_social_links(personal_info, links_data, partial=False):
+    """
+    Make the social links of ``personal_info`` match ``links_data``.
+
+    Entries with a known ``id`` update that link, entries without one are
+    created, and existing links that are not listed are deleted. All links
+    are validated up front, then applied with one bulk_update, one
+    bulk_create and one filtered delete inside a single transaction.
+
+    Args:
+        personal_info (PersonalInfo): Owner of the links
+        links_data (list): Social link dicts as sent by the client
+        partial (bool): Whether updates of existing links may omit fields
+
+    Returns:
+        list: The resulting SocialLink objects in display order
+
+    Raises:
+        serializers.ValidationError: If any link is invalid
+    """
+    if not isinstance(links_data, list):
+        raise serializers.ValidationError({'social_links': ['Expected a list of social links.']})
+
+    existing = {link.id: link for link in personal_info.social_links.all()}
+    updates, creates = [], []
+    for index, link_data in enumerate(links_data):
+        link_id = link_data.get('id') if isinstance(link_data, dict) else None
+        try:
+            link_id = int(link_id) if link_id not in (None, '') else None
+        except (TypeError, ValueError):
+            link_id = None
+        if link_id in existing:
+            updates.append((index, existing[link_id], link_data))
+        else:
+            creates.append((index, link_data))
+
+    # Validate every link before touching the database
+    errors = [{} for _ in links_data]
+    update_serializer = SocialLinkSerializer(data=[data for _, _, data in updates], many=True, partial=partial)
+    create_serializer = SocialLinkSerializer(data=[data for _, data in creates], many=True)
+    valid = update_serializer.is_valid()
+    valid = create_serializer.is_valid() and valid
+    if not valid:
+        for (index, _, _), error in zip(updates, update_serializer.errors or []):
+            errors[index] = error
+        for (index, _), error in zip(creates, create_serializer.errors or []):
+            errors[index] = error
+        raise serializers.ValidationError({'social_links': errors})
+
+    # bulk_update() does not touch auto_now fields, so set updated_at explicitly
+    now = timezone.now()
+    update_fields = {'display_text', 'updated_at'}
+    updated_links = []
+    for (_, link, _), attrs in zip(updates, update_serializer.validated_data):
+        for field, value in attrs.items():
+            setattr(link, field, value)
+            update_fields.add(field)
+        link.set_default_display_text()
+        link.updated_at = now
+        updated_links.append(link)
+
+    new_links = []
+    for attrs in create_serializer.validated_data:
+        link = SocialLink(personal_info=personal_info, portfolio_id=personal_info.portfolio_id, **attrs)
+        link.set_default_display_text()
+        new_links.append(link)
+
+    with immediate_atomic():
+        if updated_links:
+            SocialLink.objects.bulk_update(updated_links, sorted(update_fields))
+        if new_links:
+            new_links = SocialLink.objects.bulk_create(new_links)
+        keep_ids = [link.id for link in updated_links]
+        stale = personal_info.social_links.exclude(id__in=keep_ids)
+        if new_links:
+            stale = stale.exclude(id__in=[link.id for link in new_links])
+        stale.delete()
+        # Bulk operations bypass the model signals
+        portfolio_id = personal_info.portfolio_id
+        invalidate(*cache_keys_for(SocialLink, personal_info))
+        changelog.record(SocialLink, [link.id for link in updated_links], 'updated', portfolio_id=portfolio_id)
+        changelog.record(SocialLink, [link.id for link in new_links], 'created', portfolio_id=portfolio_id)
+        if updated_links or new_links:
+            changelog.record(PersonalInfo, [personal_info.pk], 'updated', portfolio_id=portfolio_id)
+
+    links = sorted(updated_links + new_links, key=lambda link: (link.order, link.platform))
+    # Refresh the prefetch cache so serializing ``personal_info`` does not query again
+    queryset = personal_info.social_links.all()
+    queryset._result_cache = links
+    queryset._prefetch_done = True
+    if not hasattr(personal_info, '_prefetched_objects_cache'):
+        personal_info._prefetched_objects_cache = {}
+    personal_info._prefetched_objects_cache['social_links'] = queryset
+    return links
+
+
+class PersonalInfoSerializer(UploadErrorsMixin, serializers.ModelSerializer):
     """Serializer for PersonalInfo model with social links."""
     profile_image_url = serializers.SerializerMethodField()
     resume_url = serializers.SerializerMethodField()
+    resume_preview_url = serializers.SerializerMethodField()
+    resume_size_display = serializers.SerializerMethodField()
     social_links = SocialLinkSerializer(many=True, required=False)
     
     # Backward compatibility fields
@@ -75,9 +194,12 @@ class PersonalInfoSerializer(serializers.ModelSerializer):
             'social_links',  # New social links
             'profile_image', 'resume',
             'profile_image_url', 'resume_url',
+            'resume_preview_url', 'resume_page_count', 'resume_size', 'resume_size_display',
+            'resume_text', 'resume_status',
             'created_at', 'updated_at',
         ]
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('created_at', 'updated_at', 'resume_page_count', 'resume_size',
+                            'resume_text', 'resume_status')
     
     def get_github_url(self, obj):
         return self._get_social_link_url(obj, 'github')
@@ -110,8 +232,20 @@ class PersonalInfoSerializer(serializers.ModelSerializer):
         return self._get_social_link_url(obj, 'youtube')
 
     def _get_social_link_url(self, obj, platform):
-        social_link = obj.social_links.filter(platform=platform, is_active=True).first()
-        return social_link.url if social_link else ''
+        # Iterate the (prefetched) links instead of running a query per platform
+        for social_link in obj.social_links.all():
+            if social_link.platform == platform and social_link.is_active:
+                return social_link.url
+        return ''
+
+    def create(self, validated_data):
+        # Social links are synchronized separately with sync_social_links()
+        validated_data.pop('social_links', None)
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        validated_data.pop('social_links', None)
+        return super().update(instance, validated_data)
 
     def _abs(self, request, path):
         """Build absolute URL if request present, else return path."""
@@ -136,10 +270,39 @@ class PersonalInfoSerializer(serializers.ModelSerializer):
         static_path = settings.STATIC_URL.rstrip('/') + '/assets/docs/Vishesh_Gupta_Resume.pdf'
         return self._abs(request, static_path)
 
+    def get_resume_preview_url(self, obj):
+        if obj.resume_preview:
+            return self._abs(self.context.get('request'), obj.resume_preview.url)
+        return None
+
+    def get_resume_size_display(self, obj):
+        if obj.resume_size is None:
+            return None
+        return format_file_size(obj.resume_size)
+
+
+class RenderedMixin:
+    """
+    Read technologies and the media URL from the denormalized ``rendered`` column.
+
+    The column is kept current by signals (see ``readmodel``), so serializing a
+    page of rows needs no prefetch query.
+    """
+
+    def _rendered_technologies(self, obj):
+        return obj.rendered.get('technologies', [])
+
+    def _rendered_media_url(self, obj):
+        url = obj.rendered.get('media_url')
+        if url:
+            request = self.context.get('request')
+            return request.build_absolute_uri(url) if request else url
+        return None
+
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(RenderedMixin, UploadErrorsMixin, serializers.ModelSerializer):
     """Serializer for Project model with nested technologies and image URL."""
-    technologies = SkillSerializer(many=True, read_only=True)
+    technologies = serializers.SerializerMethodField()
     project_image_url = serializers.SerializerMethodField()
     
     class Meta:
@@ -147,16 +310,16 @@ class ProjectSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'short_description', 'description', 'image', 'project_image_url', 
                  'github_url', 'live_url', 'technologies', 'featured', 'order', 'created_at', 'updated_at']
     
+    def get_technologies(self, obj):
+        return self._rendered_technologies(obj)
+
     def get_project_image_url(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            return request.build_absolute_uri(obj.image.url) if request else obj.image.url
-        return None
+        return self._rendered_media_url(obj)
 
 
-class ExperienceSerializer(serializers.ModelSerializer):
+class ExperienceSerializer(RenderedMixin, UploadErrorsMixin, serializers.ModelSerializer):
     """Serializer for Experience model with nested technologies."""
-    technologies_used = SkillSerializer(many=True, read_only=True)
+    technologies_used = serializers.SerializerMethodField()
     company_logo_url = serializers.SerializerMethodField()
     
     class Meta:
@@ -164,13 +327,13 @@ class ExperienceSerializer(serializers.ModelSerializer):
         fields = ['id', 'company', 'company_logo', 'company_logo_url', 'position', 'location',
                  'start_date', 'end_date', 'current', 'description', 'achievements', 'technologies_used']
     
+    def get_technologies_used(self, obj):
+        return self._rendered_technologies(obj)
+
     def get_company_logo_url(self, obj):
-        if obj.company_logo:
-            request = self.context.get('request')
-            return request.build_absolute_uri(obj.company_logo.url) if request else obj.company_logo.url
-        return None
+        return self._rendered_media_url(obj)
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(UploadErrorsMixin, serializers.ModelSerializer):
     """Serializer for Education model."""
     institution_logo_url = serializers.SerializerMethodField()
     
@@ -191,5 +354,15 @@ class ContactSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Contact
-        fields = '__all__'
-        read_only_fields = ('created_at', 'read') 
\ No newline at end of file
+        exclude = ['portfolio']
+        read_only_fields = ('created_at', 'read')
+
+
+class ReorderSerializer(serializers.Serializer):
+    """Serializer for bulk reorder requests (IDs in the desired display order)."""
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+    def validate_ids(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("IDs must be unique")
+        return value
@@ -2,13 +2,61 @@
 Signals for the Portfolio API application.
 
 This module contains Django signals that can be used to perform
-actions when certain events occur in the models.
+actions when certain events occur in the models. Cache invalidations
+are routed through ``invalidation.invalidate`` so that bulk edits are
+coalesced into a single flush per transaction, and namespaced to the
+portfolio the changed row belongs to. Reference counts of
+content-addressed media blobs are kept in step with the file fields,
+technology usage statistics are refreshed for the skills a change touches,
+the denormalized ``rendered`` column of projects and experience entries is
+kept in step with their technologies and images (re-rendered once per
+transaction for the skills it edits), and every change
+to the public content is added to the change log behind
+``/api/changes/``.
 """
 
-from django.db.models.signals import post_save, post_delete
+import collections
+import threading
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.core.cache import cache
-from .models import PersonalInfo, Skill, Project, Experience, Education, Contact
+from .constants import CACHE_KEYS
+from .invalidation import invalidate
+from . import changelog, readmodel, tenancy
+from .models import Portfolio, PersonalInfo, Skill, Project, Experience, Education, Contact, SocialLink
+from .storage import adjust_refs, file_fields, file_names
+from .usage import refresh_skill_usage
+
+# Models with FileField/ImageField uploads stored in the blob store
+MEDIA_MODELS = (PersonalInfo, Project, Experience, Education)
+
+# Models whose changes are published through /api/changes/
+CHANGELOG_MODELS = (PersonalInfo, SocialLink, Skill, Project, Experience, Education)
+
+_local = threading.local()
+
+
+def cache_keys_for(model, instance=None):
+    """
+    Return the cache keys that depend on the given model (and instance).
+
+    Keys are namespaced to the instance's portfolio, else to the active one,
+    else (outside a request) to every portfolio.
+    """
+    keys = list(CACHE_KEYS.get(model._meta.model_name, []))
+    if model is Skill and isinstance(instance, Skill):
+        keys.append(f'skills_category_{instance.category}')
+    return tenancy.cache_keys(keys, getattr(instance, 'portfolio_id', None))
+
+
+@receiver(post_save, sender=Portfolio)
+@receiver(post_delete, sender=Portfolio)
+def reload_portfolio_hosts(sender, **kwargs):
+    """
+    Pick up new, renamed or removed portfolio hosts in this process.
+    """
+    tenancy.reset_hosts()
 
 
 @receiver(post_save, sender=PersonalInfo)
@@ -16,7 +64,26 @@ def clear_personal_info_cache(sender, instance, **kwargs):
     """
     Clear cache when PersonalInfo is saved.
     """
-    cache.delete('personal_info_current')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
+
+
+@receiver(post_save, sender=PersonalInfo)
+def schedule_resume_processing(sender, instance, using=None, **kwargs):
+    """
+    Generate the resume preview and metadata once a new resume is committed.
+    """
+    if (instance.resume.name or '') != instance.resume_processed_for:
+        # Imported on use: workers that never see an upload skip its PDF/DOCX tooling
+        from . import resume
+        transaction.on_commit(lambda: resume.enqueue(instance.pk), using=using)
+
+
+@receiver(post_save, sender=SocialLink)
+def clear_social_links_cache(sender, instance, **kwargs):
+    """
+    Clear cache when SocialLink is saved.
+    """
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_save, sender=Skill)
@@ -24,8 +91,7 @@ def clear_skills_cache(sender, instance, **kwargs):
     """
     Clear cache when Skill is saved.
     """
-    cache.delete('skills_all')
-    cache.delete(f'skills_category_{instance.category}')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_save, sender=Project)
@@ -33,8 +99,7 @@ def clear_projects_cache(sender, instance, **kwargs):
     """
     Clear cache when Project is saved.
     """
-    cache.delete('projects_all')
-    cache.delete('projects_featured')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_save, sender=Experience)
@@ -42,7 +107,7 @@ def clear_experience_cache(sender, instance, **kwargs):
     """
     Clear cache when Experience is saved.
     """
-    cache.delete('experience_all')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_save, sender=Education)
@@ -50,7 +115,7 @@ def clear_education_cache(sender, instance, **kwargs):
     """
     Clear cache when Education is saved.
     """
-    cache.delete('education_all')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_save, sender=Contact)
@@ -58,7 +123,236 @@ def clear_contact_cache(sender, instance, **kwargs):
     """
     Clear cache when Contact is saved.
     """
-    cache.delete('contacts_unread_count')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
+
+
+def _technology_ids(instance):
+    """
+    Return the ids of the skills linked to a project or experience entry.
+    """
+    field = 'technologies' if isinstance(instance, Project) else 'technologies_used'
+    return set(getattr(instance, field).values_list('pk', flat=True))
+
+
+def _changed_skill_ids(instance, action, reverse, pk_set):
+    """
+    Return the skills affected by an m2m_changed event on a technologies field.
+    """
+    if action == 'pre_clear':
+        # pk_set is not provided for clear(); remember the current skills
+        if not reverse:
+            instance._cleared_skill_ids = _technology_ids(instance)
+        return None
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return None
+    if reverse:
+        return {instance.pk}
+    if action == 'post_clear':
+        return getattr(instance, '_cleared_skill_ids', set())
+    return pk_set or set()
+
+
+def _changed_owner_ids(sender, owner_field, instance, action, reverse, pk_set):
+    """
+    Return the projects/experience entries affected by an m2m_changed event on a technologies field.
+    """
+    if not reverse:
+        return {instance.pk}
+    if action == 'pre_clear':
+        # Cleared from the skill side: remember which rows lose it
+        instance._cleared_owner_ids = set(
+            sender.objects.filter(skill_id=instance.pk).values_list(owner_field, flat=True)
+        )
+        return None
+    if action == 'post_clear':
+        return getattr(instance, '_cleared_owner_ids', set())
+    return pk_set or set()
+
+
+def _sync_read_model(model, instance, owner_ids, reverse, using):
+    """
+    Re-render the technologies of the rows an m2m_changed event touched.
+    """
+    if reverse:
+        readmodel.sync(model, owner_ids, using=using)
+    else:
+        # Keep the in-memory instance current too
+        readmodel.sync_instance(instance, using=using)
+
+
+@receiver(m2m_changed, sender=Project.technologies.through)
+def project_technologies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Clear cache, refresh usage statistics and log the projects whose technologies changed.
+    """
+    owner_ids = _changed_owner_ids(sender, 'project_id', instance, action, reverse, pk_set)
+    skill_ids = _changed_skill_ids(instance, action, reverse, pk_set)
+    if skill_ids is not None:
+        _sync_read_model(Project, instance, owner_ids, reverse, kwargs.get('using'))
+        refresh_skill_usage(skill_ids, using=kwargs.get('using'))
+        invalidate(*cache_keys_for(Project, instance), using=kwargs.get('using'))
+        changelog.record(Project, owner_ids, 'updated', using=kwargs.get('using'), portfolio_id=instance.portfolio_id)
+
+
+@receiver(m2m_changed, sender=Experience.technologies_used.through)
+def experience_technologies_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Clear cache, refresh usage statistics and log the experience entries whose technologies changed.
+    """
+    owner_ids = _changed_owner_ids(sender, 'experience_id', instance, action, reverse, pk_set)
+    skill_ids = _changed_skill_ids(instance, action, reverse, pk_set)
+    if skill_ids is not None:
+        _sync_read_model(Experience, instance, owner_ids, reverse, kwargs.get('using'))
+        refresh_skill_usage(skill_ids, using=kwargs.get('using'))
+        invalidate(*cache_keys_for(Experience, instance), using=kwargs.get('using'))
+        changelog.record(Experience, owner_ids, 'updated', using=kwargs.get('using'),
+                         portfolio_id=instance.portfolio_id)
+
+
+@receiver(post_save, sender=Experience)
+def refresh_experience_skill_usage(sender, instance, created, **kwargs):
+    """
+    Dates or the current flag may have changed; refresh first/last used of its skills.
+    """
+    if not created:
+        refresh_skill_usage(_technology_ids(instance), using=kwargs.get('using'))
+
+
+@receiver(post_save, sender=Skill)
+def create_skill_usage(sender, instance, created, **kwargs):
+    """
+    Give new skills an (empty) usage row.
+    """
+    if created:
+        refresh_skill_usage([instance.pk], using=kwargs.get('using'))
+
+
+@receiver(pre_delete, sender=Project)
+@receiver(pre_delete, sender=Experience)
+def remember_deleted_skills(sender, instance, **kwargs):
+    """
+    Deleting the row drops its M2M links without m2m_changed; remember its skills.
+    """
+    instance._deleted_skill_ids = _technology_ids(instance)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Experience)
+def refresh_deleted_skill_usage(sender, instance, **kwargs):
+    """
+    Refresh usage statistics of the skills a deleted project/experience used.
+    """
+    refresh_skill_usage(getattr(instance, '_deleted_skill_ids', set()), using=kwargs.get('using'))
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Experience)
+def sync_saved_read_model(sender, instance, created, raw=False, **kwargs):
+    """
+    Store the image URL of a saved project/experience entry (and empty technologies if it is new).
+    """
+    if raw:
+        # Fixtures carry the column; their M2M links are synced through m2m_changed
+        return
+    readmodel.sync_instance(instance, using=kwargs.get('using'), technologies=[] if created else None)
+
+
+@receiver(post_save, sender=Skill)
+def sync_skill_owners_read_model(sender, instance, created, **kwargs):
+    """
+    Re-render the projects and experience entries that show a renamed or edited skill.
+    """
+    if not created:
+        sync_skill_owners([instance.pk], instance.portfolio_id, using=kwargs.get('using'))
+
+
+@receiver(pre_delete, sender=Skill)
+def remember_skill_owners(sender, instance, **kwargs):
+    """
+    Deleting a skill drops its M2M links without m2m_changed; remember who used it.
+    """
+    instance._read_model_owners = readmodel.owners_of([instance.pk], using=kwargs.get('using'))
+
+
+@receiver(post_delete, sender=Skill)
+def sync_deleted_skill_owners(sender, instance, **kwargs):
+    """
+    Drop a deleted skill from the projects and experience entries that showed it.
+    """
+    sync_skill_owners((), instance.portfolio_id, using=kwargs.get('using'),
+                      owners=getattr(instance, '_read_model_owners', {}))
+
+
+class _SkillOwnersBatch:
+    """Skills edited in the current transaction on one connection, by portfolio."""
+
+    def __init__(self, using):
+        self.using = using
+        self.skill_ids = collections.defaultdict(set)
+        self.owners = collections.defaultdict(lambda: collections.defaultdict(set))
+        self.done = False
+
+    def add(self, skill_ids, portfolio_id, owners):
+        self.skill_ids[portfolio_id].update(skill_ids)
+        for model, pks in owners.items():
+            self.owners[portfolio_id][model].update(pks)
+
+    def flush(self):
+        self.done = True
+        for portfolio_id in set(self.skill_ids) | set(self.owners):
+            owners = self.owners[portfolio_id]
+            if self.skill_ids[portfolio_id]:
+                for model, pks in readmodel.owners_of(self.skill_ids[portfolio_id], using=self.using).items():
+                    owners[model].update(pks)
+            _sync_skill_owners(owners, portfolio_id, self.using)
+
+
+def _skill_batches():
+    if not hasattr(_local, 'skill_batches'):
+        _local.skill_batches = {}
+    return _local.skill_batches
+
+
+def _is_registered(batch):
+    # A rollback discards the on_commit callback; see invalidation._is_registered
+    connection = connections[batch.using]
+    return any(func == batch.flush for _, func, _ in connection.run_on_commit)
+
+
+def sync_skill_owners(skill_ids, portfolio_id, using=None, owners=None):
+    """
+    Re-render the projects and experience entries using the given skills once the current transaction commits.
+
+    Like cache invalidations, the skills edited in one transaction (a
+    changelist save, a reorder) are collected per connection and their
+    owners synced once. ``owners`` (``{model: pks}``) adds rows that no
+    longer link to the skills, such as the users of a deleted skill.
+    """
+    using = using or DEFAULT_DB_ALIAS
+    if not connections[using].in_atomic_block:
+        batch = _SkillOwnersBatch(using)
+        batch.add(skill_ids, portfolio_id, owners or {})
+        batch.flush()
+        return
+
+    batches = _skill_batches()
+    batch = batches.get(using)
+    if batch is None or batch.done or not _is_registered(batch):
+        batch = _SkillOwnersBatch(using)
+        batches[using] = batch
+        transaction.on_commit(batch.flush, using=using)
+    batch.add(skill_ids, portfolio_id, owners or {})
+
+
+def _sync_skill_owners(owners, portfolio_id, using):
+    """
+    Re-render the given ``{model: pks}`` rows; the ones that changed are updated for API clients too.
+    """
+    for model, pks in owners.items():
+        stale = readmodel.sync(model, pks, using=using)
+        if stale:
+            invalidate(*tenancy.cache_keys(CACHE_KEYS[model._meta.model_name], portfolio_id), using=using)
+            changelog.record(model, stale, 'updated', using=using, portfolio_id=portfolio_id)
 
 
 @receiver(post_delete, sender=PersonalInfo)
@@ -66,7 +360,15 @@ def clear_personal_info_cache_on_delete(sender, instance, **kwargs):
     """
     Clear cache when PersonalInfo is deleted.
     """
-    cache.delete('personal_info_current')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
+
+
+@receiver(post_delete, sender=SocialLink)
+def clear_social_links_cache_on_delete(sender, instance, **kwargs):
+    """
+    Clear cache when SocialLink is deleted.
+    """
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_delete, sender=Skill)
@@ -74,8 +376,7 @@ def clear_skills_cache_on_delete(sender, instance, **kwargs):
     """
     Clear cache when Skill is deleted.
     """
-    cache.delete('skills_all')
-    cache.delete(f'skills_category_{instance.category}')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_delete, sender=Project)
@@ -83,8 +384,7 @@ def clear_projects_cache_on_delete(sender, instance, **kwargs):
     """
     Clear cache when Project is deleted.
     """
-    cache.delete('projects_all')
-    cache.delete('projects_featured')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_delete, sender=Experience)
@@ -92,7 +392,7 @@ def clear_experience_cache_on_delete(sender, instance, **kwargs):
     """
     Clear cache when Experience is deleted.
     """
-    cache.delete('experience_all')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_delete, sender=Education)
@@ -100,7 +400,7 @@ def clear_education_cache_on_delete(sender, instance, **kwargs):
     """
     Clear cache when Education is deleted.
     """
-    cache.delete('education_all')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
 
 
 @receiver(post_delete, sender=Contact)
@@ -108,5 +408,66 @@ def clear_contact_cache_on_delete(sender, instance, **kwargs):
     """
     Clear cache when Contact is deleted.
     """
-    cache.delete('contacts_unread_count')
+    invalidate(*cache_keys_for(sender, instance), using=kwargs.get('using'))
+
+
+
+def remember_media_names(sender, instance, raw=False, using=None, **kwargs):
+    """
+    Remember which files a row referenced before it is saved.
+    """
+    previous = {}
+    if instance.pk is not None and not instance._state.adding:
+        previous = sender._base_manager.using(using).filter(pk=instance.pk).values(*file_fields(sender)).first() or {}
+    instance._previous_media_names = previous
+
+
+def update_media_refs(sender, instance, created=False, using=None, **kwargs):
+    """
+    Move blob references from the files a row used to point at to its current ones.
+    """
+    previous = getattr(instance, '_previous_media_names', {})
+    current = file_names(instance)
+    added = [name for field, name in current.items() if name != previous.get(field)]
+    removed = [name for field, name in previous.items() if name and name != current.get(field)]
+    adjust_refs(added, 1, using=using)
+    adjust_refs(removed, -1, using=using)
+    instance._previous_media_names = current
+
+
+def release_media_refs(sender, instance, using=None, **kwargs):
+    """
+    Drop the blob references of a deleted row.
+    """
+    adjust_refs(file_names(instance).values(), -1, using=using)
+
+
+for _model in MEDIA_MODELS:
+    pre_save.connect(remember_media_names, sender=_model, dispatch_uid=f'media_refs_pre_save_{_model.__name__}')
+    post_save.connect(update_media_refs, sender=_model, dispatch_uid=f'media_refs_post_save_{_model.__name__}')
+    post_delete.connect(release_media_refs, sender=_model, dispatch_uid=f'media_refs_delete_{_model.__name__}')
+
+
+def log_saved_object(sender, instance, created=False, using=None, **kwargs):
+    """
+    Add a saved object to the change log; a social link also changes its PersonalInfo.
+    """
+    portfolio_id = instance.portfolio_id
+    changelog.record(sender, [instance.pk], 'created' if created else 'updated', using=using, portfolio_id=portfolio_id)
+    if sender is SocialLink:
+        changelog.record(PersonalInfo, [instance.personal_info_id], 'updated', using=using, portfolio_id=portfolio_id)
+
+
+def log_deleted_object(sender, instance, using=None, **kwargs):
+    """
+    Add a deleted object to the change log.
+    """
+    portfolio_id = instance.portfolio_id
+    changelog.record(sender, [instance.pk], 'deleted', using=using, portfolio_id=portfolio_id)
+    if sender is SocialLink:
+        changelog.record(PersonalInfo, [instance.personal_info_id], 'updated', using=using, portfolio_id=portfolio_id)
+
 
+for _model in CHANGELOG_MODELS:
+    post_save.connect(log_saved_object, sender=_model, dispatch_uid=f'changelog_save_{_model.__name__}')
+    post_delete.connect(log_deleted_object, sender=_model, dispatch_uid=f'changelog_delete_{_model.__name__}')
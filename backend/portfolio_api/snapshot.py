@@ -0,0 +1,122 @@
+"""
+Server-rendered entry page for the frontend.
+
+``render_index`` takes the built ``index.html`` of the React app and inlines
+everything the pages request on first load: personal info, grouped skills,
+the first page of projects and the timeline. It goes into a
+``<script id="portfolio-data" type="application/json">`` tag, keyed by API
+path, and ``frontend/src/api.js`` answers those GET requests from it, so
+first paint needs no API round trip. A ``<link rel="preload">`` for the
+profile image lets the browser fetch it while the bundle is still loading.
+
+Rendered pages are cached under ``index_page`` of their portfolio
+(invalidated by the same signals as the API caches) together with their ETag.
+"""
+
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.urls import reverse
+from rest_framework.settings import api_settings
+
+from .constants import INDEX_PAGE_CACHE_KEY
+from .models import PersonalInfo, Project
+from .serializers import PersonalInfoSerializer, ProjectSerializer
+from .tenancy import cache_key
+from .timeline import absolute_logo_urls, cached_timeline, seconds_until_next_month
+from .usage import grouped_skills
+
+# (path, mtime, part before </head>, rest) of the last index.html read
+_document = None
+
+
+def _frontend_document():
+    """Return the built index.html split at ``</head>``, or None if there is no build."""
+    global _document
+    path = settings.FRONTEND_INDEX_FILE
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    if _document is None or _document[:2] != (path, mtime):
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        split = html.find('</head>')
+        if split < 0:
+            split = 0
+        _document = (path, mtime, html[:split], html[split:])
+    return _document
+
+
+def build_snapshot(request):
+    """
+    Collect the payloads of the API requests the frontend makes on load.
+
+    Returns:
+        dict: API path (relative to ``/api``) to the response body it would return
+    """
+    context = {'request': request}
+    snapshot = {}
+
+    info = PersonalInfo.objects.prefetch_related('social_links').first()
+    if info is not None:
+        snapshot['/personal-info/'] = PersonalInfoSerializer(info, context=context).data
+
+    snapshot['/skills/grouped/'] = grouped_skills()
+
+    # First page in the shape PageNumberPagination would return
+    page_size = api_settings.PAGE_SIZE
+    projects = Project.objects.all()
+    count = projects.count()
+    snapshot['/projects/'] = {
+        'count': count,
+        'next': request.build_absolute_uri(f"{reverse('project-list')}?page=2") if count > page_size else None,
+        'previous': None,
+        'results': ProjectSerializer(projects[:page_size], many=True, context=context).data,
+    }
+
+    snapshot['/timeline/'] = absolute_logo_urls(cached_timeline(), request)
+    return snapshot
+
+
+def render_index(request):
+    """
+    Render the frontend entry page with the embedded snapshot.
+
+    Pages are cached per origin, since the embedded media URLs are absolute.
+
+    Returns:
+        dict | None: ``html`` and ``etag``, or None if the frontend has not been built
+    """
+    document = _frontend_document()
+    if document is None:
+        return None
+    _, mtime, head, tail = document
+
+    origin = request.build_absolute_uri('/')
+    key = cache_key(INDEX_PAGE_CACHE_KEY)
+    pages = cache.get(key) or {}
+    page = pages.get(origin)
+    if page is not None and page['build'] == mtime:
+        return page
+
+    snapshot = build_snapshot(request)
+    info = snapshot.get('/personal-info/') or {}
+    html = render_to_string('index.html', {
+        'document_head': head,
+        'document_tail': tail,
+        'snapshot': snapshot,
+        'profile_image_url': info.get('profile_image_url'),
+    })
+    page = {
+        'html': html,
+        'etag': f'"{hashlib.sha256(html.encode()).hexdigest()[:32]}"',
+        'build': mtime,
+    }
+    pages[origin] = page
+    # Like the timeline, expire with the month so ongoing durations stay right
+    cache.set(key, pages, min(settings.CACHE_TTL, seconds_until_next_month()))
+    return page
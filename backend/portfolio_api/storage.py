@@ -0,0 +1,131 @@
+"""
+Content-addressed storage for uploaded media.
+
+Uploads are hashed (SHA-256) while they are streamed to a temporary file
+(uploads.StreamingUploadHandler already does this for form uploads) and then
+stored as ``cas/<first two hex digits>/<sha256><ext>``. A second upload
+of the same bytes reuses the existing file, so each blob is stored once, and
+since a name always refers to the same content it can be served with a
+far-future ``Cache-Control: immutable`` header.
+
+Every stored blob has a ``MediaBlob`` row whose ``ref_count`` is maintained
+by the signals in ``signals.py``. ``manage.py gc_media`` removes blobs that
+are no longer referenced and ``manage.py adopt_media`` moves files uploaded
+before this storage existed into it.
+"""
+
+import collections
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db.models import F, FileField
+
+from .constants import MEDIA_BLOB_PREFIX, MEDIA_INCOMING_DIR
+
+
+def blob_name(digest, ext=''):
+    """
+    Return the storage name for a blob.
+
+    Args:
+        digest (str): Hex SHA-256 of the content
+        ext (str): File extension including the dot, e.g. ``.png``
+
+    Returns:
+        str: ``cas/ab/ab12...ef.png``
+    """
+    return f'{MEDIA_BLOB_PREFIX}/{digest[:2]}/{digest}{ext.lower()}'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """``FileSystemStorage`` that names files after the SHA-256 of their content."""
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is chosen from the content in _save; identical
+        # content must map to the same name rather than get a suffix.
+        return name
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        if getattr(content, 'sha256', None) and hasattr(content, 'temporary_file_path'):
+            # Already hashed by StreamingUploadHandler and on disk: just move it
+            return self._store(content.temporary_file_path(), content.sha256, content.size, ext, move=True)
+
+        incoming = self.path(MEDIA_INCOMING_DIR)
+        os.makedirs(incoming, exist_ok=True)
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=incoming)
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        try:
+            return self._store(tmp_path, digest.hexdigest(), size, ext, move=False)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _store(self, source_path, digest, size, ext, move):
+        """Put ``source_path`` at its blob name unless that blob already exists."""
+        name = blob_name(digest, ext)
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            # Mark the blob as recently used so gc_media keeps it
+            os.utime(full_path)
+        else:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            if move:
+                file_move_safe(source_path, full_path, allow_overwrite=True)
+            else:
+                os.replace(source_path, full_path)
+            os.chmod(full_path, self.file_permissions_mode or 0o644)
+
+        MediaBlob = apps.get_model('portfolio_api', 'MediaBlob')
+        MediaBlob.objects.get_or_create(name=name, defaults={'sha256': digest, 'size': size})
+        return name
+
+
+_storage = ContentAddressedStorage()
+
+
+def media_storage():
+    """Storage callable used by the model file fields."""
+    return _storage
+
+
+def file_fields(model):
+    """Return the FileField/ImageField names of a model."""
+    return [field.name for field in model._meta.get_fields() if isinstance(field, FileField)]
+
+
+def file_names(instance):
+    """Return ``{field name: stored file name}`` for a model instance."""
+    return {name: getattr(instance, name).name or '' for name in file_fields(type(instance))}
+
+
+def adjust_refs(names, delta, using=None):
+    """
+    Add ``delta`` to the reference count of the given blob names.
+
+    Names without a ``MediaBlob`` row (files outside the blob store) are ignored.
+    """
+    # One UPDATE per distinct multiplicity (usually just one)
+    by_count = collections.defaultdict(list)
+    for name, count in collections.Counter(name for name in names if name).items():
+        by_count[count].append(name)
+    MediaBlob = apps.get_model('portfolio_api', 'MediaBlob')
+    for count, group in by_count.items():
+        MediaBlob.objects.using(using).filter(name__in=group).update(ref_count=F('ref_count') + delta * count)
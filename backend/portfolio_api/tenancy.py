@@ -0,0 +1,183 @@
+"""
+Multi-tenant hosting: many portfolios served by one deployment.
+
+Every piece of content (personal info, social links, skills, projects,
+experience, education, contact messages and the change log) belongs to a
+``Portfolio``. ``PortfolioMiddleware`` picks the portfolio from the Host
+header, after Django has validated it against ``ALLOWED_HOSTS``, and
+activates it for the rest of the request:
+
+* the default managers of the content models (``PortfolioManager``) only
+  return rows of the active portfolio, so views, serializers, the admin
+  and the helper modules are scoped without passing the portfolio around.
+  Outside a request (management commands, background threads) nothing is
+  active and the managers return every row;
+* new rows are assigned to the active portfolio, or to the default one;
+* cache keys are namespaced per portfolio (``cache_key``), and signal
+  receivers invalidate the keys of the portfolio the changed row belongs to.
+* staff users manage only the portfolios they are members of
+  (``Portfolio.members``, checked by ``can_manage``) in the admin and the
+  reorder endpoint; superusers manage every portfolio.
+
+A portfolio with a blank host is the default: it answers every allowed host
+that no other portfolio claims. Host lookups are served from a per-process
+map that is reloaded every ``PORTFOLIO_HOSTS_TTL`` seconds and whenever a
+portfolio is saved in this process.
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.http import Http404
+from django.http.request import split_domain_port
+
+_active = contextvars.ContextVar('portfolio_id', default=None)
+
+# {host: portfolio id} of active portfolios, and when it was loaded
+_hosts = None
+_hosts_loaded = 0.0
+_hosts_lock = threading.Lock()
+
+
+def current_portfolio_id():
+    """Return the id of the portfolio active in this context, or None."""
+    return _active.get()
+
+
+@contextlib.contextmanager
+def activate(portfolio_id):
+    """Scope queries, new rows and cache keys to a portfolio inside the block."""
+    token = _active.set(portfolio_id)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def _host_map():
+    global _hosts, _hosts_loaded
+    hosts = _hosts
+    if hosts is None or time.monotonic() - _hosts_loaded > settings.PORTFOLIO_HOSTS_TTL:
+        with _hosts_lock:
+            Portfolio = apps.get_model('portfolio_api', 'Portfolio')
+            hosts = dict(Portfolio.objects.filter(is_active=True).values_list('host', 'id'))
+            _hosts, _hosts_loaded = hosts, time.monotonic()
+    return hosts
+
+
+def reset_hosts():
+    """Forget the host map so the next lookup reloads it."""
+    global _hosts
+    _hosts = None
+
+
+def portfolio_for_host(host):
+    """
+    Return the id of the portfolio served on a host.
+
+    Args:
+        host (str): Host header value, optionally with a port
+
+    Returns:
+        int | None: The portfolio claiming the host, else the default portfolio, else None
+    """
+    domain, _ = split_domain_port(host)
+    hosts = _host_map()
+    return hosts.get(domain.lower(), hosts.get(''))
+
+
+def default_portfolio_id():
+    """Return the id of the default (blank host) portfolio, or None."""
+    return _host_map().get('')
+
+
+def portfolio_id_for_writes():
+    """
+    Return the portfolio new rows belong to: the active one, else the default one.
+
+    Raises:
+        ValueError: If neither exists
+    """
+    portfolio_id = current_portfolio_id() or default_portfolio_id()
+    if portfolio_id is None:
+        raise ValueError('No portfolio is active and there is no default portfolio')
+    return portfolio_id
+
+
+def cache_key(key, portfolio_id=None):
+    """Return ``key`` namespaced to a portfolio (by default the active or default one)."""
+    if portfolio_id is None:
+        portfolio_id = current_portfolio_id() or default_portfolio_id()
+    return f'p{portfolio_id}:{key}'
+
+
+def cache_keys(keys, portfolio_id=None):
+    """
+    Namespace cache keys for invalidation.
+
+    With no portfolio given and none active (management commands), the keys
+    of every portfolio are returned.
+    """
+    if portfolio_id is None:
+        portfolio_id = current_portfolio_id()
+    if portfolio_id is not None:
+        return [cache_key(key, portfolio_id) for key in keys]
+    Portfolio = apps.get_model('portfolio_api', 'Portfolio')
+    return [cache_key(key, pk) for pk in Portfolio.objects.values_list('pk', flat=True) for key in keys]
+
+
+def can_manage(user, portfolio_id):
+    """
+    Return True if a user may manage the content of a portfolio.
+
+    Superusers manage every portfolio, other active staff users the ones
+    they are members of. Memberships are read once per user object, i.e.
+    once per request.
+    """
+    if user is None or not (user.is_active and user.is_staff):
+        return False
+    if user.is_superuser:
+        return True
+    if portfolio_id is None:
+        return False
+    managed = getattr(user, '_managed_portfolio_ids', None)
+    if managed is None:
+        managed = user._managed_portfolio_ids = set(user.portfolios.values_list('pk', flat=True))
+    return portfolio_id in managed
+
+
+class PortfolioManager(models.Manager):
+    """Manager that only returns rows of the active portfolio, if one is active."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        portfolio_id = _active.get()
+        if portfolio_id is not None:
+            queryset = queryset.filter(portfolio_id=portfolio_id)
+        return queryset
+
+
+class PortfolioMiddleware:
+    """
+    Activate the portfolio served on the request's host.
+
+    ``request.get_host()`` raises ``DisallowedHost`` for hosts missing from
+    ``ALLOWED_HOSTS``; an allowed host without a portfolio (and no default
+    portfolio) is a 404.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        portfolio_id = portfolio_for_host(request.get_host())
+        if portfolio_id is None:
+            raise Http404('No portfolio is served on this host')
+        request.portfolio_id = portfolio_id
+        with activate(portfolio_id):
+            return self.get_response(request)
@@ -0,0 +1,68 @@
+"""
+Shared setup for the Portfolio API tests.
+"""
+
+import shutil
+import tempfile
+from datetime import date
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from portfolio_api import tenancy
+from portfolio_api.models import Experience, PersonalInfo, Portfolio, Project, Skill
+
+
+class PortfolioTestCase(TestCase):
+    """
+    TestCase with a clean cache and host map, and the default portfolio at hand.
+
+    The cache and the host -> portfolio map live in the process, so they
+    outlast the transaction each test is rolled back in.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        tenancy.reset_hosts()
+        self.addCleanup(tenancy.reset_hosts)
+        self.portfolio = Portfolio.objects.get(host='')
+
+    def use_temporary_media(self):
+        """Point MEDIA_ROOT at a directory that is removed after the test; returns its path."""
+        media_root = tempfile.mkdtemp(prefix='portfolio-media-')
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        return media_root
+
+
+def create_skill(name, category='programming', order=0, **kwargs):
+    return Skill.objects.create(name=name, category=category, order=order, **kwargs)
+
+
+def create_project(title, technologies=(), **kwargs):
+    kwargs.setdefault('description', f'{title} description')
+    kwargs.setdefault('short_description', f'{title} summary')
+    project = Project.objects.create(title=title, **kwargs)
+    if technologies:
+        project.technologies.add(*technologies)
+    return project
+
+
+def create_experience(company, start_date=date(2020, 1, 1), technologies=(), **kwargs):
+    kwargs.setdefault('position', 'Engineer')
+    kwargs.setdefault('description', f'Work at {company}')
+    experience = Experience.objects.create(company=company, start_date=start_date, **kwargs)
+    if technologies:
+        experience.technologies_used.add(*technologies)
+    return experience
+
+
+def create_personal_info(**kwargs):
+    kwargs.setdefault('name', 'Ada Lovelace')
+    kwargs.setdefault('title', 'Engineer')
+    kwargs.setdefault('bio', 'Writes programs.')
+    kwargs.setdefault('email', 'ada@example.com')
+    return PersonalInfo.objects.create(**kwargs)
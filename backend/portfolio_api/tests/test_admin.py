@@ -0,0 +1,134 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from portfolio_api.admin_utils import EstimatedCountPaginator
+from portfolio_api.models import (
+    Contact, Education, MediaBlob, PersonalInfo, Portfolio, ProfileRecord, Project, Skill, SocialLink,
+)
+
+from .base import PortfolioTestCase, create_experience, create_personal_info, create_project, create_skill
+
+
+def _social_link(i):
+    info = PersonalInfo.objects.first() or create_personal_info()
+    SocialLink.objects.create(personal_info=info, platform='website', url=f'https://{i}.example.com')
+
+
+# Changelists using EstimatedCountPaginator -> function adding their i-th row
+CHANGELIST_ROWS = {
+    'portfolio': lambda i: Portfolio.objects.create(name=f'Portfolio {i}', host=f'p{i}.test'),
+    'sociallink': _social_link,
+    'skill': lambda i: create_skill(f'Skill {i}'),
+    'project': lambda i: create_project(f'Project {i}', technologies=[create_skill(f'Tech {i}')]),
+    'experience': lambda i: create_experience(f'Company {i}', technologies=[create_skill(f'Tool {i}')]),
+    'education': lambda i: Education.objects.create(
+        institution=f'School {i}', degree='BSc', field_of_study='CS', start_date=date(2010, 9, 1)),
+    'contact': lambda i: Contact.objects.create(
+        name=f'Visitor {i}', email='visitor@example.com', subject='Hi', message='Hello'),
+    'profilerecord': lambda i: ProfileRecord.objects.create(
+        path='/api/skills/', method='GET', status_code=200, mode='sample', trigger='random', duration_ms=12.5),
+    'mediablob': lambda i: MediaBlob.objects.create(
+        name=f'cas/ab/{i:064d}.png', sha256=f'{i:064d}', size=10, ref_count=1),
+}
+
+
+@mock.patch('portfolio_api.admin_utils.ADMIN_COUNT_LIMIT', 3)
+class EstimatedCountPaginatorTests(PortfolioTestCase):
+
+    def test_small_results_are_counted_with_one_bounded_query(self):
+        for i in range(2):
+            create_skill(f'Skill {i}')
+        paginator = EstimatedCountPaginator(Skill.objects.order_by('pk'), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 2)
+
+    def test_every_page_is_reachable_past_the_limit(self):
+        skills = [create_skill(f'Skill {i}') for i in range(7)]
+        paginator = EstimatedCountPaginator(Skill.objects.order_by('pk'), 2)
+        self.assertEqual(paginator.count, 7)
+        self.assertEqual(paginator.num_pages, 4)
+        self.assertEqual(list(paginator.page(4)), skills[6:])
+
+        filtered = EstimatedCountPaginator(Skill.objects.filter(name__endswith='1').order_by('pk'), 2)
+        self.assertEqual(filtered.count, 1)
+
+
+@mock.patch('portfolio_api.admin_utils.ADMIN_COUNT_LIMIT', 3)
+class ChangelistQueryTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(user)
+
+    def warm_up(self, url):
+        # Fills the filter caches and the host map
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_changelist_queries_do_not_grow_with_the_rows(self):
+        for model_name, add_row in CHANGELIST_ROWS.items():
+            with self.subTest(changelist=model_name):
+                url = reverse(f'admin:portfolio_api_{model_name}_changelist')
+                for i in range(4):
+                    add_row(i)
+                self.warm_up(url)
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get(url)
+                expected = len(queries)  # the next request resets the query log
+
+                for i in range(4, 10):
+                    add_row(i)
+                self.warm_up(url)
+                with self.assertNumQueries(expected):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+
+class ChangelistFilterCacheTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_project('Portfolio', technologies=[create_skill('Python')])
+            create_experience('Acme')
+            Education.objects.create(institution='MIT', degree='BSc', field_of_study='CS',
+                                     start_date=date(2010, 9, 1))
+
+    def queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return [query['sql'] for query in queries.captured_queries]
+
+    def test_filter_choices_are_queried_once_until_content_changes(self):
+        changes = {
+            'project': lambda: create_skill('Rust'),
+            'experience': lambda: create_experience('Initech'),
+            'education': lambda: Education.objects.create(
+                institution='ETH', degree='MSc', field_of_study='CS', start_date=date(2014, 9, 1)),
+        }
+        for model_name, change in changes.items():
+            with self.subTest(changelist=model_name):
+                url = reverse(f'admin:portfolio_api_{model_name}_changelist')
+                self.queries(url)
+                cached = len(self.queries(url))
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    change()
+                self.assertEqual(len(self.queries(url)), cached + 1)
+                self.assertEqual(len(self.queries(url)), cached)
+
+    def test_project_technologies_are_prefetched_in_one_query(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                create_project(f'Project {i}', technologies=[create_skill(f'Tech {i}'), create_skill(f'Lib {i}')])
+        url = reverse('admin:portfolio_api_project_changelist')
+        self.queries(url)
+        through = Project.technologies.through._meta.db_table
+        self.assertEqual(sum(through in sql for sql in self.queries(url)), 1)
@@ -0,0 +1,35 @@
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+from portfolio_api.management.commands import bench_sqlite
+from portfolio_api.models import Contact
+
+from .base import PortfolioTestCase
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite only')
+class BenchSQLiteTests(PortfolioTestCase):
+
+    def bench(self):
+        out = StringIO()
+        call_command('bench_sqlite', readers=1, writers=1, duration=0.2, stdout=out)
+        return out.getvalue()
+
+    def test_writers_insert_into_a_portfolio(self):
+        output = self.bench()
+        rows = {line.split()[0]: line.split() for line in output.splitlines() if line.startswith(('default', 'perf'))}
+        self.assertEqual(set(rows), {'default', 'performance'})
+        for columns in rows.values():
+            self.assertGreater(float(columns[4]), 0)  # writes/s
+        # The benchmark runs on copies
+        self.assertFalse(Contact.objects.exists())
+
+    def test_thread_errors_fail_the_command(self):
+        broken = bench_sqlite.WRITE_QUERY.replace('portfolio_id, ', '').replace('?, ?, ?, ?, ?, ?', '?, ?, ?, ?, ?')
+        with mock.patch.object(bench_sqlite, 'WRITE_QUERY', broken):
+            with self.assertRaisesMessage(CommandError, 'benchmark thread(s) failed'):
+                self.bench()
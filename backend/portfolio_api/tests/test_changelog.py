@@ -0,0 +1,102 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from portfolio_api.changelog import decode_token, encode_token
+from portfolio_api.models import ChangeLogEntry, Project
+
+from .base import PortfolioTestCase, create_project, create_skill
+
+
+@override_settings(CHANGELOG_SETTLE_SECONDS=0)
+class ChangeLogTests(PortfolioTestCase):
+
+    def changes(self, since=None):
+        params = {'since': since} if since else {}
+        response = self.client.get('/api/changes/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_tokens_round_trip(self):
+        self.assertEqual(decode_token(encode_token(0)), 0)
+        self.assertEqual(decode_token(encode_token(12345)), 12345)
+        for token in ('', 'not base64!', encode_token(1)[:-1] + '*', 'YzI6MQ'):
+            with self.assertRaises(ValueError):
+                decode_token(token)
+
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get('/api/changes/', {'since': 'garbage'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_changes_are_collapsed_per_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                project = create_project('Draft')
+                project.title = 'Published'
+                project.save()
+                doomed = create_project('Doomed')
+                doomed.delete()
+
+        entries = list(ChangeLogEntry.objects.values_list('model', 'object_id', 'action'))
+        self.assertEqual(entries, [('project', project.pk, 'created')])
+
+    def test_feed_resumes_from_a_token(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = create_skill('Python')
+        first = self.changes()
+        self.assertEqual([(c['model'], c['id'], c['action']) for c in first['changes']],
+                         [('skill', skill.pk, 'created')])
+        self.assertEqual(first['changes'][0]['data']['name'], 'Python')
+        self.assertFalse(first['has_more'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project = create_project('Portfolio')
+        skill_id = skill.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.delete()
+        second = self.changes(first['next'])
+        self.assertEqual([(c['model'], c['id'], c['action']) for c in second['changes']],
+                         [('project', project.pk, 'created'), ('skill', skill_id, 'deleted')])
+        self.assertIsNone(second['changes'][1]['data'])
+
+        self.assertEqual(self.changes(second['next'])['changes'], [])
+
+    def test_unsettled_entries_are_held_back(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            create_skill('Python')
+        with override_settings(CHANGELOG_SETTLE_SECONDS=60):
+            self.assertEqual(self.changes()['changes'], [])
+
+    def test_compaction_keeps_the_latest_entry_and_tokens_stay_valid(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = create_project('Portfolio')
+        token = self.changes()['next']
+        for title in ('Portfolio v2', 'Portfolio v3'):
+            with self.captureOnCommitCallbacks(execute=True):
+                project.title = title
+                project.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            other = create_project('Other')
+        ChangeLogEntry.objects.update(created_at=timezone.now() - timedelta(days=30))
+
+        call_command('compact_changelog', stdout=StringIO())
+
+        entries = list(ChangeLogEntry.objects.values_list('model', 'object_id', 'action'))
+        self.assertEqual(entries, [('project', project.pk, 'updated'), ('project', other.pk, 'created')])
+        feed = self.changes(token)
+        self.assertEqual([(c['id'], c['action']) for c in feed['changes']],
+                         [(project.pk, 'updated'), (other.pk, 'created')])
+        self.assertEqual(feed['changes'][0]['data']['title'], 'Portfolio v3')
+
+    def test_recent_entries_are_not_compacted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = create_project('Portfolio')
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.filter(pk=project.pk).first().save()
+
+        call_command('compact_changelog', stdout=StringIO())
+        self.assertEqual(ChangeLogEntry.objects.count(), 2)
@@ -0,0 +1,34 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from .base import PortfolioTestCase, create_experience, create_project, create_skill
+
+AWKWARD = 'Quotes " \\ tabs\t newlines\n, café, 日本語, 🚀, separator   and \x01'
+
+
+class DatabaseJSONTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        python = create_skill('Python', description=AWKWARD)
+        create_project(f'Project {AWKWARD}', technologies=[python], image='projects/shot.png', featured=True)
+        create_project('Plain')
+        create_experience(AWKWARD, technologies=[python], company_logo='company_logos/logo.png', current=True)
+
+    def test_verify_command_finds_identical_bytes(self):
+        out = StringIO()
+        call_command('verify_db_json', rows=5, repeat=1, stdout=out)
+        self.assertIn('byte for byte', out.getvalue())
+
+    def test_list_endpoints_match_the_serializers(self):
+        for path in ('/api/projects/', '/api/experience/', '/api/projects/?featured=true'):
+            with self.subTest(path=path):
+                with override_settings(API_DB_JSON=False):
+                    expected = self.client.get(path)
+                with override_settings(API_DB_JSON=True):
+                    actual = self.client.get(path)
+                self.assertEqual(actual.status_code, 200)
+                self.assertTrue(actual.streaming)
+                self.assertEqual(b''.join(actual.streaming_content), expected.content)
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from portfolio_api.events import _client_address, _read_changes
+from portfolio_api.models import ChangeLogEntry
+
+from .base import PortfolioTestCase
+
+
+@override_settings(CHANGELOG_SETTLE_SECONDS=1)
+class ReadChangesTests(PortfolioTestCase):
+
+    def entry(self, entry_id, model, age=0):
+        ChangeLogEntry.objects.create(id=entry_id, model=model, object_id=1, action='updated',
+                                      portfolio=self.portfolio)
+        ChangeLogEntry.objects.filter(id=entry_id).update(created_at=timezone.now() - timedelta(seconds=age))
+
+    def test_the_end_of_the_log_is_the_last_settled_entry(self):
+        self.entry(10, 'skill', age=5)
+        self.entry(11, 'project')
+        self.assertEqual(_read_changes(None), (10, [], True))
+
+    def test_entries_committed_out_of_order_are_not_skipped(self):
+        # 11 commits first; 10 belongs to a slower transaction still in flight
+        self.entry(11, 'project')
+        self.assertEqual(_read_changes(0), (0, [], True))
+
+        self.entry(10, 'skill')
+        ChangeLogEntry.objects.update(created_at=timezone.now() - timedelta(seconds=5))
+        position, changes, complete = _read_changes(0)
+        self.assertEqual(position, 11)
+        self.assertEqual(changes, [(10, self.portfolio.pk, 'skill'), (11, self.portfolio.pk, 'project')])
+        self.assertTrue(complete)
+
+
+@override_settings(SSE_TRUSTED_PROXIES=['127.0.0.1'])
+class ClientAddressTests(SimpleTestCase):
+
+    def test_forwarded_address_is_used_behind_a_trusted_proxy(self):
+        scope = {'client': ('127.0.0.1', 5000)}
+        headers = {'x-forwarded-for': '10.0.0.1, 203.0.113.7'}
+        self.assertEqual(_client_address(scope, headers), '203.0.113.7')
+        self.assertEqual(_client_address(scope, {}), '127.0.0.1')
+
+    def test_forwarded_address_is_ignored_from_other_peers(self):
+        scope = {'client': ('198.51.100.2', 5000)}
+        self.assertEqual(_client_address(scope, {'x-forwarded-for': '203.0.113.7'}), '198.51.100.2')
+        self.assertEqual(_client_address({}, {}), 'unknown')
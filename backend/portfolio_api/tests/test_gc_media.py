@@ -0,0 +1,137 @@
+import os
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from portfolio_api.management.commands import gc_media
+from portfolio_api.models import MediaBlob, Project
+from portfolio_api.storage import adjust_refs
+
+from .base import PortfolioTestCase, create_project
+
+OLD = time.time() - 48 * 3600
+
+
+class GarbageCollectMediaTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = self.use_temporary_media()
+
+    def blob(self, digest, ref_count=0, tracked=True):
+        """Write an old blob file (and its MediaBlob row); returns its name."""
+        name = f'cas/{digest[:2]}/{digest}.png'
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'png')
+        os.utime(path, (OLD, OLD))
+        if tracked:
+            MediaBlob.objects.create(name=name, sha256=digest, size=3, ref_count=ref_count)
+            MediaBlob.objects.filter(name=name).update(created_at=timezone.now() - timedelta(days=2))
+        return name
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.media_root, name))
+
+    def gc(self, *args):
+        call_command('gc_media', *args, grace_hours=1, stdout=StringIO())
+
+    def during_first_batch(self, action):
+        """Run ``action`` right after the first batch of the first pass is listed."""
+        batches = gc_media._batches
+        calls = []
+
+        def patched(iterable, size=gc_media.BATCH_SIZE):
+            for batch in batches(iterable, size):
+                if not calls:
+                    calls.append(batch)
+                    action()
+                yield batch
+        return mock.patch.object(gc_media, '_batches', patched)
+
+    def test_unreferenced_blobs_are_removed(self):
+        unused = self.blob('aa' * 32)
+        used = self.blob('bb' * 32)
+        create_project('Portfolio', image=used)
+
+        self.gc()
+
+        self.assertFalse(self.exists(unused))
+        self.assertFalse(MediaBlob.objects.filter(name=unused).exists())
+        self.assertTrue(self.exists(used))
+        self.assertEqual(MediaBlob.objects.get(name=used).ref_count, 1)
+
+    def test_dry_run_changes_nothing(self):
+        unused = self.blob('aa' * 32)
+        self.gc('--dry-run')
+        self.assertTrue(self.exists(unused))
+        self.assertTrue(MediaBlob.objects.filter(name=unused).exists())
+
+    def test_blobs_referenced_during_the_run_are_kept(self):
+        kept = self.blob('aa' * 32)
+        removed = self.blob('bb' * 32)
+
+        with self.during_first_batch(lambda: create_project('Portfolio', image=kept)):
+            self.gc()
+
+        self.assertTrue(self.exists(kept))
+        self.assertEqual(MediaBlob.objects.get(name=kept).ref_count, 1)
+        self.assertFalse(self.exists(removed))
+
+    def test_blobs_named_by_a_model_field_are_kept_whatever_their_count(self):
+        name = self.blob('aa' * 32)
+        project = create_project('Portfolio', image=name)
+        MediaBlob.objects.filter(name=name).update(ref_count=0)
+
+        self.gc()
+
+        self.assertTrue(self.exists(name))
+        self.assertTrue(MediaBlob.objects.filter(name=name).exists())
+        self.assertEqual(Project.objects.get(pk=project.pk).image.name, name)
+
+    def test_recently_touched_blobs_are_kept_with_their_row(self):
+        name = self.blob('aa' * 32)
+        os.utime(os.path.join(self.media_root, name))
+        self.gc()
+        self.assertTrue(self.exists(name))
+        self.assertTrue(MediaBlob.objects.filter(name=name).exists())
+
+    def test_untracked_files_are_removed_unless_referenced(self):
+        orphan = self.blob('aa' * 32, tracked=False)
+        referenced = self.blob('bb' * 32, tracked=False)
+        create_project('Portfolio', image=referenced)
+
+        self.gc()
+
+        self.assertFalse(self.exists(orphan))
+        self.assertTrue(self.exists(referenced))
+
+    def test_recount_corrects_reference_counts(self):
+        name = self.blob('aa' * 32)
+        create_project('One', image=name)
+        create_project('Two', image=name)
+        unused = self.blob('bb' * 32)
+        MediaBlob.objects.filter(name=name).update(ref_count=7)
+        MediaBlob.objects.filter(name=unused).update(ref_count=3)
+
+        self.gc('--recount')
+
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 2)
+        self.assertFalse(MediaBlob.objects.filter(name=unused).exists())
+        self.assertFalse(self.exists(unused))
+
+    def test_recount_keeps_references_added_while_it_runs(self):
+        name = self.blob('aa' * 32)
+        adjust_refs([name], 5)
+
+        # Listed before the project exists, counted after
+        with self.during_first_batch(lambda: create_project('Portfolio', image=name)):
+            self.gc('--recount')
+
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 1)
+        self.assertTrue(self.exists(name))
@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from portfolio_api import invalidation
+from portfolio_api.invalidation import content_invalidated
+from portfolio_api.models import Skill
+from portfolio_api.tenancy import cache_key
+
+from .base import PortfolioTestCase, create_skill
+
+
+class Rollback(Exception):
+    pass
+
+
+class InvalidationTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        invalidation.reset_stats()
+        self.flushes = []
+        content_invalidated.connect(self._record_flush, dispatch_uid='test_invalidation')
+        self.addCleanup(content_invalidated.disconnect, dispatch_uid='test_invalidation')
+        self.key = cache_key('skills_all', self.portfolio.pk)
+        cache.set(self.key, ['cached'])
+
+    def _record_flush(self, sender, keys, **kwargs):
+        self.flushes.append(keys)
+
+    def test_keys_are_deleted_once_when_the_transaction_commits(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                for i in range(5):
+                    create_skill(f'Skill {i}')
+                self.assertEqual(cache.get(self.key), ['cached'])
+
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(len(self.flushes), 1)
+        self.assertIn(self.key, self.flushes[0])
+        batches = [callback for callback in callbacks
+                   if isinstance(getattr(callback, '__self__', None), invalidation._Batch)]
+        self.assertEqual(len(batches), 1)
+        stats = invalidation.get_stats()
+        self.assertGreater(stats['requested'], stats['flushed'])
+        self.assertGreater(stats['coalescing_ratio'], 1)
+
+    def test_rolled_back_changes_do_not_invalidate(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    create_skill('Rolled back')
+                    raise Rollback
+            except Rollback:
+                pass
+
+        self.assertEqual(cache.get(self.key), ['cached'])
+        self.assertEqual(self.flushes, [])
+        self.assertFalse(Skill.objects.filter(name='Rolled back').exists())
+
+    def test_a_new_batch_starts_after_a_rolled_back_savepoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        create_skill('Rolled back')
+                        raise Rollback
+                except Rollback:
+                    pass
+                create_skill('Kept')
+
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(len(self.flushes), 1)
+
+    def test_keys_are_namespaced_to_the_changed_rows_portfolio(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = create_skill('Python')
+        cache.set(self.key, ['cached'])
+        other_key = cache_key('skills_all', self.portfolio.pk + 1000)
+        cache.set(other_key, ['other'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.name = 'Python 3'
+            skill.save()
+
+        self.assertIsNone(cache.get(self.key))
+        self.assertEqual(cache.get(other_key), ['other'])
@@ -0,0 +1,69 @@
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+
+from backend.log_handlers import SizeAndTimeRotatingFileHandler
+
+
+class SizeAndTimeRotatingFileHandlerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix='portfolio-logs-')
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.filename = os.path.join(self.directory, 'django.log')
+
+    def handler(self, **kwargs):
+        """A handler as configured in one worker process."""
+        handler = SizeAndTimeRotatingFileHandler(self.filename, backup_count=10, **kwargs)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.addCleanup(handler.close)
+        return handler
+
+    def write(self, handler, *messages):
+        for message in messages:
+            handler.handle(logging.makeLogRecord({'msg': message}))
+        handler.flush()
+
+    def lines(self):
+        lines = []
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith('django.log') and not name.endswith('.lock'):
+                with open(os.path.join(self.directory, name)) as f:
+                    lines.extend(f.read().splitlines())
+        return lines
+
+    def test_records_are_written_on_flush(self):
+        handler = self.handler()
+        handler.handle(logging.makeLogRecord({'msg': 'one'}))
+        self.assertFalse(os.path.exists(self.filename))
+        handler.flush()
+        self.assertEqual(self.lines(), ['one'])
+
+    def test_workers_share_the_file_through_rotations(self):
+        workers = [self.handler(max_bytes=40), self.handler(max_bytes=40)]
+        messages = [f'message {i:02d}' for i in range(20)]
+        for i in range(0, len(messages), 2):
+            self.write(workers[i // 2 % 2], *messages[i:i + 2])
+
+        self.assertEqual(sorted(self.lines()), messages)
+        self.assertTrue(os.path.exists(self.filename + '.5'))
+        for name in os.listdir(self.directory):
+            self.assertLessEqual(os.path.getsize(os.path.join(self.directory, name)), 40, name)
+
+    def test_age_is_shared_through_the_lock_file(self):
+        first, second = self.handler(interval=60), self.handler(interval=60)
+        self.write(first, 'old')
+        past = time.time() - 120
+        os.utime(first.lock_filename, (past, past))
+
+        self.write(second, 'new')
+        self.write(first, 'newer')
+
+        with open(self.filename + '.1') as f:
+            self.assertEqual(f.read().splitlines(), ['old'])
+        with open(self.filename) as f:
+            self.assertEqual(f.read().splitlines(), ['new', 'newer'])
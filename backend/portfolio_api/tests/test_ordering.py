@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from portfolio_api.models import ChangeLogEntry, Project, Skill
+from portfolio_api.ordering import apply_order
+
+from .base import PortfolioTestCase, create_project, create_skill
+
+
+class ApplyOrderTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.a, self.b, self.c, self.d = (create_skill(name, order=i) for i, name in enumerate('ABCD', start=1))
+
+    def names(self):
+        return list(Skill.objects.order_by('order', 'name').values_list('name', flat=True))
+
+    def test_full_list(self):
+        self.assertEqual(apply_order(Skill, [self.d.pk, self.c.pk, self.b.pk, self.a.pk]), 4)
+        self.assertEqual(self.names(), ['D', 'C', 'B', 'A'])
+        self.assertEqual(list(Skill.objects.order_by('order').values_list('order', flat=True)), [1, 2, 3, 4])
+
+    def test_a_subset_keeps_its_slots(self):
+        self.assertEqual(apply_order(Skill, [self.d.pk, self.b.pk]), 2)
+        self.assertEqual(self.names(), ['A', 'D', 'C', 'B'])
+
+    def test_unchanged_rows_are_not_written(self):
+        # The rows, in a savepoint
+        with self.assertNumQueries(3):
+            self.assertEqual(apply_order(Skill, [self.b.pk, self.c.pk]), 0)
+
+    def test_shared_slots_are_spread_out(self):
+        Skill.objects.update(order=0)
+        apply_order(Skill, [self.c.pk, self.a.pk, self.b.pk])
+        self.assertEqual(self.names(), ['C', 'D', 'A', 'B'])
+        self.assertEqual(Skill.objects.get(pk=self.b.pk).order, 2)
+
+    def test_invalid_ids(self):
+        with self.assertRaisesMessage(ValueError, 'Duplicate'):
+            apply_order(Skill, [self.a.pk, self.a.pk])
+        with self.assertRaisesMessage(ValueError, 'Unknown IDs: 999'):
+            apply_order(Skill, [self.a.pk, 999])
+        self.assertEqual(self.names(), ['A', 'B', 'C', 'D'])
+
+    def test_reordering_skills_updates_the_read_model(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = create_project('Portfolio', technologies=[self.a, self.b, self.c])
+        ChangeLogEntry.objects.all().delete()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            apply_order(Skill, [self.c.pk, self.b.pk, self.a.pk])
+
+        rendered = Project.objects.values_list('rendered', flat=True).get(pk=project.pk)
+        self.assertEqual([skill['name'] for skill in rendered['technologies']], ['C', 'B', 'A'])
+        call_command('check_read_models', stdout=StringIO())
+        self.assertIn(('project', project.pk, 'updated'),
+                      set(ChangeLogEntry.objects.values_list('model', 'object_id', 'action')))
@@ -0,0 +1,87 @@
+import json
+import tempfile
+
+from django.conf import settings
+from django.test import override_settings
+
+from portfolio_api import payloads
+from portfolio_api.invalidation import content_invalidated
+
+from .base import PortfolioTestCase, create_skill
+
+ORIGIN = 'http://testserver'
+
+
+class PayloadStoreTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        store = tempfile.TemporaryDirectory(prefix='portfolio-payloads-')
+        self.addCleanup(store.cleanup)
+        override = override_settings(PAYLOAD_STORE_DIR=store.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        payloads._snapshots.clear()
+        self.addCleanup(payloads._snapshots.clear)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_skill('Python')
+
+    def skill_names(self, body):
+        return [skill['name'] for skill in json.loads(bytes(body))['results']]
+
+    def test_build_stores_the_rendered_responses(self):
+        self.assertIsNone(payloads.snapshot(self.portfolio.pk, ORIGIN))
+        self.assertEqual(payloads.build(self.portfolio.pk, ORIGIN, 'test'), 1)
+
+        current = payloads.snapshot(self.portfolio.pk, ORIGIN)
+        self.assertEqual(current.version, 1)
+        self.assertFalse(current.expired)
+        body, etag, headers = current.get('/api/skills/')
+        self.assertEqual(bytes(body), self.client.get('/api/skills/').content)
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn(['Content-Type', 'application/json'], headers)
+        self.assertIsNone(current.get('/api/changes/'))
+
+    def test_a_rebuild_is_swapped_in_without_disturbing_readers(self):
+        payloads.build(self.portfolio.pk, ORIGIN, 'test')
+        old = payloads.snapshot(self.portfolio.pk, ORIGIN)
+        create_skill('Rust')
+
+        self.assertEqual(payloads.build(self.portfolio.pk, ORIGIN, 'test'), 2)
+        new = payloads.snapshot(self.portfolio.pk, ORIGIN)
+        self.assertIsNot(new, old)
+        self.assertEqual(self.skill_names(new.get('/api/skills/')[0]), ['Python', 'Rust'])
+        # The replaced file stays mapped for whoever still holds it
+        self.assertEqual(self.skill_names(old.get('/api/skills/')[0]), ['Python'])
+        self.assertIs(payloads.snapshot(self.portfolio.pk, ORIGIN), new)
+
+    def test_unforced_builds_keep_a_current_snapshot(self):
+        payloads.build(self.portfolio.pk, ORIGIN, 'test')
+        self.assertEqual(payloads.build(self.portfolio.pk, ORIGIN, 'test', force=False), 1)
+
+    def test_committed_changes_rebuild_the_snapshots(self):
+        content_invalidated.connect(payloads.rebuild_invalidated, dispatch_uid='test_payloads')
+        self.addCleanup(content_invalidated.disconnect, dispatch_uid='test_payloads')
+        payloads.build(self.portfolio.pk, ORIGIN, 'test')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_skill('Rust')
+
+        current = payloads.snapshot(self.portfolio.pk, ORIGIN)
+        self.assertEqual(current.version, 2)
+        self.assertEqual(self.skill_names(current.get('/api/skills/')[0]), ['Python', 'Rust'])
+
+    def test_middleware_serves_from_the_store(self):
+        middleware = settings.MIDDLEWARE + ['portfolio_api.payloads.PayloadStoreMiddleware']
+        with override_settings(MIDDLEWARE=middleware, API_PAYLOAD_STORE=True):
+            response = self.client.get('/api/skills/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.skill_names(response.content), ['Python'])
+            self.assertEqual(payloads.snapshot(self.portfolio.pk, ORIGIN).version, 1)
+
+            etag = response['ETag']
+            response = self.client.get('/api/skills/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+            # Paths outside the store go to the views
+            self.assertNotIn('ETag', self.client.get('/api/changes/'))
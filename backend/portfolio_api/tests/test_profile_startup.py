@@ -0,0 +1,36 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+
+from portfolio_api.management.commands import profile_startup
+
+
+def _run(self, settings_module, wsgi_module, options):
+    """A worker that starts in 100 ms (settings 20, application 50, first response 30)."""
+    return {'start': 1.0, 'settings': 20.0, 'application': 70.0, 'first response': 100.0}, \
+        {name: [] for name in profile_startup.PHASES}, '200 OK'
+
+
+@mock.patch.object(profile_startup.Command, '_run', _run)
+class ProfileStartupCheckTests(SimpleTestCase):
+
+    def profile(self, **options):
+        out = StringIO()
+        call_command('profile_startup', runs=1, check=True, stdout=out, **options)
+        return out.getvalue()
+
+    def test_within_budget_passes(self):
+        self.assertIn('within the 150 ms budget', self.profile(budget=150))
+
+    def test_over_budget_fails(self):
+        with self.assertRaisesMessage(CommandError, 'Cold start took 100.0 ms, over the 50 ms budget'):
+            self.profile(budget=50)
+
+    @override_settings(COLD_START_BUDGET_MS=80)
+    def test_budget_defaults_to_the_setting(self):
+        with self.assertRaisesMessage(CommandError, 'over the 80 ms budget'):
+            self.profile()
+
@@ -0,0 +1,100 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+
+from portfolio_api import readmodel
+from portfolio_api.models import Experience, Project
+
+from .base import PortfolioTestCase, create_experience, create_project, create_skill
+
+
+class ReadModelTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python = create_skill('Python')
+            self.django = create_skill('Django', category='framework')
+            self.project = create_project('Portfolio', technologies=[self.python, self.django])
+            self.experience = create_experience('Acme', technologies=[self.python])
+
+    def rendered(self, instance):
+        return type(instance).objects.values_list('rendered', flat=True).get(pk=instance.pk)
+
+    def names(self, instance):
+        return [skill['name'] for skill in self.rendered(instance)['technologies']]
+
+    def test_rows_are_rendered_on_write(self):
+        self.assertEqual(self.names(self.project), ['Django', 'Python'])
+        self.assertEqual(self.names(self.experience), ['Python'])
+        self.assertEqual(self.rendered(self.project), readmodel.render(self.project))
+        self.assertIsNone(self.rendered(self.project)['media_url'])
+
+    def test_m2m_changes_are_synced(self):
+        self.project.technologies.remove(self.django)
+        self.assertEqual(self.names(self.project), ['Python'])
+        self.experience.technologies_used.clear()
+        self.assertEqual(self.names(self.experience), [])
+
+    def test_skill_changes_reach_their_owners(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python.name = 'Python 3'
+            self.python.save()
+        self.assertEqual(self.names(self.project), ['Django', 'Python 3'])
+        self.assertEqual(self.names(self.experience), ['Python 3'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.django.delete()
+        self.assertEqual(self.names(self.project), ['Python 3'])
+
+    def test_skill_edits_are_synced_once_per_transaction(self):
+        with mock.patch.object(readmodel, 'owners_of', wraps=readmodel.owners_of) as owners_of, \
+                mock.patch.object(readmodel, 'sync', wraps=readmodel.sync) as sync:
+            with self.captureOnCommitCallbacks(execute=True):
+                for skill, name in ((self.python, 'Python 3'), (self.django, 'Django 5')):
+                    skill.name = name
+                    skill.save()
+                self.assertEqual(self.names(self.project), ['Django', 'Python'])
+        self.assertEqual(owners_of.call_count, 1)
+        self.assertEqual(sync.call_count, 2)  # once per model
+        self.assertEqual(self.names(self.project), ['Django 5', 'Python 3'])
+
+    def test_rolled_back_skill_edits_are_not_synced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.python.name = 'Python 3'
+                    self.python.save()
+                    raise ValueError
+            except ValueError:
+                pass
+            self.django.name = 'Django 5'
+            self.django.save()
+        self.assertEqual(self.names(self.project), ['Django 5', 'Python'])
+
+    def test_sync_reports_and_repairs_drift(self):
+        Project.objects.filter(pk=self.project.pk).update(rendered={})
+
+        self.assertEqual(readmodel.sync(Project, repair=False), [self.project.pk])
+        self.assertEqual(self.rendered(self.project), {})
+        self.assertEqual(readmodel.sync(Experience), [])
+
+        self.assertEqual(readmodel.sync(Project, [self.project.pk]), [self.project.pk])
+        self.assertEqual(self.names(self.project), ['Django', 'Python'])
+        self.assertEqual(readmodel.sync(Project), [])
+
+    def test_check_command(self):
+        out = StringIO()
+        call_command('check_read_models', stdout=out)
+        self.assertIn('consistent', out.getvalue())
+
+        Experience.objects.filter(pk=self.experience.pk).update(rendered={})
+        with self.assertRaises(CommandError):
+            call_command('check_read_models', stdout=StringIO())
+
+        call_command('check_read_models', repair=True, stdout=StringIO())
+        self.assertEqual(self.names(self.experience), ['Python'])
+        call_command('check_read_models', stdout=StringIO())
@@ -0,0 +1,69 @@
+import io
+import sys
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from pypdf import PdfWriter
+
+from portfolio_api import resume
+from portfolio_api.models import PersonalInfo
+
+from .base import PortfolioTestCase, create_personal_info
+
+
+def _pdf():
+    writer = PdfWriter()
+    writer.add_blank_page(width=200, height=200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+class ResumeProcessingTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_media()
+
+    def processed(self, filename, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            info = create_personal_info(resume=SimpleUploadedFile(filename, content))
+        return PersonalInfo.objects.get(pk=info.pk)
+
+    def without_tools(self, *tools):
+        return mock.patch.object(resume.shutil, 'which', lambda tool: None if tool in tools else f'/usr/bin/{tool}')
+
+    def test_pdf_with_every_tool_is_ready(self):
+        with mock.patch.object(resume, 'pdf_preview', return_value=b'\x89PNG preview'):
+            info = self.processed('cv.pdf', _pdf())
+        self.assertEqual(info.resume_status, 'ready')
+        self.assertEqual(info.resume_page_count, 1)
+        self.assertTrue(info.resume_preview.name.endswith('.png'))
+        self.assertEqual(info.resume_processed_for, info.resume.name)
+
+    def test_pdf_without_a_preview_tool_is_partial(self):
+        with self.without_tools('pdftoppm'), self.assertLogs('portfolio_api.resume', 'WARNING'):
+            info = self.processed('cv.pdf', _pdf())
+        self.assertEqual(info.resume_status, 'partial')
+        self.assertEqual(info.resume_page_count, 1)
+        self.assertFalse(info.resume_preview)
+
+    def test_pdf_without_any_tool_is_unsupported(self):
+        with self.without_tools('pdftoppm', 'pdfinfo', 'pdftotext'), \
+                mock.patch.dict(sys.modules, {'pypdf': None}), \
+                self.assertLogs('portfolio_api.resume', 'WARNING') as logs:
+            info = self.processed('cv.pdf', _pdf())
+        self.assertEqual(info.resume_status, 'unsupported')
+        self.assertIsNone(info.resume_page_count)
+        self.assertIn('page_count, text, preview', logs.output[0])
+
+    def test_legacy_doc_is_unsupported(self):
+        with self.assertLogs('portfolio_api.resume', 'WARNING'):
+            info = self.processed('cv.doc', b'legacy word file')
+        self.assertEqual(info.resume_status, 'unsupported')
+        self.assertEqual(info.resume_size, 16)
+
+    def test_errors_are_failed(self):
+        with self.assertLogs('portfolio_api.resume', 'ERROR'):
+            info = self.processed('cv.pdf', b'not a pdf')
+        self.assertEqual(info.resume_status, 'failed')
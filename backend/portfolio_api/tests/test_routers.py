@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from backend.db import routers
+from portfolio_api.models import Skill
+
+
+@override_settings(REPLICA_PIN_SECONDS=5, REPLICA_PATH_PREFIXES=('/api/',))
+class ReplicaRoutingTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = routers.ReplicaRouter()
+        self.selector = routers.ReplicaSelector(['replica_0'])
+        self.healthy = True
+        for name, value in (('get_selector', lambda: self.selector),
+                            ('_is_healthy', lambda alias: self.healthy)):
+            patcher = mock.patch.object(routers, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def serve(self, request, view=None):
+        """Run a request through the middleware; returns the response and the reads seen by the view."""
+        reads = {}
+
+        def get_response(request):
+            if view:
+                view()
+            for model in (Skill, Session, get_user_model()):
+                reads[model] = self.router.db_for_read(model)
+            return HttpResponse()
+
+        response = routers.ReplicaPinningMiddleware(get_response)(request)
+        return response, reads
+
+    def test_api_reads_go_to_a_replica(self):
+        response, reads = self.serve(self.factory.get('/api/skills/'))
+        self.assertEqual(reads[Skill], 'replica_0')
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+        self.assertEqual(self.selector.get_stats()['replica_0']['in_flight'], 0)
+
+    def test_auth_and_sessions_stay_on_the_primary(self):
+        _, reads = self.serve(self.factory.get('/api/skills/'))
+        self.assertEqual(reads[Session], 'default')
+        self.assertEqual(reads[get_user_model()], 'default')
+
+    def test_admin_and_other_paths_stay_on_the_primary(self):
+        for path in ('/admin/', '/admin/login/', '/metrics', '/'):
+            with self.subTest(path=path):
+                _, reads = self.serve(self.factory.get(path))
+                self.assertEqual(reads[Skill], 'default')
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        response, reads = self.serve(self.factory.post('/api/contact/'))
+        self.assertEqual(reads[Skill], 'default')
+        cookie = response.cookies[routers.PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 5)
+        self.assertTrue(cookie['httponly'])
+
+        request = self.factory.get('/api/skills/')
+        request.COOKIES[routers.PIN_COOKIE] = '1'
+        response, reads = self.serve(request)
+        self.assertEqual(reads[Skill], 'default')
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+
+    def test_reads_after_a_write_use_the_primary(self):
+        _, reads = self.serve(self.factory.get('/api/skills/'), view=lambda: self.router.db_for_write(Skill))
+        self.assertEqual(reads[Skill], 'default')
+
+    def test_unhealthy_replicas_are_skipped(self):
+        self.healthy = False
+        _, reads = self.serve(self.factory.get('/api/skills/'))
+        self.assertEqual(reads[Skill], 'default')
+        self.assertTrue(self.selector.get_stats()['replica_0']['down'])
+
+    def test_nothing_is_routed_outside_a_request(self):
+        self.assertEqual(self.router.db_for_read(Skill), 'default')
@@ -0,0 +1,81 @@
+from rest_framework import serializers
+
+from portfolio_api.models import ChangeLogEntry, SocialLink
+from portfolio_api.serializers import sync_social_links
+
+from .base import PortfolioTestCase, create_personal_info
+
+
+class SyncSocialLinksTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.info = create_personal_info()
+            self.github = SocialLink.objects.create(personal_info=self.info, platform='github',
+                                                    url='https://github.com/ada', order=1)
+            self.linkedin = SocialLink.objects.create(personal_info=self.info, platform='linkedin',
+                                                      url='https://linkedin.com/in/ada', order=2)
+        ChangeLogEntry.objects.all().delete()
+
+    def test_updates_creates_and_deletes_to_match_the_list(self):
+        links = sync_social_links(self.info, [
+            {'id': self.github.pk, 'platform': 'github', 'url': 'https://github.com/lovelace', 'order': 2},
+            {'platform': 'kaggle', 'url': 'https://kaggle.com/ada', 'order': 1},
+        ])
+
+        self.assertEqual([link.platform for link in links], ['kaggle', 'github'])
+        stored = {link.platform: link for link in self.info.social_links.all()}
+        self.assertEqual(set(stored), {'github', 'kaggle'})
+        self.assertEqual(stored['github'].pk, self.github.pk)
+        self.assertEqual(stored['github'].url, 'https://github.com/lovelace')
+        self.assertEqual(stored['kaggle'].display_text, 'Kaggle')
+        self.assertEqual(stored['kaggle'].portfolio_id, self.info.portfolio_id)
+        self.assertFalse(SocialLink.objects.filter(pk=self.linkedin.pk).exists())
+
+    def test_writes_are_set_based(self):
+        new_links = [
+            {'platform': platform, 'url': f'https://{platform}.com/ada'}
+            for platform in ('kaggle', 'twitter', 'youtube', 'website')
+        ]
+        # Links, one bulk_update, one bulk_create, the stale links and their delete, in a savepoint
+        with self.assertNumQueries(7):
+            sync_social_links(self.info, [
+                {'id': self.github.pk, 'platform': 'github', 'url': 'https://github.com/lovelace'},
+            ] + new_links)
+
+    def test_partial_updates_may_omit_fields(self):
+        sync_social_links(self.info, [
+            {'id': self.github.pk, 'is_active': False},
+            {'id': self.linkedin.pk},
+        ], partial=True)
+
+        self.github.refresh_from_db()
+        self.assertFalse(self.github.is_active)
+        self.assertEqual(self.github.url, 'https://github.com/ada')
+        self.assertTrue(SocialLink.objects.filter(pk=self.linkedin.pk).exists())
+
+    def test_invalid_links_change_nothing(self):
+        with self.assertRaises(serializers.ValidationError) as raised:
+            sync_social_links(self.info, [
+                {'id': self.github.pk, 'platform': 'github', 'url': 'https://github.com/lovelace'},
+                {'platform': 'kaggle', 'url': 'not a url'},
+            ])
+
+        errors = raised.exception.detail['social_links']
+        self.assertEqual(errors[0], {})
+        self.assertIn('url', errors[1])
+        self.github.refresh_from_db()
+        self.assertEqual(self.github.url, 'https://github.com/ada')
+        self.assertEqual(self.info.social_links.count(), 2)
+
+    def test_changes_are_logged_once_committed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            sync_social_links(self.info, [
+                {'id': self.github.pk, 'platform': 'github', 'url': 'https://github.com/lovelace'},
+            ])
+
+        entries = set(ChangeLogEntry.objects.values_list('model', 'object_id', 'action'))
+        self.assertIn(('sociallink', self.github.pk, 'updated'), entries)
+        self.assertIn(('sociallink', self.linkedin.pk, 'deleted'), entries)
+        self.assertIn(('personalinfo', self.info.pk, 'updated'), entries)
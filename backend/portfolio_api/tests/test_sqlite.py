@@ -0,0 +1,51 @@
+from unittest import skipUnless
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from backend.db.sqlite import immediate_atomic
+from portfolio_api.models import Skill
+from portfolio_api.ordering import apply_order
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite only')
+class ImmediateAtomicTests(TransactionTestCase):
+    # Keep the default portfolio created by the migrations
+    serialized_rollback = True
+
+    def begins(self, queries):
+        # Transaction control statements are logged both as executed and by debug_transaction()
+        return {query['sql'] for query in queries.captured_queries if query['sql'].startswith('BEGIN')}
+
+    def test_write_transactions_begin_immediate(self):
+        with CaptureQueriesContext(connection) as queries:
+            with immediate_atomic():
+                Skill.objects.create(name='Python', category='programming')
+        self.assertEqual(self.begins(queries), {'BEGIN IMMEDIATE'})
+        self.assertIsNone(connection.transaction_mode)
+
+    def test_other_transactions_stay_deferred(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                list(Skill.objects.all())
+        self.assertEqual(self.begins(queries), {'BEGIN'})
+
+    def test_nested_blocks_use_savepoints(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                with immediate_atomic():
+                    Skill.objects.create(name='Python', category='programming')
+        self.assertEqual(self.begins(queries), {'BEGIN'})
+
+    def test_the_mode_is_restored_after_an_error(self):
+        with self.assertRaises(ValueError):
+            with immediate_atomic():
+                raise ValueError
+        self.assertIsNone(connection.transaction_mode)
+
+    def test_reordering_is_a_write_transaction(self):
+        skills = [Skill.objects.create(name=name, category='programming', order=i) for i, name in enumerate('AB')]
+        with CaptureQueriesContext(connection) as queries:
+            apply_order(Skill, [skills[1].pk, skills[0].pk])
+        self.assertEqual(self.begins(queries), {'BEGIN IMMEDIATE'})
@@ -0,0 +1,59 @@
+from portfolio_api import tenancy
+from portfolio_api.models import Portfolio, Skill
+
+from .base import PortfolioTestCase, create_project, create_skill
+
+
+class TenancyTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = Portfolio.objects.create(name='Alice', host='Alice.test')
+        self.default_skill = create_skill('Python')
+        with tenancy.activate(self.alice.pk):
+            self.alice_skill = create_skill('Rust')
+            self.alice_project = create_project('Compiler', technologies=[self.alice_skill])
+
+    def names(self, path, host):
+        response = self.client.get(path, HTTP_HOST=host)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        return [item.get('name') or item.get('title') for item in data.get('results', data)]
+
+    def test_hosts_are_matched_case_insensitively_with_a_default(self):
+        self.assertEqual(self.alice.host, 'alice.test')
+        self.assertEqual(tenancy.portfolio_for_host('ALICE.test:8000'), self.alice.pk)
+        self.assertEqual(tenancy.portfolio_for_host('localhost'), self.portfolio.pk)
+
+    def test_new_rows_belong_to_the_active_portfolio(self):
+        self.assertEqual(self.default_skill.portfolio_id, self.portfolio.pk)
+        self.assertEqual(self.alice_skill.portfolio_id, self.alice.pk)
+        self.assertEqual(self.alice_project.portfolio_id, self.alice.pk)
+
+    def test_managers_are_scoped_while_a_portfolio_is_active(self):
+        self.assertEqual(Skill.objects.count(), 2)
+        with tenancy.activate(self.alice.pk):
+            self.assertEqual(list(Skill.objects.values_list('name', flat=True)), ['Rust'])
+        with tenancy.activate(self.portfolio.pk):
+            self.assertEqual(list(Skill.objects.values_list('name', flat=True)), ['Python'])
+
+    def test_api_serves_the_portfolio_of_the_host(self):
+        self.assertEqual(self.names('/api/skills/', 'localhost'), ['Python'])
+        self.assertEqual(self.names('/api/skills/', 'alice.test'), ['Rust'])
+        self.assertEqual(self.names('/api/projects/', 'localhost'), [])
+        self.assertEqual(self.names('/api/projects/', 'alice.test'), ['Compiler'])
+
+        response = self.client.get(f'/api/projects/{self.alice_project.pk}/', HTTP_HOST='localhost')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cached_responses_are_not_shared_between_hosts(self):
+        for host, expected in (('localhost', ['Python']), ('alice.test', ['Rust']), ('localhost', ['Python'])):
+            data = self.client.get('/api/skills/grouped/', HTTP_HOST=host).json()
+            names = [skill['name'] for group in data['categories'] for skill in group['skills']]
+            self.assertEqual(names, expected)
+
+    def test_hosts_without_a_portfolio_are_not_found(self):
+        Portfolio.objects.filter(host='').update(is_active=False)
+        tenancy.reset_hosts()
+        self.assertEqual(self.client.get('/api/skills/', HTTP_HOST='localhost').status_code, 404)
+        self.assertEqual(self.client.get('/api/skills/', HTTP_HOST='alice.test').status_code, 200)
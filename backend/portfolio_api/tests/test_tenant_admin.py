@@ -0,0 +1,82 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+
+from portfolio_api import tenancy
+from portfolio_api.models import PersonalInfo, Portfolio
+
+from .base import PortfolioTestCase, create_skill
+
+
+class TenantAdminTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.alice = Portfolio.objects.create(name='Alice', host='alice.test')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.skills = [create_skill('Python'), create_skill('Go', order=1)]
+            with tenancy.activate(self.alice.pk):
+                self.alice_skill = create_skill('Rust')
+
+        User = get_user_model()
+        self.editor = User.objects.create_user('editor', password='pw', is_staff=True)
+        self.editor.user_permissions.add(*Permission.objects.filter(content_type__app_label='portfolio_api'))
+        self.portfolio.members.add(self.editor)
+        self.superuser = User.objects.create_superuser('root', password='pw')
+
+    def get(self, path, host='localhost'):
+        return self.client.get(path, HTTP_HOST=host)
+
+    def reorder(self, ids, host='localhost'):
+        return self.client.post('/api/reorder/skills/', {'ids': ids}, content_type='application/json',
+                                HTTP_HOST=host)
+
+    def test_members_manage_only_their_portfolio(self):
+        self.client.force_login(self.editor)
+        self.assertEqual(self.get('/admin/portfolio_api/skill/').status_code, 200)
+        self.assertEqual(self.get('/admin/portfolio_api/skill/', 'alice.test').status_code, 403)
+        self.assertEqual(self.get(f'/admin/portfolio_api/skill/{self.alice_skill.pk}/change/',
+                                  'alice.test').status_code, 403)
+        self.assertEqual(self.get('/admin/portfolio_api/skill/reorder/', 'alice.test').status_code, 403)
+        self.assertNotContains(self.get('/admin/', 'alice.test'), '/admin/portfolio_api/skill/')
+
+    def test_non_members_cannot_add_personal_info(self):
+        self.client.force_login(self.editor)
+        self.assertEqual(self.get('/admin/portfolio_api/personalinfo/add/').status_code, 200)
+        self.assertEqual(self.get('/admin/portfolio_api/personalinfo/add/', 'alice.test').status_code, 403)
+        response = self.client.post('/admin/portfolio_api/personalinfo/add/', {
+            'name': 'Mallory', 'title': 'Intruder', 'bio': 'Not a member.', 'email': 'mallory@example.com',
+        }, HTTP_HOST='alice.test')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(PersonalInfo.objects.exists())
+
+    def test_changelists_only_show_the_rows_of_the_host(self):
+        self.client.force_login(self.superuser)
+        default = self.get('/admin/portfolio_api/skill/')
+        alice = self.get('/admin/portfolio_api/skill/', 'alice.test')
+        self.assertEqual([skill.name for skill in default.context['cl'].result_list], ['Python', 'Go'])
+        self.assertEqual([skill.name for skill in alice.context['cl'].result_list], ['Rust'])
+        self.assertEqual(self.get(f'/admin/portfolio_api/skill/{self.alice_skill.pk}/change/').status_code, 302)
+
+    def test_deployment_wide_admins_are_for_superusers(self):
+        for path in ('/admin/portfolio_api/portfolio/', '/admin/portfolio_api/profilerecord/',
+                     '/admin/portfolio_api/mediablob/'):
+            with self.subTest(path=path):
+                self.client.force_login(self.editor)
+                self.assertEqual(self.get(path).status_code, 403)
+                self.client.force_login(self.superuser)
+                self.assertEqual(self.get(path).status_code, 200)
+
+    def test_reorder_requires_a_member_of_the_portfolio(self):
+        ids = [skill.pk for skill in reversed(self.skills)]
+        self.assertEqual(self.reorder(ids).status_code, 403)
+
+        self.client.force_login(self.editor)
+        self.assertEqual(self.reorder([self.alice_skill.pk], 'alice.test').status_code, 403)
+        self.assertEqual(self.reorder(ids).status_code, 200)
+
+        self.client.force_login(self.superuser)
+        self.assertEqual(self.reorder([self.alice_skill.pk], 'alice.test').status_code, 200)
+
+    def test_reorder_ignores_rows_of_other_portfolios(self):
+        self.client.force_login(self.superuser)
+        self.assertEqual(self.reorder([self.alice_skill.pk]).status_code, 400)
@@ -0,0 +1,73 @@
+from datetime import date
+
+from portfolio_api.models import Education, Experience
+from portfolio_api.timeline import build_timeline
+
+from .base import PortfolioTestCase, create_experience, create_skill
+
+
+class TimelineTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        python = create_skill('Python')
+        self.acme = create_experience('Acme', start_date=date(2016, 7, 1), end_date=date(2019, 12, 31),
+                                      technologies=[python])
+        self.initech = create_experience('Initech', start_date=date(2020, 2, 1), current=True)
+        self.school = Education.objects.create(
+            institution='University', degree='BSc', field_of_study='Computer Science',
+            start_date=date(2012, 9, 1), end_date=date(2016, 6, 30),
+        )
+        self.masters = Education.objects.create(
+            institution='University', degree='MSc', field_of_study='Computer Science',
+            start_date=date(2018, 9, 1), end_date=date(2019, 6, 30),
+        )
+
+    def ids(self, data):
+        return [(entry['type'], entry['id']) for entry in data['results']]
+
+    def test_entries_are_merged_newest_first(self):
+        data = build_timeline()
+
+        self.assertEqual(self.ids(data), [
+            ('experience', self.initech.pk),
+            ('education', self.masters.pk),
+            ('experience', self.acme.pk),
+            ('education', self.school.pk),
+        ])
+        self.assertEqual(data['count'], 4)
+        self.assertEqual(data['current'], 1)
+        acme = data['results'][2]
+        self.assertEqual(acme['technologies'], ['Python'])
+        self.assertEqual(acme['duration_months'], 42)
+        self.assertNotIn('order', acme)
+
+    def test_ties_on_start_date_follow_order(self):
+        Education.objects.filter(pk=self.masters.pk).update(start_date=date(2020, 2, 1), order=1)
+        Experience.objects.filter(pk=self.initech.pk).update(order=2)
+        data = build_timeline()
+        self.assertEqual(self.ids(data)[:2], [('education', self.masters.pk), ('experience', self.initech.pk)])
+
+    def test_date_range_keeps_overlapping_entries(self):
+        data = build_timeline(date(2017, 1, 1), date(2018, 12, 31))
+        self.assertEqual(self.ids(data), [('education', self.masters.pk), ('experience', self.acme.pk)])
+
+        # Ongoing entries run until today
+        data = build_timeline(start=date(2024, 1, 1))
+        self.assertEqual(self.ids(data), [('experience', self.initech.pk)])
+
+        data = build_timeline(end=date(2015, 1, 1))
+        self.assertEqual(self.ids(data), [('education', self.school.pk)])
+
+    def test_endpoint(self):
+        response = self.client.get('/api/timeline/', {'from': '2017-01-01', 'to': '2018-12-31'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+
+        response = self.client.get('/api/timeline/')
+        self.assertEqual(response.json()['count'], 4)
+
+        response = self.client.get('/api/timeline/', {'from': '2017-13-01'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/timeline/', {'to': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
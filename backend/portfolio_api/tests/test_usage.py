@@ -0,0 +1,88 @@
+from datetime import date
+
+from portfolio_api.models import SkillUsage
+from portfolio_api.usage import refresh_skill_usage
+
+from .base import PortfolioTestCase, create_experience, create_project, create_skill
+
+
+class SkillUsageTests(PortfolioTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.python = create_skill('Python')
+        self.django = create_skill('Django', category='framework')
+        self.project = create_project('Portfolio')
+
+    def usage(self, skill):
+        return SkillUsage.objects.get(skill=skill)
+
+    def test_new_skills_get_an_empty_row(self):
+        usage = self.usage(self.python)
+        self.assertEqual((usage.project_count, usage.experience_count, usage.total_count), (0, 0, 0))
+        self.assertFalse(usage.in_use)
+
+    def test_add_and_remove(self):
+        self.project.technologies.add(self.python, self.django)
+        self.assertEqual(self.usage(self.python).project_count, 1)
+        self.assertEqual(self.usage(self.django).total_count, 1)
+
+        self.project.technologies.remove(self.python)
+        self.assertEqual(self.usage(self.python).project_count, 0)
+        self.assertEqual(self.usage(self.django).project_count, 1)
+
+    def test_add_from_the_skill_side(self):
+        other = create_project('Other')
+        self.python.projects.add(self.project, other)
+        self.assertEqual(self.usage(self.python).project_count, 2)
+
+        self.python.projects.clear()
+        self.assertEqual(self.usage(self.python).project_count, 0)
+
+    def test_clear(self):
+        self.project.technologies.add(self.python, self.django)
+        self.project.technologies.clear()
+        self.assertEqual(self.usage(self.python).total_count, 0)
+        self.assertEqual(self.usage(self.django).total_count, 0)
+
+    def test_experience_dates_and_current_flag(self):
+        create_experience('Acme', start_date=date(2018, 3, 1), end_date=date(2020, 6, 30),
+                          technologies=[self.python])
+        current = create_experience('Initech', start_date=date(2021, 1, 1), current=True,
+                                    technologies=[self.python])
+
+        usage = self.usage(self.python)
+        self.assertEqual(usage.experience_count, 2)
+        self.assertEqual(usage.first_used, date(2018, 3, 1))
+        self.assertEqual(usage.last_used, date(2020, 6, 30))
+        self.assertTrue(usage.in_use)
+
+        current.current = False
+        current.end_date = date(2022, 12, 31)
+        current.save()
+        usage = self.usage(self.python)
+        self.assertFalse(usage.in_use)
+        self.assertEqual(usage.last_used, date(2022, 12, 31))
+
+    def test_deleting_a_project_or_experience(self):
+        self.project.technologies.add(self.python)
+        experience = create_experience('Acme', technologies=[self.python])
+        self.assertEqual(self.usage(self.python).total_count, 2)
+
+        self.project.delete()
+        self.assertEqual(self.usage(self.python).project_count, 0)
+        experience.delete()
+        self.assertEqual(self.usage(self.python).total_count, 0)
+
+    def test_deleting_a_skill_drops_its_row(self):
+        self.project.technologies.add(self.python)
+        self.python.delete()
+        self.assertFalse(SkillUsage.objects.filter(skill_id=self.python.pk).exists())
+
+    def test_full_refresh_repairs_rows(self):
+        self.project.technologies.add(self.python)
+        SkillUsage.objects.update(project_count=7, total_count=7)
+
+        self.assertEqual(refresh_skill_usage(), 2)
+        self.assertEqual(self.usage(self.python).total_count, 1)
+        self.assertEqual(self.usage(self.django).total_count, 0)
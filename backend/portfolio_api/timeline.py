@@ -0,0 +1,152 @@
+"""
+Career timeline: work experience and education as one date-ordered stream.
+
+Both tables are read already sorted by ``(-start_date, order)``, which the
+``*_timeline_idx`` indexes serve, and combined with ``heapq.merge`` so no
+sort happens in Python. Every entry carries its display period
+(``utils.format_duration``), its length in months and a ``current`` flag, so
+clients only render.
+"""
+
+import heapq
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .constants import TIMELINE_CACHE_KEY
+from .models import Education, Experience
+from .tenancy import cache_key
+from .utils import duration_months, format_duration
+
+EXPERIENCE_FIELDS = ['id', 'company', 'company_logo', 'position', 'location', 'start_date',
+                     'end_date', 'current', 'description', 'achievements', 'order']
+EDUCATION_FIELDS = ['id', 'institution', 'institution_logo', 'degree', 'field_of_study',
+                    'start_date', 'end_date', 'current', 'description', 'achievements', 'cpi', 'order']
+
+
+def _overlapping(queryset, start=None, end=None):
+    """Restrict to entries overlapping ``[start, end]``; open-ended entries run until today."""
+    if end is not None:
+        queryset = queryset.filter(start_date__lte=end)
+    if start is not None:
+        queryset = queryset.exclude(end_date__lt=start)
+    return queryset.order_by('-start_date', 'order')
+
+
+def _period(row, today):
+    current = row['current'] or row['end_date'] is None
+    return {
+        'start_date': row['start_date'],
+        'end_date': None if current else row['end_date'],
+        'current': current,
+        'period': format_duration(row['start_date'], row['end_date'], current),
+        'duration_months': duration_months(row['start_date'], None if current else row['end_date'], today),
+    }
+
+
+def _logo_url(field, name):
+    return field.storage.url(name) if name else None
+
+
+def _experience_entries(start, end, today):
+    rows = list(_overlapping(Experience.objects.all(), start, end).values(*EXPERIENCE_FIELDS))
+    technologies = {}
+    through = Experience.technologies_used.through
+    links = (through.objects.filter(experience_id__in=[row['id'] for row in rows])
+             .order_by('skill__category', 'skill__order', 'skill__name').values_list('experience_id', 'skill__name'))
+    for experience_id, name in links:
+        technologies.setdefault(experience_id, []).append(name)
+
+    logo_field = Experience._meta.get_field('company_logo')
+    for row in rows:
+        yield {
+            'type': 'experience',
+            'id': row['id'],
+            'title': row['position'],
+            'subtitle': row['company'],
+            'location': row['location'],
+            **_period(row, today),
+            'description': row['description'],
+            'achievements': row['achievements'],
+            'technologies': technologies.get(row['id'], []),
+            'logo_url': _logo_url(logo_field, row['company_logo']),
+            'order': row['order'],
+        }
+
+
+def _education_entries(start, end, today):
+    logo_field = Education._meta.get_field('institution_logo')
+    for row in _overlapping(Education.objects.all(), start, end).values(*EDUCATION_FIELDS):
+        yield {
+            'type': 'education',
+            'id': row['id'],
+            'title': row['degree'],
+            'subtitle': row['institution'],
+            'field_of_study': row['field_of_study'],
+            **_period(row, today),
+            'description': row['description'],
+            'achievements': row['achievements'],
+            'cpi': row['cpi'],
+            'logo_url': _logo_url(logo_field, row['institution_logo']),
+            'order': row['order'],
+        }
+
+
+def build_timeline(start=None, end=None):
+    """
+    Merge experience and education entries, newest first.
+
+    Args:
+        start (date): Only include entries still running on or after this date
+        end (date): Only include entries started on or before this date
+
+    Returns:
+        dict: ``count``, ``current`` (number of ongoing entries) and ``results``
+    """
+    today = timezone.localdate()
+    merged = list(heapq.merge(
+        _experience_entries(start, end, today),
+        _education_entries(start, end, today),
+        key=lambda entry: (-entry['start_date'].toordinal(), entry['order']),
+    ))
+    for entry in merged:
+        del entry['order']
+    return {
+        'count': len(merged),
+        'current': sum(entry['current'] for entry in merged),
+        'results': merged,
+    }
+
+
+def seconds_until_next_month():
+    """
+    Seconds left in the current month.
+
+    Durations of ongoing entries grow when the month changes, so a cached
+    timeline must not outlive it.
+    """
+    today = timezone.localdate()
+    first_of_next = (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+    boundary = timezone.make_aware(datetime.combine(first_of_next, time.min))
+    return max(int((boundary - timezone.now()).total_seconds()), 1)
+
+
+def cached_timeline():
+    """Return the unfiltered timeline, cached as one unit under ``timeline`` (per portfolio)."""
+    key = cache_key(TIMELINE_CACHE_KEY)
+    data = cache.get(key)
+    if data is None:
+        data = build_timeline()
+        cache.set(key, data, min(settings.CACHE_TTL, seconds_until_next_month()))
+    return data
+
+
+def absolute_logo_urls(data, request):
+    """Return a copy of a timeline payload with absolute logo URLs for ``request``."""
+    results = [
+        {**entry, 'logo_url': request.build_absolute_uri(entry['logo_url'])} if entry['logo_url'] else entry
+        for entry in data['results']
+    ]
+    return {**data, 'results': results}
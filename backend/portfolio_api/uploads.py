@@ -0,0 +1,159 @@
+"""
+Streaming validation of uploaded files.
+
+``StreamingUploadHandler`` replaces Django's memory/temporary-file handlers.
+Every file part is written straight to a temporary file on disk, so
+concurrent uploads never hold whole files in worker memory. While the bytes
+arrive it:
+
+* sniffs the real type from the first bytes (image headers, PDF/Office magic)
+  and rejects types the form field does not accept;
+* enforces a per-kind size limit and stops writing as soon as it is exceeded;
+* computes the SHA-256, which ``ContentAddressedStorage`` reuses instead of
+  hashing the file a second time;
+* for images, checks the header and structure with Pillow (``Image.verify``)
+  without decoding the bitmap, including a pixel-count limit.
+
+A rejected file is dropped and the reason is stored in
+``request.upload_errors``; ``UploadErrorsAdminMixin`` and the API serializers
+turn it into a normal validation error on the field.
+"""
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+from .constants import UPLOAD_FIELD_KINDS, VALIDATION_MESSAGES
+from .utils import format_file_size
+
+logger = logging.getLogger(__name__)
+
+# Enough for every signature below (WebP needs 12 bytes)
+SNIFF_BYTES = 16
+
+SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'%PDF-', 'application/pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),
+    (b'PK\x03\x04', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+]
+
+
+def sniff_content_type(head):
+    """
+    Identify a file from its first bytes.
+
+    Args:
+        head (bytes): At least the first ``SNIFF_BYTES`` bytes (fewer for tiny files)
+
+    Returns:
+        Optional[str]: The MIME type, or None if the signature is unknown
+    """
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+def _rules(kind):
+    if kind == 'image':
+        return settings.ALLOWED_IMAGE_TYPES, settings.MAX_IMAGE_UPLOAD_SIZE
+    return settings.ALLOWED_DOCUMENT_TYPES, settings.MAX_DOCUMENT_UPLOAD_SIZE
+
+
+def verify_image(file):
+    """
+    Check an image's header and structure without decoding its pixels.
+
+    Returns:
+        Optional[str]: An error message, or None if the image is valid
+    """
+    from PIL import Image
+
+    try:
+        file.seek(0)
+        with Image.open(file) as image:
+            width, height = image.size
+            if width * height > settings.MAX_IMAGE_PIXELS:
+                return VALIDATION_MESSAGES['upload_too_many_pixels'].format(width, height)
+            image.verify()
+    except Exception as exc:  # Pillow raises many different types for broken files
+        logger.info('Rejected invalid image upload: %s', exc)
+        return VALIDATION_MESSAGES['upload_invalid_image']
+    finally:
+        file.seek(0)
+    return None
+
+
+class StreamingUploadHandler(TemporaryFileUploadHandler):
+    """Write uploads to disk while hashing and validating them chunk by chunk."""
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.kind = UPLOAD_FIELD_KINDS.get(field_name)
+        self.digest = hashlib.sha256()
+        self.head = b''
+        self.sniffed_type = None
+        self.received = 0
+        self.error = None
+        if self.kind and self.content_length:
+            self._check_size(self.content_length)
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.error:
+            return None
+        self.received += len(raw_data)
+        if self.kind:
+            self._check_size(self.received)
+            if self.sniffed_type is None and not self.error:
+                self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+                if len(self.head) >= SNIFF_BYTES:
+                    self._check_type()
+            if self.error:
+                return None
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self.kind and not self.error and self.sniffed_type is None:
+            self._check_type()
+        if not self.error and self.kind == 'image':
+            self.file.flush()
+            self.error = verify_image(self.file)
+        if self.error:
+            self._reject()
+            return None
+
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.digest.hexdigest()
+        if self.sniffed_type:
+            uploaded.content_type = self.sniffed_type
+        return uploaded
+
+    def _check_size(self, size):
+        limit = _rules(self.kind)[1]
+        if size > limit:
+            self.error = VALIDATION_MESSAGES['upload_too_large'].format(format_file_size(limit))
+
+    def _check_type(self):
+        allowed = _rules(self.kind)[0]
+        self.sniffed_type = sniff_content_type(self.head)
+        if self.sniffed_type not in allowed:
+            self.error = VALIDATION_MESSAGES['upload_bad_type']
+
+    def _reject(self):
+        # Closing the temporary file deletes it
+        self.file.close()
+        errors = getattr(self.request, 'upload_errors', None)
+        if errors is None:
+            errors = self.request.upload_errors = {}
+        errors[self.field_name] = self.error
+        logger.info('Rejected upload for %s (%s): %s', self.field_name, self.file_name, self.error)
@@ -49,4 +49,7 @@ router.register(r'contact', views.ContactViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('', include(singleton_router.urls)),
+    path('timeline/', views.TimelineView.as_view(), name='timeline'),
+    path('changes/', views.ChangesView.as_view(), name='changes'),
+    path('reorder/<str:resource>/', views.ReorderView.as_view(), name='reorder'),
 ]
\ No newline at end of file
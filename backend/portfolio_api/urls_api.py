@@ -0,0 +1,44 @@
+"""
+Public read routes of the API, for API-only workers (``backend.settings_api``).
+
+The same paths and route names as ``urls.py``, minus everything that writes
+or needs a logged-in user: only the GET routes of the viewsets are kept, and
+the contact and reorder endpoints are left to the full stack.
+"""
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
+from . import views
+from .urls import SingletonRouter
+
+
+class ReadOnlyRoutesMixin:
+    """Route only the GET methods of registered viewsets."""
+
+    def get_method_map(self, viewset, method_map):
+        method_map = super().get_method_map(viewset, method_map)
+        return {method: action for method, action in method_map.items() if method == 'get'}
+
+
+class ReadOnlyRouter(ReadOnlyRoutesMixin, SimpleRouter):
+    pass
+
+
+class ReadOnlySingletonRouter(ReadOnlyRoutesMixin, SingletonRouter):
+    pass
+
+
+router = ReadOnlyRouter()
+router.register(r'skills', views.SkillViewSet)
+router.register(r'projects', views.ProjectViewSet)
+router.register(r'experience', views.ExperienceViewSet)
+router.register(r'education', views.EducationViewSet)
+
+singleton_router = ReadOnlySingletonRouter()
+singleton_router.register(r'personal-info', views.PersonalInfoViewSet, basename='personalinfo')
+
+urlpatterns = [
+    path('', include(router.urls)),
+    path('', include(singleton_router.urls)),
+    path('timeline/', views.TimelineView.as_view(), name='timeline'),
+    path('changes/', views.ChangesView.as_view(), name='changes'),
+]
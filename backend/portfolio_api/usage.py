@@ -0,0 +1,130 @@
+"""
+Materialized technology usage statistics.
+
+``refresh_skill_usage`` recomputes the ``SkillUsage`` rows of the given
+skills with one aggregate query and writes them with one upsert. Signal
+receivers call it for just the skills touched by a change, so reading the
+"top technologies" never has to count through the M2M tables.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .constants import SKILL_CATEGORIES, SKILLS_GROUPED_CACHE_KEY
+from .models import Experience, Project, Skill, SkillUsage
+from .tenancy import cache_key
+from .utils import get_skill_category_display
+
+USAGE_FIELDS = ['project_count', 'experience_count', 'total_count', 'first_used', 'last_used', 'in_use']
+
+
+def _aggregate(through, value):
+    return Subquery(
+        through.objects.filter(skill_id=OuterRef('pk')).order_by()
+        .values('skill_id').annotate(value=value).values('value')
+    )
+
+
+def refresh_skill_usage(skill_ids=None, using=None):
+    """
+    Recompute usage statistics.
+
+    Args:
+        skill_ids (Iterable[int] | None): Skills to refresh, or None for all
+        using (str | None): Database alias
+
+    Returns:
+        int: Number of rows written
+    """
+    projects = Project.technologies.through
+    experiences = Experience.technologies_used.through
+
+    skills = Skill.objects.using(using).order_by()
+    if skill_ids is not None:
+        skill_ids = set(skill_ids)
+        if not skill_ids:
+            return 0
+        skills = skills.filter(pk__in=skill_ids)
+
+    rows = skills.annotate(
+        project_count=Coalesce(_aggregate(projects, Count('*')), 0),
+        experience_count=Coalesce(_aggregate(experiences, Count('*')), 0),
+        first_used=_aggregate(experiences, Min('experience__start_date')),
+        last_used=_aggregate(experiences, Max('experience__end_date')),
+        in_use=Exists(experiences.objects.filter(skill_id=OuterRef('pk'), experience__current=True)),
+    ).values_list('pk', 'project_count', 'experience_count', 'first_used', 'last_used', 'in_use')
+
+    usage = [
+        SkillUsage(
+            skill_id=pk,
+            project_count=project_count,
+            experience_count=experience_count,
+            total_count=project_count + experience_count,
+            first_used=first_used,
+            last_used=last_used,
+            in_use=in_use,
+        )
+        for pk, project_count, experience_count, first_used, last_used, in_use in rows
+    ]
+    SkillUsage.objects.using(using).bulk_create(
+        usage, update_conflicts=True, unique_fields=['skill'], update_fields=USAGE_FIELDS + ['updated_at'],
+    )
+    return len(usage)
+
+
+def _build_grouped():
+    # Usage counts come from the materialized SkillUsage rows, so the
+    # whole result is one SELECT with a single LEFT JOIN.
+    rows = Skill.objects.annotate(
+        project_count=Coalesce('usage__project_count', 0),
+        experience_count=Coalesce('usage__experience_count', 0),
+    ).values(
+        'id', 'name', 'category', 'proficiency', 'description', 'icon', 'order',
+        'project_count', 'experience_count',
+    )
+
+    groups = {}
+    for row in rows:
+        group = groups.get(row['category'])
+        if group is None:
+            group = groups[row['category']] = {
+                'category': row['category'],
+                'display_name': get_skill_category_display(row['category']),
+                'count': 0,
+                'average_proficiency': 0,
+                'project_usage': 0,
+                'experience_usage': 0,
+                'skills': [],
+            }
+        group['count'] += 1
+        group['average_proficiency'] += row['proficiency']
+        group['project_usage'] += row['project_count']
+        group['experience_usage'] += row['experience_count']
+        group['skills'].append(row)
+
+    position = {code: index for index, (code, _) in enumerate(SKILL_CATEGORIES)}
+    categories = sorted(groups.values(), key=lambda g: position.get(g['category'], len(position)))
+    for group in categories:
+        group['average_proficiency'] = round(group['average_proficiency'] / group['count'], 2)
+    return {
+        'count': sum(group['count'] for group in categories),
+        'categories': categories,
+    }
+
+
+def grouped_skills():
+    """
+    All skills bucketed by category in SKILL_CATEGORIES order.
+
+    Each category carries its skill count, average proficiency and how often
+    its skills are used by projects and experience entries. The result is
+    cached as one unit under ``skills_grouped`` (per portfolio).
+    """
+    key = cache_key(SKILLS_GROUPED_CACHE_KEY)
+    data = cache.get(key)
+    if data is None:
+        data = _build_grouped()
+        cache.set(key, data, settings.CACHE_TTL)
+    return data
@@ -8,7 +8,11 @@ different parts of the application.
 import re
 from typing import Optional, Dict, Any
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.utils.text import slugify
+from .constants import SKILL_CATEGORIES
+
+SKILL_CATEGORY_NAMES = dict(SKILL_CATEGORIES)
 
 
 def validate_url(url: str) -> bool:
@@ -76,6 +80,23 @@ def format_duration(start_date, end_date=None, current=False) -> str:
     return f"{start_date.strftime('%b %Y')} - {end_date.strftime('%b %Y')}"
 
 
+def duration_months(start_date, end_date=None, today=None) -> int:
+    """
+    Count the calendar months covered by a period, both ends included.
+
+    Args:
+        start_date: Start date
+        end_date: End date (optional, defaults to today for current entries)
+        today: Date used for open-ended periods (defaults to the local date)
+
+    Returns:
+        int: Number of months, at least 1
+    """
+    end_date = end_date or today or timezone.localdate()
+    months = (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+    return max(months, 1)
+
+
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     """
     Truncate text to a maximum length.
@@ -104,17 +125,7 @@ def get_skill_category_display(category: str) -> str:
     Returns:
         str: The display name
     """
-    category_map = {
-        'programming': 'Programming Languages',
-        'framework': 'Frameworks & Libraries',
-        'database': 'Databases',
-        'tool': 'Tools & Technologies',
-        'soft': 'Soft Skills',
-        'cloud': 'Cloud & DevOps',
-        'design': 'Design & UI/UX',
-    }
-    
-    return category_map.get(category, category.title())
+    return SKILL_CATEGORY_NAMES.get(category, category.title())
 
 
 def validate_cpi(cpi: float) -> bool:
@@ -1,18 +1,37 @@
+from datetime import timedelta
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import JsonResponse, Http404
+from rest_framework.views import APIView
+from django.http import HttpResponse, JsonResponse, Http404, StreamingHttpResponse
+from django.conf import settings
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date
 from django.shortcuts import render
-from .models import PersonalInfo, Skill, Project, Experience, Education, Contact
+from backend.db.sqlite import immediate_atomic, retry_on_locked
+from backend.metrics import CONTACT_SUBMISSIONS
+from .models import (
+    PersonalInfo, Skill, SkillUsage, Project, Experience, Education, Contact, SocialLink, ChangeLogEntry
+)
 from .serializers import (
     PersonalInfoSerializer, SkillSerializer, ProjectSerializer,
     ExperienceSerializer, EducationSerializer, ContactSerializer,
-    SocialLinkSerializer
+    SocialLinkSerializer, ReorderSerializer, sync_social_links
 )
+from . import dbjson
+from .changelog import decode_token, encode_token
+from .ordering import REORDERABLE_MODELS, apply_order
 from .constants import (
-    API_VERSION, CONTACT_SUCCESS_MESSAGE, CONTACT_ERROR_MESSAGE
+    API_VERSION, CHANGES_PAGE_SIZE, CONTACT_SUCCESS_MESSAGE, CONTACT_ERROR_MESSAGE, MAX_PAGE_SIZE,
+    TOP_SKILLS_ORDERING,
 )
+from .snapshot import render_index
+from .tenancy import can_manage
+from .timeline import absolute_logo_urls, build_timeline, cached_timeline
+from .usage import grouped_skills
 
 
 def home(request):
@@ -26,9 +45,13 @@ def home(request):
         'endpoints': {
             'personal_info': '/api/personal-info/',
             'skills': '/api/skills/',
+            'skills_grouped': '/api/skills/grouped/',
+            'skills_top': '/api/skills/top/',
             'projects': '/api/projects/',
             'experience': '/api/experience/',
             'education': '/api/education/',
+            'timeline': '/api/timeline/',
+            'changes': '/api/changes/',
             'contact': '/api/contact/',
             'admin': '/admin/',
         },
@@ -36,6 +59,26 @@ def home(request):
     })
 
 
+def index(request):
+    """
+    Serve the built frontend with the portfolio data embedded in the page.
+
+    Falls back to the API information at the site root when the frontend
+    has not been built. Responses carry an ETag and must be revalidated,
+    so unchanged pages cost a 304.
+    """
+    page = render_index(request)
+    if page is None:
+        if request.path == '/':
+            return home(request)
+        raise Http404("Frontend build not found")
+
+    response = get_conditional_response(request, etag=page['etag'], response=HttpResponse(page['html']))
+    response['ETag'] = page['etag']
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
 def custom_404(request, exception):
     """
     Custom 404 error handler.
@@ -51,6 +94,8 @@ def custom_404(request, exception):
                 '/api/projects/',
                 '/api/experience/',
                 '/api/education/',
+                '/api/timeline/',
+                '/api/changes/',
                 '/api/contact/',
             ]
         }, status=404)
@@ -72,6 +117,18 @@ def custom_500(request):
     return render(request, '500.html', status=500)
 
 
+class PortfolioQuerysetMixin:
+    """
+    Rebuild ``queryset`` from the model's manager on every request.
+
+    A class-level queryset is created at import time, when no portfolio is
+    active, so reusing it would not be scoped to the request's portfolio.
+    """
+
+    def get_queryset(self):
+        return self.queryset.model.objects.all()
+
+
 class PersonalInfoViewSet(viewsets.ModelViewSet):
     """
     Singleton ViewSet for PersonalInfo model.
@@ -112,26 +169,15 @@ class PersonalInfoViewSet(viewsets.ModelViewSet):
         return context
     
     def create(self, request, *args, **kwargs):
-        # Create the personal info first
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        
-        # Get the created instance and update context for social links
-        instance = serializer.instance
-        context = self.get_serializer_context()
-        context['personal_info'] = instance
-        
-        # Handle social links if provided
-        social_links_data = request.data.get('social_links', [])
-        if social_links_data:
-            social_links_serializer = SocialLinkSerializer(
-                data=social_links_data,
-                many=True,
-                context=context
-            )
-            social_links_serializer.is_valid(raise_exception=True)
-            social_links_serializer.save()
+        with immediate_atomic():
+            self.perform_create(serializer)
+            
+            # Handle social links if provided
+            social_links_data = request.data.get('social_links', [])
+            if social_links_data:
+                sync_social_links(serializer.instance, social_links_data)
         
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
@@ -139,52 +185,19 @@ class PersonalInfoViewSet(viewsets.ModelViewSet):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
         
-        # Update the context with the instance
-        context = self.get_serializer_context()
+        # Build the context directly so the singleton is not fetched again
+        context = super().get_serializer_context()
         context['personal_info'] = instance
         
-        # Update the personal info
-        serializer = self.get_serializer(instance, data=request.data, partial=partial, context=context)
+        serializer = self.get_serializer_class()(instance, data=request.data, partial=partial, context=context)
         serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
-        
-        # Handle social links if provided
-        if 'social_links' in request.data:
-            social_links_data = request.data['social_links']
-            
-            # Get existing social links to update or delete
-            existing_links = {str(link.id): link for link in instance.social_links.all()}
-            updated_link_ids = set()
-            
-            # Update or create social links
-            for link_data in social_links_data:
-                link_id = link_data.get('id')
-                if link_id and link_id in existing_links:
-                    # Update existing link
-                    link = existing_links[link_id]
-                    link_serializer = SocialLinkSerializer(
-                        link,
-                        data=link_data,
-                        partial=partial,
-                        context=context
-                    )
-                    link_serializer.is_valid(raise_exception=True)
-                    link_serializer.save()
-                    updated_link_ids.add(link_id)
-                else:
-                    # Create new link
-                    link_data['personal_info'] = instance.id
-                    link_serializer = SocialLinkSerializer(
-                        data=link_data,
-                        context=context
-                    )
-                    link_serializer.is_valid(raise_exception=True)
-                    link_serializer.save()
+        with immediate_atomic():
+            self.perform_update(serializer)
             
-            # Delete links that weren't included in the update
-            for link_id, link in existing_links.items():
-                if link_id not in updated_link_ids:
-                    link.delete()
+            # Diff-and-apply the social links if provided; this also refreshes
+            # the prefetched links used to render the response
+            if 'social_links' in request.data:
+                sync_social_links(instance, request.data['social_links'], partial=partial)
         
         return Response(serializer.data)
         
@@ -229,13 +242,87 @@ class SkillViewSet(viewsets.ReadOnlyModelViewSet):
         
         return queryset
 
+    @action(detail=False, methods=['get'])
+    def grouped(self, request):
+        """
+        All skills bucketed by category in SKILL_CATEGORIES order, unpaginated.
 
-class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
+        Each category carries its skill count, average proficiency and how
+        often its skills are used by projects and experience entries. The
+        whole payload is cached as one unit under ``skills_grouped``.
+        """
+        return Response(grouped_skills())
+
+    @action(detail=False, methods=['get'])
+    def top(self, request):
+        """
+        Most used technologies, read from the materialized SkillUsage table.
+
+        Query parameters: ``by`` (total, projects or experience) and ``limit``.
+        """
+        order = TOP_SKILLS_ORDERING.get(request.query_params.get('by', 'total'))
+        if order is None:
+            return Response({'error': f"'by' must be one of: {', '.join(TOP_SKILLS_ORDERING)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), MAX_PAGE_SIZE)
+        except ValueError:
+            return Response({'error': "'limit' must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = SkillUsage.objects.filter(skill__portfolio_id=request.portfolio_id).order_by(order, 'skill__name').values(
+            'skill_id', 'skill__name', 'skill__category', 'project_count', 'experience_count',
+            'total_count', 'first_used', 'last_used', 'in_use',
+        )[:max(limit, 0)]
+        return Response([
+            {
+                'id': row['skill_id'],
+                'name': row['skill__name'],
+                'category': row['skill__category'],
+                'project_count': row['project_count'],
+                'experience_count': row['experience_count'],
+                'total_count': row['total_count'],
+                'first_used': row['first_used'],
+                'last_used': timezone.localdate() if row['in_use'] else row['last_used'],
+                'in_use': row['in_use'],
+            }
+            for row in rows
+        ])
+
+
+class DatabaseJSONListMixin:
+    """
+    Render ``list`` responses in the database when ``API_DB_JSON`` is enabled.
+
+    The rows are built as JSON by the database (see ``dbjson``) and streamed
+    into the response; the bytes are the same as the serializer path.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not (settings.API_DB_JSON and request.accepted_renderer.format == 'json'
+                and dbjson.supported(queryset)):
+            return super().list(request, *args, **kwargs)
+
+        rows = dbjson.json_rows(queryset, self.get_serializer_class(), request)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            body = dbjson.stream(rows.iterator())
+        else:
+            body = dbjson.stream(page, {
+                'count': self.paginator.page.paginator.count,
+                'next': self.paginator.get_next_link(),
+                'previous': self.paginator.get_previous_link(),
+            })
+        return StreamingHttpResponse(body, content_type='application/json')
+
+
+class ProjectViewSet(DatabaseJSONListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Project model.
     Provides read-only access to projects with optional featured filtering.
     """
-    queryset = Project.objects.prefetch_related('technologies')
+    # Technologies come from the denormalized ``rendered`` column; no prefetch needed
+    queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.AllowAny]
     
@@ -257,17 +344,17 @@ class ProjectViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset
 
 
-class ExperienceViewSet(viewsets.ReadOnlyModelViewSet):
+class ExperienceViewSet(DatabaseJSONListMixin, PortfolioQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Experience model.
     Provides read-only access to work experience.
     """
-    queryset = Experience.objects.prefetch_related('technologies_used')
+    queryset = Experience.objects.all()
     serializer_class = ExperienceSerializer
     permission_classes = [permissions.AllowAny]
 
 
-class EducationViewSet(viewsets.ReadOnlyModelViewSet):
+class EducationViewSet(PortfolioQuerysetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Education model.
     Provides read-only access to educational background.
@@ -277,7 +364,111 @@ class EducationViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.AllowAny]
 
 
-class ContactViewSet(viewsets.ModelViewSet):
+class TimelineView(APIView):
+    """
+    Work experience and education merged into one list, newest first.
+
+    GET /api/timeline/?from=YYYY-MM-DD&to=YYYY-MM-DD returns the entries
+    overlapping that range (both bounds optional). The unfiltered timeline
+    is cached as one unit under ``timeline``.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        bounds = {}
+        for param in ('from', 'to'):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    bounds[param] = parse_date(value)
+                except ValueError:
+                    bounds[param] = None
+                if bounds[param] is None:
+                    return Response({'error': f"'{param}' must be a date (YYYY-MM-DD)"},
+                                    status=status.HTTP_400_BAD_REQUEST)
+
+        if bounds:
+            data = build_timeline(bounds.get('from'), bounds.get('to'))
+        else:
+            data = cached_timeline()
+
+        # Logo URLs are cached relative to MEDIA_URL and made absolute per request
+        return Response(absolute_logo_urls(data, request))
+
+
+# Model name in the change log -> (queryset factory, serializer) used to render changed
+# objects; querysets are built per request so they are scoped to its portfolio
+CHANGE_FEED = {
+    'personalinfo': (lambda: PersonalInfo.objects.prefetch_related('social_links'), PersonalInfoSerializer),
+    'sociallink': (SocialLink.objects.all, SocialLinkSerializer),
+    'skill': (Skill.objects.all, SkillSerializer),
+    'project': (Project.objects.all, ProjectSerializer),
+    'experience': (Experience.objects.all, ExperienceSerializer),
+    'education': (Education.objects.all, EducationSerializer),
+}
+
+
+class ChangesView(APIView):
+    """
+    Incremental change feed for clients and edge caches.
+
+    GET /api/changes/?since=<token> returns each object created, updated or
+    deleted after the token once, with its current representation (null
+    for deletions), plus the token to pass next time. Without ``since`` the
+    feed starts from the beginning, i.e. a full sync. ``has_more`` means
+    another request is needed to catch up.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        since = 0
+        token = request.query_params.get('since')
+        if token:
+            try:
+                since = decode_token(token)
+            except ValueError:
+                return Response({'error': "Invalid 'since' token"}, status=status.HTTP_400_BAD_REQUEST)
+
+        settled = timezone.now() - timedelta(seconds=settings.CHANGELOG_SETTLE_SECONDS)
+        entries = list(
+            ChangeLogEntry.objects.filter(pk__gt=since, created_at__lte=settled)
+            .order_by('pk').values_list('pk', 'model', 'object_id', 'action')[:CHANGES_PAGE_SIZE]
+        )
+
+        # Only the latest action per object matters, in the order of last change
+        latest = {}
+        for _, model, object_id, action in entries:
+            if model in CHANGE_FEED:
+                latest.pop((model, object_id), None)
+                latest[(model, object_id)] = action
+
+        wanted = {}
+        for (model, object_id), action in latest.items():
+            if action != 'deleted':
+                wanted.setdefault(model, []).append(object_id)
+        current = {}
+        context = {'request': request}
+        for model, ids in wanted.items():
+            queryset, serializer_class = CHANGE_FEED[model]
+            for obj in queryset().filter(pk__in=ids):
+                current[(model, obj.pk)] = serializer_class(obj, context=context).data
+
+        changes = []
+        for (model, object_id), action in latest.items():
+            data = current.get((model, object_id))
+            if data is None:
+                # Deleted, possibly after the entries read in this page
+                action = 'deleted'
+            changes.append({'model': model, 'id': object_id, 'action': action, 'data': data})
+
+        return Response({
+            'changes': changes,
+            'next': encode_token(entries[-1][0] if entries else since),
+            'has_more': len(entries) == CHANGES_PAGE_SIZE,
+        })
+
+
+class ContactViewSet(PortfolioQuerysetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Contact model.
     Allows creation of contact messages and read access for admin.
@@ -293,14 +484,56 @@ class ContactViewSet(viewsets.ModelViewSet):
         try:
             serializer = self.get_serializer(data=request.data)
             if serializer.is_valid():
-                serializer.save()
+                self.perform_create(serializer)
+                CONTACT_SUBMISSIONS.labels('accepted').inc()
                 return Response({
                     'message': CONTACT_SUCCESS_MESSAGE,
                     'data': serializer.data
                 }, status=status.HTTP_201_CREATED)
+            CONTACT_SUBMISSIONS.labels('invalid').inc()
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
+            CONTACT_SUBMISSIONS.labels('error').inc()
             return Response(
                 {'error': CONTACT_ERROR_MESSAGE.format(str(e))}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    @retry_on_locked()
+    def perform_create(self, serializer):
+        """Save the message, retrying with backoff if SQLite is locked."""
+        serializer.save()
+
+
+class IsPortfolioAdmin(permissions.IsAdminUser):
+    """Allow staff users who manage the portfolio the request is for (see ``tenancy.can_manage``)."""
+
+    def has_permission(self, request, view):
+        return super().has_permission(request, view) and can_manage(
+            request.user, getattr(request, 'portfolio_id', None))
+
+
+class ReorderView(APIView):
+    """
+    Bulk reorder endpoint for models sorted on an ``order`` field.
+
+    POST /api/reorder/<resource>/ with ``{"ids": [3, 1, 2]}`` applies the
+    new order in one transaction. Restricted to staff users who manage the
+    portfolio of the request's host.
+    """
+    permission_classes = [IsPortfolioAdmin]
+
+    def post(self, request, resource):
+        model = REORDERABLE_MODELS.get(resource)
+        if model is None:
+            raise Http404(f"Unknown resource: {resource}")
+
+        serializer = ReorderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        try:
+            updated = apply_order(model, ids)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'updated': updated, 'ids': ids})
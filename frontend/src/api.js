@@ -7,4 +7,36 @@ const api = axios.create({
   baseURL: API_BASE_URL,
 });
 
-export default api;
\ No newline at end of file
+// When the page is served by the backend, the responses needed for first
+// paint are embedded in it, keyed by API path. Answer those GET requests
+// from the page instead of the network.
+const readEmbeddedData = () => {
+  const element = typeof document !== 'undefined' && document.getElementById('portfolio-data');
+  if (!element) return {};
+  try {
+    return JSON.parse(element.textContent) || {};
+  } catch (error) {
+    console.error('Ignoring invalid embedded portfolio data:', error);
+    return {};
+  }
+};
+
+const embeddedData = readEmbeddedData();
+
+api.interceptors.request.use((config) => {
+  const method = (config.method || 'get').toLowerCase();
+  if (method === 'get' && !config.params && Object.prototype.hasOwnProperty.call(embeddedData, config.url)) {
+    const data = embeddedData[config.url];
+    config.adapter = () => Promise.resolve({
+      data,
+      status: 200,
+      statusText: 'OK',
+      headers: {},
+      config,
+      request: {},
+    });
+  }
+  return config;
+});
+
+export default api;
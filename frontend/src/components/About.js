@@ -4,7 +4,7 @@ import api from '../api';
 
 const About = () => {
   const [personalInfo, setPersonalInfo] = useState(null);
-  const [skills, setSkills] = useState([]);
+  const [skillGroups, setSkillGroups] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
@@ -16,20 +16,19 @@ const About = () => {
         
         const [personalResponse, skillsResponse] = await Promise.all([
           api.get('/personal-info/'),
-          api.get('/skills/')
+          api.get('/skills/grouped/')
         ]);
         
-        // Ensure skills data is an array
-
-        const skillsData = Array.isArray(skillsResponse.data.results) ? skillsResponse.data.results : [];
+        // Skills arrive already grouped by category, in display order
+        const groups = Array.isArray(skillsResponse.data.categories) ? skillsResponse.data.categories : [];
         
         setPersonalInfo(personalResponse.data);
-        setSkills(skillsData);
+        setSkillGroups(groups);
       } catch (error) {
         console.error('Error fetching data:', error);
         setError('Failed to load personal information and skills. Please try again later.');
         setPersonalInfo(null);
-        setSkills([]);
+        setSkillGroups([]);
       } finally {
         setLoading(false);
       }
@@ -38,19 +37,6 @@ const About = () => {
     fetchData();
   }, []);
   
-  const skillCategories = {
-    'programming': 'Programming Languages',
-    'framework': 'Frameworks & Libraries',
-    'database': 'Databases',
-    'tool': 'Tools & Technologies',
-    'soft': 'Soft Skills'
-  };
-
-  const getSkillsByCategory = (category) => {        
-    if (!Array.isArray(skills)) return [];
-    return skills.filter(skill => skill.category === category);
-  };
-
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center pt-20 bg-gray-50 dark:bg-gray-900">
@@ -79,9 +65,6 @@ const About = () => {
     );
   }
 
-  // Ensure skills is always an array
-  // const safeSkills = Array.isArray(skills) ? skills : [];
-
   return (
     <div className="min-h-screen bg-gray-50 dark:bg-gray-900 pt-20">
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-16">
@@ -183,10 +166,7 @@ const About = () => {
         >
           <h2 className="text-3xl font-bold text-gray-900 dark:text-white mb-8 text-center">Skills & Expertise</h2>
           <div className="grid md:grid-cols-2 lg:grid-cols-3 gap-8">
-            {Object.entries(skillCategories).map(([category, title]) => {
-              const categorySkills = getSkillsByCategory(category);
-              if (categorySkills.length === 0) return null;
-              
+            {skillGroups.map(({ category, display_name: title, skills: categorySkills }) => {
               return (
                 <motion.div
                   key={category}
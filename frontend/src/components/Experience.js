@@ -88,17 +88,12 @@ const Experience = () => {
         setLoading(true);
         setError(null);
         
-        const [expRes, eduRes] = await Promise.all([
-          api.get('/experience/'),
-          api.get('/education/')
-        ]);
-        
-        // Ensure response data is arrays
-        const expData = Array.isArray(expRes.data.results) ? expRes.data.results : [];
-        const eduData = Array.isArray(eduRes.data.results) ? eduRes.data.results : [];
-        
-        setExperience(expData);
-        setEducation(eduData);
+        // One merged, date-ordered list with periods formatted by the API
+        const res = await api.get('/timeline/');
+        const entries = Array.isArray(res.data.results) ? res.data.results : [];
+
+        setExperience(entries.filter((entry) => entry.type === 'experience'));
+        setEducation(entries.filter((entry) => entry.type === 'education'));
       } catch (error) {
         console.error('Error fetching experience/education:', error);
         setError('Failed to load experience and education data. Please try again later.');
@@ -111,12 +106,6 @@ const Experience = () => {
     fetchData();
   }, []);
 
-  const formatDate = (dateStr) => {
-    if (!dateStr) return "";
-    const date = new Date(dateStr);
-    return date.toLocaleDateString("en-US", { month: "short", year: "numeric" });
-  };
-
   if (loading) {
     return (
       <div className="min-h-screen flex items-center justify-center pt-20 bg-gray-50 dark:bg-gray-900">
@@ -163,14 +152,14 @@ const Experience = () => {
             {experience.map((exp) => (
               <TimelineItem
                 key={exp.id}
-                title={exp.position}
-                subtitle={exp.company}
-                period={`${formatDate(exp.start_date)} — ${exp.current ? 'Present' : (exp.end_date ? formatDate(exp.end_date) : '')}`}
+                title={exp.title}
+                subtitle={exp.subtitle}
+                period={exp.period}
                 location={exp.location}
                 description={exp.description}
-                badges={Array.isArray(exp.technologies_used) ? exp.technologies_used.map(t => t.name) : []}
-                logo={exp.company_logo}
-                logoUrl={exp.company_logo_url}
+                badges={Array.isArray(exp.technologies) ? exp.technologies : []}
+                logo={exp.logo_url}
+                logoUrl={exp.logo_url}
               />
             ))}
           </div>
@@ -186,13 +175,13 @@ const Experience = () => {
             {education.map((edu) => (
               <TimelineItem
                 key={edu.id}
-                title={edu.degree}
-                subtitle={edu.institution}
-                period={`${formatDate(edu.start_date)} — ${edu.current ? 'Present' : (edu.end_date ? formatDate(edu.end_date) : '')}`}
+                title={edu.title}
+                subtitle={edu.subtitle}
+                period={edu.period}
                 description={edu.description || ''}
                 badges={[]}
-                logo={edu.institution_logo}
-                logoUrl={edu.institution_logo_url}
+                logo={edu.logo_url}
+                logoUrl={edu.logo_url}
                 isEducation={true}
               />
             ))}